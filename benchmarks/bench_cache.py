@@ -0,0 +1,65 @@
+import itertools
+import shutil
+import venv
+from pathlib import Path
+import pytest
+from env_manager.cache import CacheManager
+from pyspace_daemon.cache_manager import CacheManager as WheelStore
+from pyspace_daemon.installer import Installer, UvInstaller
+
+SCALES = [1000, 10000]
+
+
+def _filled_cache(path, count: int) -> CacheManager:
+    cache = CacheManager(path)
+    with cache.batch():
+        for i in range(count):
+            cache.cache_package(f"pkg{i}", "1.0")
+    return cache
+
+
+@pytest.mark.parametrize("count", SCALES)
+def bench_is_cached(bench, tmp_path, count):
+    """1000 hits against a cache holding `count` packages."""
+    cache = _filled_cache(tmp_path / "cache", count)
+    names = [f"pkg{i}" for i in range(0, count, count // 1000)]
+    assert bench(lambda: all(cache.is_cached(name, "1.0") for name in names))
+
+
+@pytest.mark.parametrize("count", SCALES)
+def bench_cache_package(bench, tmp_path, count):
+    """100 individual inserts into a cache holding `count` packages."""
+    cache = _filled_cache(tmp_path / "cache", count)
+    batches = itertools.count()
+
+    def new_names():
+        batch = next(batches)
+        return ([f"new{batch}-{i}" for i in range(100)],)
+
+    bench(lambda names: [cache.cache_package(n, "1.0") for n in names], setup=new_names)
+    assert cache.is_cached("new0-0", "1.0")
+
+
+@pytest.mark.parametrize("backend", ["pip", "uv"])
+def bench_cached_install(bench, tmp_path, wheelhouse, backend):
+    """Offline install of a package and its dependencies from the wheel store."""
+    directory, requirements = wheelhouse
+    store = WheelStore(tmp_path / "wheels")
+    for wheel in directory.iterdir():
+        # store() moves its input; the wheelhouse is shared by the session
+        store.store(Path(shutil.copy2(wheel, store.staging_dir)))
+    if backend == "uv":
+        uv_path = shutil.which("uv")
+        if not uv_path:
+            pytest.skip("uv is not on PATH")
+        installer = UvInstaller(store.get_index_url(), uv_path)
+    else:
+        installer = Installer(store.get_index_url())
+    envs = itertools.count()
+
+    def fresh_env():
+        env_path = tmp_path / f"env{next(envs)}"
+        venv.create(env_path, with_pip=backend == "pip")
+        return env_path, requirements, True
+
+    assert bench(installer.install, rounds=3, setup=fresh_env)
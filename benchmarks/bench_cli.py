@@ -0,0 +1,19 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.mark.parametrize("args", [["--help"], ["list"]], ids=["help", "list"])
+def bench_cli_cold_start(bench, home, args):
+    """Run the CLI in a fresh interpreter, in-process (no daemon)."""
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    cmd = [sys.executable, "-c", "from cli.main import app; app()", *args]
+    result = bench(
+        lambda: subprocess.run(cmd, capture_output=True, text=True, cwd=home, env=env),
+        warmup=1,
+    )
+    assert result.returncode == 0, result.stderr
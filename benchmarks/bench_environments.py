@@ -0,0 +1,60 @@
+import itertools
+import sys
+import pytest
+from env_manager.environment import EnvironmentManager
+from env_manager.pool import VenvPool
+from pyspace_daemon.env_manager import create_workspace_env
+
+PYTHON = f"{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def _names(prefix: str):
+    counter = itertools.count()
+    return lambda: f"{prefix}{next(counter)}"
+
+
+def bench_create_environment(bench):
+    """Create an environment with `python -m venv` (no pool)."""
+    em = EnvironmentManager()
+    name = _names("env")
+    assert bench(em.create_environment, rounds=3, setup=lambda: (name(), PYTHON))
+
+
+def bench_create_environment_pooled(bench):
+    """Create an environment by claiming from a filled pool."""
+    pool = VenvPool(size=2)
+    em = EnvironmentManager(pool=pool)
+    python_exe = em.find_python(PYTHON)
+    name = _names("env")
+
+    def setup():
+        pool.fill(python_exe)
+        return name(), PYTHON
+
+    assert bench(em.create_environment, rounds=3, setup=setup)
+
+
+def bench_create_workspace_env(bench, tmp_path):
+    """Create a daemon workspace (venv with pip plus directories)."""
+    name = _names("ws")
+    bench(create_workspace_env, rounds=3, setup=lambda: (name(), tmp_path))
+
+
+@pytest.mark.parametrize("count", [10, 1000, 10000])
+def bench_list_environments(bench, count):
+    """List environments from a fresh manager, as one CLI invocation does."""
+    em = EnvironmentManager()
+    with em.batch():
+        for i in range(count):
+            path = em.base_dir / f"env{i:05d}"
+            path.mkdir()
+            em._update_metadata(
+                path.name,
+                {"python_version": PYTHON, "path": str(path), "created": "/"},
+            )
+    envs = bench(
+        lambda manager: manager.list_environments(),
+        warmup=1,
+        setup=lambda: (EnvironmentManager(),),
+    )
+    assert len(envs) == count
@@ -0,0 +1,42 @@
+import json
+import sys
+import threading
+import time
+import pytest
+from daemon.watcher import FileWatcher
+
+
+@pytest.mark.parametrize("backend", ["inotify", "polling"])
+def bench_watcher_latency(bench, tmp_path, backend):
+    """Time from writing pyspace.json to the watcher's callback firing.
+
+    Includes the 50ms debounce; polling also waits up to poll_interval.
+    """
+    if backend == "inotify" and not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux-only")
+    path = tmp_path / "pyspace.json"
+    path.write_text("{}")
+    fired = threading.Event()
+    watcher = FileWatcher(
+        path,
+        lambda *args: fired.set(),
+        debounce=0.05,
+        poll_interval=0.1,
+        backend=backend,
+    )
+    thread = threading.Thread(target=watcher.start_watching, daemon=True)
+    thread.start()
+    time.sleep(0.2)
+
+    timings = []
+    try:
+        for i in range(bench.rounds or 10):
+            fired.clear()
+            start = time.perf_counter()
+            path.write_text(json.dumps({"round": i}))
+            assert fired.wait(5), "watcher never fired"
+            timings.append(time.perf_counter() - start)
+    finally:
+        watcher.stop_watching()
+        thread.join(5)
+    bench.record(timings)
@@ -0,0 +1,146 @@
+"""Benchmark harness: a `bench` fixture, result files and baseline comparison.
+
+Run with `python -m pytest benchmarks`; see README for the options.
+"""
+
+import time
+from pathlib import Path
+import pytest
+from loguru import logger
+from benchmarks.results import compare, load_results, save_results, summarize
+from tests.conftest import write_wheel
+
+DEFAULT_ROUNDS = 5
+RESULTS = pytest.StashKey[dict]()
+COMPARISON = pytest.StashKey[list]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-rounds", type=int, help="Override rounds per benchmark")
+    group.addoption("--bench-save", type=Path, help="Write results to this JSON file")
+    group.addoption(
+        "--bench-compare", type=Path, help="Baseline JSON to compare results against"
+    )
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown of the median as a fraction (default 0.2)",
+    )
+
+
+def pytest_configure(config):
+    config.stash[RESULTS] = {}
+    # Measure the operations, not log formatting to stderr
+    logger.remove()
+
+
+class Bench:
+    """Times a callable over several rounds and records the summary."""
+
+    def __init__(self, name: str, results: dict, rounds: int = None):
+        self.name = name
+        self.results = results
+        self.rounds = rounds
+
+    def __call__(self, fn, *args, rounds=DEFAULT_ROUNDS, warmup=0, setup=None):
+        """Run fn(*args) `rounds` times, or fn(*setup()) with untimed setup."""
+        for _ in range(warmup):
+            fn(*(setup() if setup else args))
+        timings = []
+        result = None
+        for _ in range(self.rounds or rounds):
+            call_args = setup() if setup else args
+            start = time.perf_counter()
+            result = fn(*call_args)
+            timings.append(time.perf_counter() - start)
+        self.record(timings)
+        return result
+
+    def record(self, timings):
+        """Record timings measured by the benchmark itself."""
+        self.results[self.name] = summarize(timings)
+
+
+@pytest.fixture
+def bench(request):
+    return Bench(
+        request.node.name,
+        request.config.stash[RESULTS],
+        request.config.getoption("--bench-rounds"),
+    )
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path_factory, monkeypatch):
+    """Point HOME at a scratch directory so ~/.pyspace is never touched."""
+    path = tmp_path_factory.mktemp("home")
+    monkeypatch.setenv("HOME", str(path))
+    monkeypatch.setenv("PYSPACE_NO_DAEMON", "1")
+    return path
+
+
+@pytest.fixture(scope="session")
+def wheelhouse(tmp_path_factory):
+    """Local wheels for an app with a small dependency tree; no network needed.
+
+    Returns (directory, requirements to install).
+    """
+    directory = tmp_path_factory.mktemp("wheelhouse")
+    deps = [f"benchdep{i}" for i in range(8)]
+    for dep in deps:
+        write_wheel(directory, dep, "1.0")
+    write_wheel(directory, "benchapp", "1.0", requires=deps)
+    return directory, ["benchapp"]
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    results = config.stash[RESULTS]
+    save_path = config.getoption("--bench-save")
+    if save_path and results:
+        save_results(save_path, results)
+    baseline_path = config.getoption("--bench-compare")
+    if baseline_path and results:
+        rows = compare(
+            results,
+            load_results(baseline_path),
+            config.getoption("--bench-threshold"),
+        )
+        config.stash[COMPARISON] = rows
+        if any(row["regressed"] for row in rows):
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.stash.get(RESULTS, {})
+    if not results:
+        return
+    tr = terminalreporter
+    tr.section("benchmarks")
+    width = max(len(name) for name in results)
+    tr.write_line(f"{'name':<{width}}  {'median':>10}  {'min':>10}  rounds")
+    for name, summary in sorted(results.items()):
+        tr.write_line(
+            f"{name:<{width}}  {summary['median'] * 1000:>8.2f}ms  "
+            f"{summary['min'] * 1000:>8.2f}ms  {summary['rounds']}"
+        )
+    rows = config.stash.get(COMPARISON, None)
+    if rows is None:
+        return
+    tr.section("comparison with baseline")
+    for row in rows:
+        marker = "REGRESSED" if row["regressed"] else ""
+        tr.write_line(
+            f"{row['name']:<{width}}  {row['baseline'] * 1000:>8.2f}ms -> "
+            f"{row['current'] * 1000:>8.2f}ms  {row['change']:+7.1%}  {marker}"
+        )
+    regressed = [row["name"] for row in rows if row["regressed"]]
+    if regressed:
+        threshold = config.getoption("--bench-threshold")
+        tr.write_line(
+            f"{len(regressed)} benchmark(s) slower than baseline by more than "
+            f"{threshold:.0%}: {', '.join(regressed)}",
+            red=True,
+        )
@@ -0,0 +1,66 @@
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Medians closer than this (seconds) are never reported as regressions
+MIN_DELTA = 0.001
+
+
+def summarize(timings: List[float]) -> Dict:
+    """Summary statistics, in seconds, for one benchmark's rounds."""
+    return {
+        "rounds": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "max": max(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def save_results(path: Path, benchmarks: Dict[str, Dict]):
+    """Write results with enough context to tell which machine produced them."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "benchmarks": benchmarks,
+    }
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def load_results(path: Path) -> Dict[str, Dict]:
+    return json.loads(path.read_text())["benchmarks"]
+
+
+def compare(
+    current: Dict[str, Dict],
+    baseline: Dict[str, Dict],
+    threshold: float = 0.2,
+    stat: str = "median",
+) -> List[Dict]:
+    """Compare each benchmark present in both runs.
+
+    A benchmark regresses when its stat grew by more than threshold (a
+    fraction, 0.2 = 20%) and by more than MIN_DELTA seconds.
+    """
+    rows = []
+    for name in sorted(current.keys() & baseline.keys()):
+        old, new = baseline[name][stat], current[name][stat]
+        change = (new - old) / old if old else 0.0
+        rows.append(
+            {
+                "name": name,
+                "baseline": old,
+                "current": new,
+                "change": change,
+                "regressed": change > threshold and new - old > MIN_DELTA,
+            }
+        )
+    return rows
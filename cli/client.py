@@ -0,0 +1,109 @@
+import http.client
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import quote, urlencode
+from env_manager import tracing
+
+DEFAULT_SOCKET = Path.home() / ".pyspace" / "daemon.sock"
+
+
+class DaemonError(Exception):
+    """Raised when the daemon answers a forwarded command with an error."""
+
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection that connects to a Unix-domain socket."""
+
+    def __init__(self, socket_path: Path, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(str(self.socket_path))
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class DaemonClient:
+    """Forwards CLI commands to a running pyspace daemon."""
+
+    def __init__(self, socket_path: Path = None, timeout: Optional[float] = None):
+        self.socket_path = Path(
+            socket_path or os.environ.get("PYSPACE_DAEMON_SOCKET", DEFAULT_SOCKET)
+        )
+        self.timeout = timeout
+
+    def is_running(self) -> bool:
+        """Return True if something is accepting connections on the socket."""
+        if not hasattr(socket, "AF_UNIX") or not self.socket_path.exists():
+            return False
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(0.2)
+        try:
+            sock.connect(str(self.socket_path))
+            return True
+        except OSError:
+            return False
+        finally:
+            sock.close()
+
+    def request(
+        self, method: str, path: str, params: Dict[str, Any] = None, body: Any = None
+    ) -> Dict:
+        """Send a request to the daemon and return the decoded JSON response."""
+        query = {
+            k: (str(v).lower() if isinstance(v, bool) else v)
+            for k, v in (params or {}).items()
+            if v is not None
+        }
+        url = quote(path) + (f"?{urlencode(query, doseq=True)}" if query else "")
+        headers = {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        tracer = tracing.current()
+        if tracer:
+            # Ask the daemon for its side of the trace, merged in when saving ours
+            headers["X-PySpace-Trace"] = "1"
+        conn = UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+        try:
+            with tracing.span(f"{method} {path}", "daemon"):
+                conn.request(method, url, body=payload, headers=headers)
+                response = conn.getresponse()
+                data = json.loads(response.read() or b"null")
+        finally:
+            conn.close()
+        trace_file = response.getheader("X-PySpace-Trace")
+        if tracer and trace_file:
+            tracer.include(trace_file)
+        if response.status >= 400:
+            detail = data.get("detail") if isinstance(data, dict) else data
+            raise DaemonError(response.status, str(detail))
+        return data
+
+    def get(self, path: str, **params) -> Dict:
+        return self.request("GET", path, params)
+
+    def post(self, path: str, body: Any = None, **params) -> Dict:
+        return self.request("POST", path, params, body)
+
+    def wait_for_job(self, job_id: str, poll: float = 30) -> Dict:
+        """Long-poll a daemon job until it finishes and return its final state."""
+        while True:
+            job = self.get(f"/jobs/{job_id}", wait=poll)
+            if job["status"] in ("succeeded", "failed", "cancelled"):
+                return job
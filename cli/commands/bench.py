@@ -0,0 +1,68 @@
+import json
+import typer
+from contextlib import ExitStack
+from pathlib import Path
+from typing import List
+from loguru import logger
+
+
+def bench_api(
+    rate: float,
+    duration: float,
+    concurrency: int,
+    mix: str,
+    workspaces: int,
+    wait_jobs: bool,
+    wheelhouse: Path = None,
+    packages: List[str] = (),
+    socket: Path = None,
+    job_workers: int = None,
+    output: Path = None,
+):
+    """Load-test the daemon API and print throughput, latency and error rates."""
+    from ..loadgen import (
+        LoadGenerator,
+        LocalDaemon,
+        format_report,
+        parse_mix,
+        wheelhouse_packages,
+    )
+
+    try:
+        weights = parse_mix(mix)
+        packages = list(packages) or (
+            wheelhouse_packages(wheelhouse) if wheelhouse else []
+        )
+        if weights.get("install") and not packages:
+            raise ValueError(
+                "Install requests need --wheelhouse (e.g. from `pip download -d`) "
+                "or --package"
+            )
+        with ExitStack() as stack:
+            if socket is None:
+                typer.echo("Starting a throwaway daemon...")
+                daemon = stack.enter_context(LocalDaemon(wheelhouse, job_workers))
+                socket = daemon.socket_path
+            else:
+                logger.warning(f"CLI: Load test creates workspaces on {socket}")
+            generator = LoadGenerator(
+                socket,
+                weights,
+                rate=rate,
+                duration=duration,
+                concurrency=concurrency,
+                packages=packages,
+                workspaces=workspaces,
+                wait_jobs=wait_jobs,
+            )
+            generator.setup()
+            typer.echo(f"Sending {rate:g} req/s for {duration:g}s...")
+            report = generator.run()
+    except (ValueError, RuntimeError, OSError) as e:
+        typer.echo(f"Error running API benchmark: {e}")
+        logger.error(f"CLI: API benchmark failed: {e}")
+        raise typer.Exit(1)
+    typer.echo(format_report(report))
+    if output:
+        output.write_text(json.dumps(report, indent=2))
+        typer.echo(f"Wrote report to {output}")
@@ -0,0 +1,63 @@
+import sys
+import typer
+from pathlib import Path
+from loguru import logger
+from env_manager.interpreters import InterpreterRegistry
+from pyspace_daemon.cache_manager import CacheManager, read_requirements
+from ..context import get_daemon_config_manager
+
+
+def cache_build(
+    packages: list[str],
+    requirements: Path = None,
+    python: str = None,
+    workers: int = None,
+):
+    """Pre-build wheels for a requirements set so installs skip source builds."""
+    try:
+        python_exe = InterpreterRegistry().find(python) if python else sys.executable
+        if not python_exe:
+            typer.echo(f"No Python {python} interpreter found")
+            raise typer.Exit(1)
+        wanted = list(packages)
+        if requirements:
+            wanted += read_requirements(requirements)
+        config_manager = get_daemon_config_manager()
+        workers = workers or config_manager.get("prefetch_workers")
+        cache_manager = CacheManager(
+            Path(config_manager.get("default_cache_path")).expanduser(),
+            index_url=config_manager.get("index_url"),
+            find_links=config_manager.get("find_links"),
+        )
+        if wanted:
+            logger.info(f"CLI: Downloading {len(wanted)} requirements before building")
+            failed = [
+                req
+                for req, ok in cache_manager.prefetch(wanted, workers).items()
+                if not ok
+            ]
+            for req in failed:
+                typer.echo(f"  download failed: {req}")
+        else:
+            failed = []
+        # Only the requested projects' sdists; everything stored when none given
+        results = cache_manager.build_all(
+            python_exe, max_workers=workers, requirements=wanted or None
+        )
+        broken = [sdist for sdist, ok in results.items() if not ok]
+        typer.echo(
+            f"Wheels available for {len(results) - len(broken)} of "
+            f"{len(results)} {'requested' if wanted else 'cached'} sdists"
+        )
+        for sdist in broken:
+            typer.echo(f"  build failed: {sdist}")
+        if failed or broken:
+            logger.warning(f"CLI: Cache build incomplete: {failed + broken}")
+            raise typer.Exit(1)
+        logger.success("CLI: Cache build completed successfully")
+    except typer.Exit:
+        raise
+    except Exception as e:
+        typer.echo(f"Error building wheels: {e}")
+        logger.error(f"CLI: Error building wheels: {e}")
+        raise typer.Exit(1)
@@ -1,15 +1,13 @@
 import typer
 from loguru import logger
-from env_manager.cache import CacheManager
-
-cache_manager = CacheManager()
+from ..context import get_cache_manager
 
 
 def cache_clear():
     """Clear the cache."""
     try:
         logger.info("CLI: Clearing cache")
-        cache_manager.clear_cache()
+        get_cache_manager().clear_cache()
         typer.echo("Cache cleared")
         logger.success("CLI: Cache cleared successfully")
     except Exception as e:
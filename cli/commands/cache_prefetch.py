@@ -0,0 +1,42 @@
+import typer
+from pathlib import Path
+from loguru import logger
+from pyspace_daemon.cache_manager import CacheManager, read_requirements
+from ..context import get_daemon_config_manager
+
+
+def cache_prefetch(packages: list[str], requirements: Path = None, workers: int = None):
+    """Warm the wheel cache for a set of requirements."""
+    try:
+        wanted = list(packages)
+        if requirements:
+            wanted += read_requirements(requirements)
+        if not wanted:
+            typer.echo("Nothing to prefetch")
+            return
+        logger.info(f"CLI: Prefetching {len(wanted)} requirements")
+        config_manager = get_daemon_config_manager()
+        cache_manager = CacheManager(
+            Path(config_manager.get("default_cache_path")).expanduser(),
+            index_url=config_manager.get("index_url"),
+            find_links=config_manager.get("find_links"),
+        )
+        results = cache_manager.prefetch(
+            wanted, max_workers=workers or config_manager.get("prefetch_workers")
+        )
+        failed = [req for req, ok in results.items() if not ok]
+        typer.echo(
+            f"Cached {len(results) - len(failed)} of {len(results)} requirements"
+        )
+        for req in failed:
+            typer.echo(f"  failed: {req}")
+        if failed:
+            logger.warning(f"CLI: Failed to prefetch {failed}")
+            raise typer.Exit(1)
+        logger.success("CLI: Prefetch completed successfully")
+    except typer.Exit:
+        raise
+    except Exception as e:
+        typer.echo(f"Error prefetching packages: {e}")
+        logger.error(f"CLI: Error prefetching packages: {e}")
+        raise typer.Exit(1)
@@ -0,0 +1,25 @@
+import typer
+from loguru import logger
+from ..context import get_cache_manager, get_config_manager
+
+
+def cache_prune(max_age_days: int = None, max_bytes: int = None, policy: str = None):
+    """Evict stale or least recently used cache entries."""
+    try:
+        config_manager = get_config_manager()
+        if max_age_days is None:
+            max_age_days = config_manager.get("cache_max_age_days", 30)
+        if max_bytes is None:
+            max_bytes = config_manager.get("cache_max_bytes")
+        logger.info("CLI: Pruning cache")
+        result = get_cache_manager().prune_cache(
+            max_age_days=max_age_days, max_bytes=max_bytes, policy=policy
+        )
+        typer.echo(
+            f"Removed {result['removed']} cache entries ({result['freed']} bytes freed)"
+        )
+        logger.success("CLI: Cache pruned successfully")
+    except Exception as e:
+        typer.echo(f"Error pruning cache: {e}")
+        logger.error(f"CLI: Error pruning cache: {e}")
+        raise typer.Exit(1)
@@ -1,25 +1,53 @@
 import typer
+from typing import List
 from loguru import logger
-from env_manager.environment import EnvironmentManager
+from ..context import get_config_manager, get_env_manager, run_daemon_job
 
-env_manager = EnvironmentManager()
 
-
-def create(name: str, python: str = typer.Option(None, "--python")):
-    """Create a new environment."""
+def create(
+    names: List[str],
+    python: str = typer.Option(None, "--python"),
+    workers: int = typer.Option(None, "--workers"),
+    install_python: bool = typer.Option(False, "--install-python"),
+):
+    """Create one or more environments."""
     try:
         logger.info(
-            f"CLI: Creating environment '{name}' with Python {python or 'default'}"
+            f"CLI: Creating environments {names} with Python {python or 'default'}"
+        )
+        response = run_daemon_job(
+            "POST",
+            "/environments",
+            name=names,
+            python=python,
+            workers=workers,
+            install_python=install_python,
         )
-        if env_manager.create_environment(name, python):
-            typer.echo(f"Created environment '{name}'")
-            logger.success(f"CLI: Environment '{name}' created successfully")
+        if response is not None:
+            results = response["results"]
+        elif len(names) == 1:
+            results = {
+                names[0]: get_env_manager().create_environment(
+                    names[0], python, install_python
+                )
+            }
         else:
-            typer.echo(
-                f"Failed to create environment '{name}' - it may already exist or Python version not found"
+            results = get_env_manager().create_environments(
+                names,
+                python,
+                max_workers=workers or get_config_manager().get("bulk_workers", 4),
+                install_python=install_python,
             )
-            logger.warning(f"CLI: Failed to create environment '{name}'")
+        for name, created in results.items():
+            if created:
+                typer.echo(f"Created environment '{name}'")
+                logger.success(f"CLI: Environment '{name}' created successfully")
+            else:
+                typer.echo(
+                    f"Failed to create environment '{name}' - it may already exist or Python version not found"
+                )
+                logger.warning(f"CLI: Failed to create environment '{name}'")
     except Exception as e:
         typer.echo(f"Error creating environment: {e}")
-        logger.error(f"CLI: Error creating environment '{name}': {e}")
+        logger.error(f"CLI: Error creating environments {names}: {e}")
         raise typer.Exit(1)
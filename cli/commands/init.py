@@ -1,15 +1,13 @@
 import typer
 from loguru import logger
-from env_manager.config import ConfigManager
-
-config_manager = ConfigManager()
+from ..context import get_config_manager
 
 
 def init():
     """Initialize PySpace in the current directory."""
     try:
         logger.info("CLI: Initializing PySpace in current directory")
-        config_manager.initialize_local_config()
+        get_config_manager().initialize_local_config()
         typer.echo("Initialized PySpace in current directory")
         logger.success("CLI: PySpace initialized successfully")
     except Exception as e:
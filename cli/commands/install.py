@@ -1,11 +1,52 @@
 import typer
+from pathlib import Path
 from loguru import logger
-from env_manager.environment import EnvironmentManager
+from ..context import get_daemon_config_manager, get_env_manager, run_daemon_job
 
-env_manager = EnvironmentManager()
 
+def _install_in_process(packages: list[str], offline: bool = None):
+    """Install into the current environment the way the daemon would."""
+    from pyspace_daemon.cache_manager import CacheManager
+    from pyspace_daemon.installer import OfflineInstallError, get_installer
 
-def install(packages: list[str], global_: bool = typer.Option(False, "--global")):
+    env_manager = get_env_manager()
+    name = env_manager.get_current_environment()
+    if not name:
+        typer.echo("No active environment; run 'pyspace use' first")
+        raise typer.Exit(1)
+    env_path = env_manager.base_dir / name
+    if not env_path.exists():
+        typer.echo(f"Environment '{name}' not found")
+        raise typer.Exit(1)
+
+    config = get_daemon_config_manager()
+    cache_manager = CacheManager(
+        Path(config.get("default_cache_path")).expanduser(),
+        index_url=config.get("index_url"),
+        find_links=config.get("find_links"),
+    )
+    if offline is None:
+        offline = bool(config.get("offline"))
+    if offline:
+        missing = cache_manager.missing(packages)
+        if missing:
+            raise OfflineInstallError(missing)
+    else:
+        cache_manager.prefetch(packages, max_workers=config.get("prefetch_workers"))
+    installer = get_installer(cache_manager.get_index_url(), config.get("use_uv"))
+    if not installer.install(env_path, packages, offline=offline):
+        for package in packages:
+            typer.echo(f"Failed to install {package}")
+        raise typer.Exit(1)
+    for package in packages:
+        typer.echo(f"Installed {package} in '{name}'")
+
+
+def install(
+    packages: list[str],
+    global_: bool = typer.Option(False, "--global"),
+    offline: bool = None,
+):
     """Install packages in the current or global environment."""
     try:
         logger.info(f"CLI: Installing packages {packages} (global: {global_})")
@@ -15,9 +56,25 @@ def install(packages: list[str], global_: bool = typer.Option(False, "--global")
             logger.info("CLI: Global install not yet implemented")
         else:
             typer.echo("Installing in current environment...")
-            # Implement local install
-            logger.info("CLI: Local install not yet implemented")
+            response = run_daemon_job(
+                "POST",
+                "/environments/install",
+                cwd=str(Path.cwd()),
+                package=packages,
+                offline=offline,
+            )
+            if response is not None:
+                for package in response["installed"]:
+                    typer.echo(f"Installed {package} in '{response['environment']}'")
+                for package in response["failed"]:
+                    typer.echo(f"Failed to install {package}")
+                if response["failed"]:
+                    raise typer.Exit(1)
+            else:
+                _install_in_process(packages, offline)
         logger.success(f"CLI: Install command completed for packages {packages}")
+    except typer.Exit:
+        raise
     except Exception as e:
         typer.echo(f"Error installing packages: {e}")
         logger.error(f"CLI: Error installing packages {packages}: {e}")
@@ -1,20 +1,66 @@
+import time
 import typer
 from loguru import logger
-from env_manager.environment import EnvironmentManager
+from ..context import call_daemon, get_env_manager
 
-env_manager = EnvironmentManager()
 
+def _format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
 
-def list():
-    """List all environments."""
+
+def _format_stats(env) -> str:
+    last_used = env.get("last_used")
+    used = (
+        time.strftime("%Y-%m-%d %H:%M", time.localtime(last_used))
+        if last_used
+        else "never"
+    )
+    return (
+        f"  [{_format_size(env['size'])}, {env['packages']} packages, "
+        f"last used {used}]"
+    )
+
+
+def list(
+    pattern: str = None,
+    python: str = None,
+    sort: str = "name",
+    reverse: bool = False,
+    offset: int = 0,
+    limit: int = None,
+    stats: bool = False,
+):
+    """List environments, optionally filtered, sorted, paged and with disk stats."""
     try:
         logger.info("CLI: Listing environments")
-        envs = env_manager.list_environments()
+        query = dict(
+            pattern=pattern,
+            sort=sort,
+            reverse=reverse,
+            offset=offset,
+            limit=limit,
+            stats=stats,
+        )
+        response = call_daemon("GET", "/environments", python=python, **query)
+        if response is None:
+            response = get_env_manager().query_environments(
+                python_version=python, **query
+            )
+        envs = response["environments"]
         if envs:
             typer.echo("Environments:")
             for env in envs:
                 status = " (active)" if env["active"] else ""
-                typer.echo(f"  {env['name']} - Python {env['python_version']}{status}")
+                details = _format_stats(env) if "size" in env else ""
+                typer.echo(
+                    f"  {env['name']} - Python {env['python_version']}{status}{details}"
+                )
+            total = response.get("total", len(envs))
+            if total > len(envs):
+                typer.echo(f"Showing {len(envs)} of {total} environments")
             logger.success(f"CLI: Listed {len(envs)} environments")
         else:
             typer.echo("No environments found")
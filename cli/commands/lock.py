@@ -0,0 +1,41 @@
+import typer
+from pathlib import Path
+from loguru import logger
+from env_manager.lock import LOCK_FILE, resolve_lock, source_args, write_lock
+from ..context import get_config_manager, get_daemon_config_manager, get_env_manager
+
+
+def project_environment() -> Path:
+    """Return the env path named in ./pyspace.json, exiting if there is none."""
+    name = get_config_manager().get_local_config().get("environment")
+    if not name:
+        typer.echo("No environment set for this project; run 'pyspace use' first")
+        raise typer.Exit(1)
+    env_path = get_env_manager().base_dir / name
+    if not env_path.exists():
+        typer.echo(f"Environment '{name}' not found")
+        raise typer.Exit(1)
+    return env_path
+
+
+def lock(index_url: str = None, find_links: str = None):
+    """Resolve pyspace.json dependencies into pyspace.lock."""
+    try:
+        env_path = project_environment()
+        requirements = get_config_manager().get_local_config().get("dependencies", [])
+        daemon_config = get_daemon_config_manager()
+        pip_args = source_args(
+            index_url or daemon_config.get("index_url"),
+            find_links or daemon_config.get("find_links"),
+        )
+        logger.info(f"CLI: Locking {len(requirements)} requirements for {env_path}")
+        result = resolve_lock(env_path, requirements, pip_args)
+        write_lock(result, Path.cwd() / LOCK_FILE)
+        typer.echo(f"Locked {len(result['packages'])} packages to {LOCK_FILE}")
+        logger.success("CLI: Lock completed successfully")
+    except typer.Exit:
+        raise
+    except Exception as e:
+        typer.echo(f"Error locking dependencies: {e}")
+        logger.error(f"CLI: Error locking dependencies: {e}")
+        raise typer.Exit(1)
@@ -1,21 +1,39 @@
 import typer
+from typing import List
 from loguru import logger
-from env_manager.environment import EnvironmentManager
+from ..context import get_config_manager, get_env_manager, run_daemon_job
 
-env_manager = EnvironmentManager()
 
-
-def remove(name: str):
-    """Remove an environment."""
+def remove(names: List[str], pattern: str = None, workers: int = None):
+    """Remove environments by name and/or glob pattern."""
+    if not names and not pattern:
+        typer.echo("Give environment names or --pattern")
+        raise typer.Exit(1)
     try:
-        logger.info(f"CLI: Removing environment '{name}'")
-        if env_manager.remove_environment(name):
-            typer.echo(f"Removed environment '{name}'")
-            logger.success(f"CLI: Environment '{name}' removed successfully")
+        logger.info(f"CLI: Removing environments {names} (pattern: {pattern})")
+        response = run_daemon_job(
+            "DELETE", "/environments", name=names, pattern=pattern, workers=workers
+        )
+        if response is not None:
+            results = response["results"]
+        elif len(names) == 1 and not pattern:
+            results = {names[0]: get_env_manager().remove_environment(names[0])}
         else:
-            typer.echo(f"Environment '{name}' not found")
-            logger.warning(f"CLI: Environment '{name}' not found")
+            results = get_env_manager().remove_environments(
+                names,
+                pattern,
+                max_workers=workers or get_config_manager().get("bulk_workers", 4),
+            )
+        if not results:
+            typer.echo(f"No environments match '{pattern}'")
+        for name, removed in results.items():
+            if removed:
+                typer.echo(f"Removed environment '{name}'")
+                logger.success(f"CLI: Environment '{name}' removed successfully")
+            else:
+                typer.echo(f"Environment '{name}' not found")
+                logger.warning(f"CLI: Environment '{name}' not found")
     except Exception as e:
         typer.echo(f"Error removing environment: {e}")
-        logger.error(f"CLI: Error removing environment '{name}': {e}")
+        logger.error(f"CLI: Error removing environments {names}: {e}")
         raise typer.Exit(1)
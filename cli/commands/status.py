@@ -1,23 +1,27 @@
 import typer
 from loguru import logger
-from env_manager.environment import EnvironmentManager
-from daemon.daemon import PySpaceDaemon
-
-env_manager = EnvironmentManager()
-daemon = PySpaceDaemon()
+from pathlib import Path
+from ..context import call_daemon, get_daemon, get_env_manager
 
 
 def status():
     """Show current status."""
     try:
         logger.info("CLI: Checking status")
-        current = env_manager.get_current_environment()
+        response = call_daemon("GET", "/status", cwd=str(Path.cwd()))
+        if response is not None:
+            current = response["current_environment"]
+        else:
+            current = get_env_manager().get_current_environment()
         if current:
             typer.echo(f"Current environment: {current}")
         else:
             typer.echo("No active environment")
 
-        daemon_status = daemon.get_status()
+        if response is not None:
+            daemon_status = response["daemon"]
+        else:
+            daemon_status = get_daemon().get_status()
         typer.echo(f"Daemon status: {daemon_status}")
         logger.success("CLI: Status check completed")
     except Exception as e:
@@ -0,0 +1,63 @@
+import typer
+from pathlib import Path
+from loguru import logger
+from env_manager.lock import LOCK_FILE, read_lock, sync_environment
+from pyspace_daemon.cache_manager import CacheManager
+from pyspace_daemon.installer import get_installer
+from ..context import get_config_manager, get_daemon_config_manager
+from .lock import project_environment
+
+
+def sync(dry_run: bool = False, offline: bool = None):
+    """Make the project environment match pyspace.lock."""
+    try:
+        env_path = project_environment()
+        lock_path = Path.cwd() / LOCK_FILE
+        if not lock_path.exists():
+            typer.echo(f"No {LOCK_FILE} found; run 'pyspace lock' first")
+            raise typer.Exit(1)
+        lock = read_lock(lock_path)
+        requirements = get_config_manager().get_local_config().get("dependencies", [])
+        if requirements != lock["requirements"]:
+            typer.echo(f"{LOCK_FILE} is out of date; run 'pyspace lock' first")
+            raise typer.Exit(1)
+
+        # Same backend, wheel cache and offline default as daemon installs
+        daemon_config = get_daemon_config_manager()
+        cache_manager = CacheManager(
+            Path(daemon_config.get("default_cache_path")).expanduser()
+        )
+        installer = get_installer(
+            cache_manager.get_index_url(), daemon_config.get("use_uv")
+        )
+        if offline is None:
+            offline = bool(daemon_config.get("offline"))
+
+        logger.info(f"CLI: Syncing {env_path} (dry run: {dry_run})")
+        plan = sync_environment(
+            env_path, lock, installer, dry_run=dry_run, offline=offline
+        )
+        for package in plan["install"]:
+            typer.echo(f"  + {package['name']}=={package['version']}")
+        for package in plan["upgrade"] + plan["downgrade"]:
+            typer.echo(
+                f"  ~ {package['name']} {package['installed']} -> {package['version']}"
+            )
+        for name in plan["remove"]:
+            typer.echo(f"  - {name}")
+        changes = sum(
+            len(plan[key]) for key in ("install", "upgrade", "downgrade", "remove")
+        )
+        if not changes:
+            typer.echo("Environment is up to date")
+        elif dry_run:
+            typer.echo(f"Would apply {changes} changes")
+        else:
+            typer.echo(f"Applied {changes} changes")
+        logger.success("CLI: Sync completed successfully")
+    except typer.Exit:
+        raise
+    except Exception as e:
+        typer.echo(f"Error syncing environment: {e}")
+        logger.error(f"CLI: Error syncing environment: {e}")
+        raise typer.Exit(1)
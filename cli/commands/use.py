@@ -1,18 +1,17 @@
 import typer
 from loguru import logger
-from env_manager.environment import EnvironmentManager
-from env_manager.config import ConfigManager
-
-env_manager = EnvironmentManager()
-config_manager = ConfigManager()
+from ..context import get_config_manager, get_env_manager
 
 
 def use(name: str):
     """Switch to an environment."""
     try:
         logger.info(f"CLI: Switching to environment '{name}'")
-        if env_manager.activate_environment(name):
-            config_manager.set_local_config({"environment": name})
+        if get_env_manager().activate_environment(name):
+            config_manager = get_config_manager()
+            local_config = config_manager.get_local_config()
+            local_config["environment"] = name
+            config_manager.set_local_config(local_config)
             typer.echo(f"Switched to environment '{name}'")
             logger.success(f"CLI: Switched to environment '{name}' successfully")
         else:
@@ -0,0 +1,115 @@
+"""Shared, lazily constructed managers for CLI commands.
+
+Nothing here is imported or built until a command actually needs it, so
+`pyspace --help` and shell prompt hooks do not pay for manager setup.
+"""
+
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_env_manager():
+    from env_manager.environment import EnvironmentManager
+
+    return EnvironmentManager(pool=get_venv_pool())
+
+
+@lru_cache(maxsize=None)
+def get_venv_pool():
+    """Return the shared pool of pre-built envs, or None if disabled."""
+    size = get_config_manager().get("pool_size", 2)
+    if not size:
+        return None
+    from env_manager.pool import VenvPool
+
+    return VenvPool(size=size)
+
+
+@lru_cache(maxsize=None)
+def get_config_manager():
+    from env_manager.config import ConfigManager
+
+    return ConfigManager()
+
+
+@lru_cache(maxsize=None)
+def get_cache_manager():
+    from env_manager.cache import CacheManager
+
+    config = get_config_manager()
+    return CacheManager(
+        max_bytes=config.get("cache_max_bytes"),
+        max_age_days=config.get("cache_max_age_days"),
+        policy=config.get("cache_eviction_policy", "lru"),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_daemon_config_manager():
+    from pyspace_daemon.config_manager import ConfigManager
+
+    return ConfigManager()
+
+
+@lru_cache(maxsize=None)
+def get_daemon():
+    from daemon.daemon import PySpaceDaemon
+
+    return PySpaceDaemon(
+        env_manager=get_env_manager(),
+        cache_manager=get_cache_manager(),
+        config_manager=get_config_manager(),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_daemon_client():
+    """Return a client for a running daemon, or None to run in-process."""
+    if os.environ.get("PYSPACE_NO_DAEMON") == "1":
+        return None
+    from .client import DaemonClient
+
+    client = DaemonClient()
+    return client if client.is_running() else None
+
+
+def call_daemon(method: str, path: str, body=None, **params):
+    """Forward a request to the daemon, or return None if none is reachable.
+
+    Errors reported by the daemon are raised as DaemonError; only transport
+    failures fall back to in-process execution.
+    """
+    client = get_daemon_client()
+    if client is None:
+        return None
+    try:
+        return client.request(method, path, params, body)
+    except OSError:
+        get_daemon_client.cache_clear()
+        return None
+
+
+def run_daemon_job(method: str, path: str, body=None, **params):
+    """Submit a job to the daemon and wait for its result.
+
+    Returns None when no daemon is reachable; a failed or cancelled job is
+    raised as DaemonError. Losing the daemon while waiting is also a
+    DaemonError rather than a fallback, since the job may still run.
+    """
+    response = call_daemon(method, path, body, **params)
+    if response is None:
+        return None
+    from .client import DaemonError
+
+    job_id = response["job_id"]
+    try:
+        job = get_daemon_client().wait_for_job(job_id)
+    except OSError as e:
+        get_daemon_client.cache_clear()
+        raise DaemonError(
+            503, f"Lost connection to daemon waiting for job {job_id}: {e}"
+        )
+    if job["status"] != "succeeded":
+        raise DaemonError(500, job["error"] or f"Job {job['status']}")
+    return job["result"]
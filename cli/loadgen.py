@@ -0,0 +1,330 @@
+"""Open-loop load generator for the daemon HTTP API (`pyspace bench api`)."""
+
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+from pyspace_daemon.cache_manager import CacheManager, parse_artifact_filename
+from .client import DaemonClient, UnixHTTPConnection
+
+OPERATIONS = ("list", "create", "install", "snapshot")
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse `list=70,create=10,...` into operation weights."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}'; use {', '.join(OPERATIONS)}")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid weight for '{name}': '{weight}'")
+        if mix[name] < 0:
+            raise ValueError(f"Weight for '{name}' must not be negative")
+    if not any(mix.values()):
+        raise ValueError("At least one operation needs a positive weight")
+    return mix
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..100) of values, or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def wheelhouse_packages(directory: Path) -> List[str]:
+    """Project names of the wheels and sdists in a directory."""
+    names = set()
+    for path in directory.iterdir():
+        parsed = parse_artifact_filename(path.name)
+        if parsed:
+            names.add(parsed[0])
+    return sorted(names)
+
+
+class LocalDaemon:
+    """A throwaway daemon on its own socket and HOME, seeded with a wheelhouse.
+
+    The daemon runs offline, so installs are served only from the seeded
+    wheel store and never reach PyPI. Without a wheelhouse the store is
+    empty and only non-install requests can succeed.
+    """
+
+    def __init__(
+        self, wheelhouse: Optional[Path] = None, job_workers: int = None, startup=60
+    ):
+        self.wheelhouse = wheelhouse
+        self.job_workers = job_workers
+        self.startup = startup
+        self.home: Optional[Path] = None
+        self.socket_path: Optional[Path] = None
+        self._proc: Optional[subprocess.Popen] = None
+
+    def __enter__(self) -> "LocalDaemon":
+        self.home = Path(tempfile.mkdtemp(prefix="pyspace-bench-"))
+        config_dir = self.home / ".pyspace"
+        config_dir.mkdir()
+        config = {"offline": True, "log_level": "WARNING"}
+        if self.job_workers:
+            config["job_workers"] = self.job_workers
+        (config_dir / "config.json").write_text(json.dumps(config))
+        store = CacheManager(config_dir / "cache" / "wheels")
+        for path in self.wheelhouse.iterdir() if self.wheelhouse else []:
+            if parse_artifact_filename(path.name):
+                # store() moves its input; leave the wheelhouse intact
+                store.store(Path(shutil.copy2(path, store.staging_dir)))
+
+        self.socket_path = self.home / "daemon.sock"
+        env = dict(os.environ, HOME=str(self.home))
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])
+        )
+        cmd = [sys.executable, "-m", "pyspace_daemon.main"]
+        cmd += ["--socket", str(self.socket_path)]
+        with open(self.home / "daemon.out", "w") as out:
+            self._proc = subprocess.Popen(
+                cmd, stdout=out, stderr=subprocess.STDOUT, env=env
+            )
+        client = DaemonClient(self.socket_path)
+        deadline = time.monotonic() + self.startup
+        while not client.is_running():
+            if self._proc.poll() is not None or time.monotonic() > deadline:
+                output = (self.home / "daemon.out").read_text()[-2000:]
+                self.__exit__(None, None, None)
+                raise RuntimeError(f"Daemon did not start:\n{output}")
+            time.sleep(0.1)
+        return self
+
+    def __exit__(self, *exc):
+        if self._proc and self._proc.poll() is None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(10)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+        if self.home:
+            shutil.rmtree(self.home, ignore_errors=True)
+
+
+class LoadGenerator:
+    """Sends a weighted mix of API requests at a fixed rate and measures them.
+
+    Requests start on a fixed schedule regardless of how fast earlier ones
+    finish (open loop). Latency is measured from each request's scheduled
+    start, so time spent waiting for a free sender, or behind a blocked
+    daemon, is counted rather than hidden.
+    """
+
+    def __init__(
+        self,
+        socket_path: Path,
+        mix: Dict[str, float],
+        rate: float = 20,
+        duration: float = 30,
+        concurrency: int = 32,
+        packages: List[str] = (),
+        workspaces: int = 4,
+        wait_jobs: bool = False,
+        timeout: float = 300,
+        seed: int = None,
+    ):
+        if mix.get("install") and not packages:
+            raise ValueError("Install requests need at least one package")
+        self.socket_path = Path(socket_path)
+        self.mix = {op: weight for op, weight in mix.items() if weight > 0}
+        self.rate = rate
+        self.duration = duration
+        self.concurrency = concurrency
+        self.packages = list(packages)
+        self.workspaces = workspaces
+        self.wait_jobs = wait_jobs
+        self.timeout = timeout
+        self.random = random.Random(seed)
+        self.run_id = uuid.uuid4().hex[:8]
+        self.targets: List[str] = []
+        self._lock = threading.Lock()
+
+    def request(
+        self, method: str, path: str, params: Dict = None
+    ) -> Tuple[int, object]:
+        """Send one request on a new connection; return (status, decoded body)."""
+        url = quote(path) + (f"?{urlencode(params, doseq=True)}" if params else "")
+        conn = UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+        try:
+            conn.request(method, url)
+            response = conn.getresponse()
+            body = response.read()
+        finally:
+            conn.close()
+        try:
+            data = json.loads(body or b"null")
+        except ValueError:
+            data = body.decode(errors="replace")
+        return response.status, data
+
+    def wait_for_job(self, job_id: str) -> str:
+        """Long-poll a job until it finishes; return its final status."""
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            status, job = self.request("GET", f"/jobs/{job_id}", {"wait": 30})
+            if status != 200:
+                return "missing"
+            if job["status"] in ("succeeded", "failed", "cancelled"):
+                return job["status"]
+        return "timeout"
+
+    def setup(self):
+        """Create the workspaces that install and snapshot requests target."""
+        needed = self.mix.keys() & {"install", "snapshot"}
+        for i in range(self.workspaces if needed else 0):
+            name = f"bench-{self.run_id}-{i}"
+            status, data = self.request("POST", "/workspaces", {"name": name})
+            if status != 202 or self.wait_for_job(data["job_id"]) != "succeeded":
+                raise RuntimeError(f"Could not create workspace {name}: {data}")
+            self.targets.append(name)
+
+    def _call(self, operation: str) -> Tuple[str, str, Dict]:
+        if operation == "list":
+            return "GET", "/workspaces", {"limit": 100}
+        if operation == "create":
+            return "POST", "/workspaces", {"name": f"bench-{uuid.uuid4().hex[:12]}"}
+        with self._lock:
+            workspace = self.random.choice(self.targets)
+            package = self.random.choice(self.packages) if self.packages else None
+        if operation == "install":
+            # Never fall back to an index: only the wheel store may serve it
+            return (
+                "POST",
+                f"/install/{workspace}",
+                {"package": package, "offline": "true"},
+            )
+        return "POST", f"/workspaces/{workspace}/snapshot", None
+
+    def _send(self, operation: str, scheduled: float) -> Dict:
+        started = time.perf_counter()
+        result = {"operation": operation, "lag": started - scheduled, "error": None}
+        try:
+            method, path, params = self._call(operation)
+            status, data = self.request(method, path, params)
+            result["latency"] = time.perf_counter() - scheduled
+            result["status"] = status
+            if status >= 400:
+                result["error"] = f"HTTP {status}"
+            elif self.wait_jobs and isinstance(data, dict) and "job_id" in data:
+                job_status = self.wait_for_job(data["job_id"])
+                result["job_latency"] = time.perf_counter() - scheduled
+                if job_status != "succeeded":
+                    result["error"] = f"job {job_status}"
+        except Exception as e:
+            result["latency"] = time.perf_counter() - scheduled
+            result["error"] = type(e).__name__
+        return result
+
+    def run(self) -> Dict:
+        """Drive load for the configured duration and return the report."""
+        operations, weights = zip(*self.mix.items())
+        futures = []
+        start = time.perf_counter()
+        total = int(self.rate * self.duration)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for i in range(total):
+                scheduled = start + i / self.rate
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                operation = self.random.choices(operations, weights)[0]
+                futures.append(pool.submit(self._send, operation, scheduled))
+            results = [future.result() for future in futures]
+        return summarize(results, time.perf_counter() - start, self)
+
+
+def _stats(results: List[Dict], elapsed: float) -> Dict:
+    ok = [r for r in results if not r["error"]]
+    latencies = [r["latency"] for r in ok]
+    job_latencies = [r["job_latency"] for r in ok if "job_latency" in r]
+    errors: Dict[str, int] = {}
+    for r in results:
+        if r["error"]:
+            errors[r["error"]] = errors.get(r["error"], 0) + 1
+    return {
+        "requests": len(results),
+        "errors": sum(errors.values()),
+        "error_rate": sum(errors.values()) / len(results) if results else 0.0,
+        "error_kinds": errors,
+        "throughput": len(ok) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies, default=None),
+        "job_p50": percentile(job_latencies, 50),
+        "job_p99": percentile(job_latencies, 99),
+    }
+
+
+def summarize(results: List[Dict], elapsed: float, generator: LoadGenerator) -> Dict:
+    """Overall and per-operation throughput, latency percentiles and errors."""
+    by_operation = {}
+    for operation in OPERATIONS:
+        subset = [r for r in results if r["operation"] == operation]
+        if subset:
+            by_operation[operation] = _stats(subset, elapsed)
+    return {
+        "target_rate": generator.rate,
+        "duration": generator.duration,
+        # Includes waiting for the last responses (and jobs) to finish
+        "elapsed": elapsed,
+        "concurrency": generator.concurrency,
+        "wait_jobs": generator.wait_jobs,
+        # How late requests started; high values mean too few senders
+        "lag_p99": percentile([r["lag"] for r in results], 99),
+        "total": _stats(results, elapsed),
+        "operations": by_operation,
+    }
+
+
+def format_report(report: Dict) -> str:
+    def ms(value):
+        return "-" if value is None else f"{value * 1000:.1f}ms"
+
+    lines = [
+        f"Target {report['target_rate']:g} req/s for {report['duration']:g}s "
+        f"(ran {report['elapsed']:.1f}s), {report['concurrency']} senders, "
+        f"start lag p99 {ms(report['lag_p99'])}",
+        "",
+        f"{'operation':<10} {'requests':>8} {'req/s':>8} {'errors':>7} "
+        f"{'p50':>9} {'p99':>9} {'max':>9}"
+        + (f" {'job p50':>9} {'job p99':>9}" if report["wait_jobs"] else ""),
+    ]
+    rows = list(report["operations"].items()) + [("total", report["total"])]
+    for name, stats in rows:
+        line = (
+            f"{name:<10} {stats['requests']:>8} {stats['throughput']:>8.1f} "
+            f"{stats['error_rate']:>7.1%} {ms(stats['p50']):>9} "
+            f"{ms(stats['p99']):>9} {ms(stats['max']):>9}"
+        )
+        if report["wait_jobs"]:
+            line += f" {ms(stats['job_p50']):>9} {ms(stats['job_p99']):>9}"
+        lines.append(line)
+    errors = report["total"]["error_kinds"]
+    if errors:
+        lines.append("")
+        lines.append(
+            "Errors: " + ", ".join(f"{kind} x{n}" for kind, n in errors.items())
+        )
+    return "\n".join(lines)
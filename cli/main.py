@@ -1,39 +1,65 @@
 import typer
-from env_manager.environment import EnvironmentManager
-from env_manager.cache import CacheManager
-from env_manager.config import ConfigManager
-from .commands.init import init as init_cmd
-from .commands.use import use as use_cmd
-from .commands.create import create as create_cmd
-from .commands.install import install as install_cmd
-from .commands.list import list as list_cmd
-from .commands.remove import remove as remove_cmd
-from .commands.status import status as status_cmd
-from .commands.cache_clear import cache_clear as cache_clear_cmd
-from .commands.doctor import doctor as doctor_cmd
+from pathlib import Path
+from typing import List
 
+# Command implementations are imported inside each command so that startup
+# only pays for the command that actually runs.
 app = typer.Typer()
-env_manager = EnvironmentManager()
-cache_manager = CacheManager()
-config_manager = ConfigManager()
+cache_app = typer.Typer(help="Manage the wheel cache.")
+app.add_typer(cache_app, name="cache")
+bench_app = typer.Typer(help="Measure PySpace performance.")
+app.add_typer(bench_app, name="bench")
+
+
+@app.callback()
+def callback(
+    ctx: typer.Context,
+    profile: Path = typer.Option(
+        None, "--profile", help="Write a Chrome trace of the command to this file"
+    ),
+    cprofile: Path = typer.Option(
+        None, "--cprofile", help="Write cProfile stats of the command to this file"
+    ),
+):
+    """Manage Python environments."""
+    if profile or cprofile:
+        from env_manager.tracing import profile as profile_command
+
+        # Entered now and exited after the command, so it covers the whole run
+        ctx.with_resource(
+            profile_command(profile, cprofile, f"pyspace {ctx.invoked_subcommand}")
+        )
 
 
 @app.command()
 def init(name: str = None):
     """Initialize PySpace in current directory."""
+    from .commands.init import init as init_cmd
+
     init_cmd(name)
 
 
 @app.command()
 def use(name: str):
     """Switch to a different environment."""
+    from .commands.use import use as use_cmd
+
     use_cmd(name)
 
 
 @app.command()
-def create(name: str, python: str = None):
-    """Create a new environment."""
-    create_cmd(name, python)
+def create(
+    names: List[str],
+    python: str = None,
+    workers: int = typer.Option(None, "--workers"),
+    install_python: bool = typer.Option(
+        False, "--install-python", help="Install the Python version with pyenv first"
+    ),
+):
+    """Create one or more environments."""
+    from .commands.create import create as create_cmd
+
+    create_cmd(names, python, workers, install_python)
 
 
 @app.command()
@@ -41,38 +67,181 @@ def install(
     package: str,
     global_flag: bool = typer.Option(False, "--global"),
     local: bool = typer.Option(False, "--local"),
+    offline: bool = typer.Option(
+        None, "--offline/--online", help="Install only from the wheel cache"
+    ),
 ):
     """Install a package."""
-    install_cmd([package], global_flag)
+    from .commands.install import install as install_cmd
+
+    install_cmd([package], global_flag, offline)
 
 
 @app.command()
-def list():
-    """List all environments."""
-    list_cmd()
+def list(
+    pattern: str = typer.Option(None, "--pattern", help="Glob, e.g. 'ci-*'"),
+    python: str = typer.Option(None, "--python"),
+    sort: str = typer.Option(
+        "name", "--sort", help="name, python_version, size, packages or last_used"
+    ),
+    reverse: bool = typer.Option(False, "--reverse"),
+    offset: int = typer.Option(0, "--offset"),
+    limit: int = typer.Option(None, "--limit"),
+    stats: bool = typer.Option(False, "--stats", help="Show size and package count"),
+):
+    """List environments."""
+    from .commands.list import list as list_cmd
+
+    list_cmd(pattern, python, sort, reverse, offset, limit, stats)
 
 
 @app.command()
-def remove(name: str):
-    """Remove an environment."""
-    remove_cmd(name)
+def remove(
+    names: List[str] = typer.Argument(None),
+    pattern: str = typer.Option(None, "--pattern", help="Glob, e.g. 'ci-*'"),
+    workers: int = typer.Option(None, "--workers"),
+):
+    """Remove environments by name and/or pattern."""
+    from .commands.remove import remove as remove_cmd
+
+    remove_cmd(names or [], pattern, workers)
+
+
+@app.command()
+def lock(
+    index_url: str = typer.Option(None, "--index-url"),
+    find_links: str = typer.Option(None, "--find-links"),
+):
+    """Resolve pyspace.json dependencies into pyspace.lock."""
+    from .commands.lock import lock as lock_cmd
+
+    lock_cmd(index_url, find_links)
+
+
+@app.command()
+def sync(
+    dry_run: bool = typer.Option(False, "--dry-run"),
+    offline: bool = typer.Option(
+        None, "--offline/--online", help="Install only from the wheel cache"
+    ),
+):
+    """Make the project environment match pyspace.lock."""
+    from .commands.sync import sync as sync_cmd
+
+    sync_cmd(dry_run, offline)
 
 
 @app.command()
 def status():
     """Show current status."""
+    from .commands.status import status as status_cmd
+
     status_cmd()
 
 
 @app.command()
 def cache_clear():
     """Clear the package cache."""
+    from .commands.cache_clear import cache_clear as cache_clear_cmd
+
     cache_clear_cmd()
 
 
+@cache_app.command("prefetch")
+def cache_prefetch(
+    packages: List[str] = typer.Argument(None),
+    requirements: Path = typer.Option(None, "--requirements", "-r"),
+    workers: int = typer.Option(None, "--workers"),
+):
+    """Download missing wheels for packages or a requirements file."""
+    from .commands.cache_prefetch import cache_prefetch as cache_prefetch_cmd
+
+    cache_prefetch_cmd(packages or [], requirements, workers)
+
+
+@cache_app.command("build")
+def cache_build(
+    packages: List[str] = typer.Argument(None),
+    requirements: Path = typer.Option(None, "--requirements", "-r"),
+    python: str = typer.Option(
+        None, "--python", help="Interpreter version to build for"
+    ),
+    workers: int = typer.Option(None, "--workers"),
+):
+    """Download requirements and build wheels for their cached sdists.
+
+    With no requirements given, every cached sdist is built.
+    """
+    from .commands.cache_build import cache_build as cache_build_cmd
+
+    cache_build_cmd(packages or [], requirements, python, workers)
+
+
+@cache_app.command("prune")
+def cache_prune(
+    max_age_days: int = typer.Option(None, "--max-age-days"),
+    max_bytes: int = typer.Option(None, "--max-bytes"),
+    policy: str = typer.Option(None, "--policy", help="lru or lfu"),
+):
+    """Evict cache entries past their age or over the size budget."""
+    from .commands.cache_prune import cache_prune as cache_prune_cmd
+
+    cache_prune_cmd(max_age_days, max_bytes, policy)
+
+
+@bench_app.command("api")
+def bench_api(
+    rate: float = typer.Option(20, "--rate", help="Requests started per second"),
+    duration: float = typer.Option(30, "--duration", help="Seconds of load"),
+    concurrency: int = typer.Option(32, "--concurrency", help="Concurrent senders"),
+    mix: str = typer.Option(
+        "list=70,create=10,install=10,snapshot=10",
+        "--mix",
+        help="Weights for list, create, install and snapshot requests",
+    ),
+    workspaces: int = typer.Option(
+        4, "--workspaces", help="Workspaces that installs and snapshots target"
+    ),
+    wait_jobs: bool = typer.Option(
+        False, "--wait-jobs", help="Also time each job until it finishes"
+    ),
+    wheelhouse: Path = typer.Option(
+        None, "--wheelhouse", help="Wheels the throwaway daemon installs from"
+    ),
+    package: List[str] = typer.Option(
+        None, "--package", help="Packages to install (default: the wheelhouse's)"
+    ),
+    socket: Path = typer.Option(
+        None, "--socket", help="Load a running daemon instead of a throwaway one"
+    ),
+    job_workers: int = typer.Option(
+        None, "--job-workers", help="Job workers for the throwaway daemon"
+    ),
+    output: Path = typer.Option(None, "--json", help="Also write the report here"),
+):
+    """Drive a mix of API requests at a daemon and report latency and errors."""
+    from .commands.bench import bench_api as bench_api_cmd
+
+    bench_api_cmd(
+        rate,
+        duration,
+        concurrency,
+        mix,
+        workspaces,
+        wait_jobs,
+        wheelhouse,
+        package or [],
+        socket,
+        job_workers,
+        output,
+    )
+
+
 @app.command()
 def doctor():
     """Run diagnostics."""
+    from .commands.doctor import doctor as doctor_cmd
+
     doctor_cmd()
 
 
@@ -1,28 +1,67 @@
+# PySpace Daemon
+import hashlib
+import heapq
+import json
+import queue
 import time
 import threading
 from pathlib import Path
-from typing import Dict
+from typing import Any, Callable, Dict
 from loguru import logger
 from env_manager.environment import EnvironmentManager
 from env_manager.cache import CacheManager
 from env_manager.config import ConfigManager
+from env_manager.pool import VenvPool
 from daemon.watcher import FileWatcher
 
 
 class PySpaceDaemon:
-    def __init__(self):
-        self.env_manager = EnvironmentManager()
-        self.cache_manager = CacheManager()
-        self.config_manager = ConfigManager()
+    def __init__(
+        self,
+        env_manager: EnvironmentManager = None,
+        cache_manager: CacheManager = None,
+        config_manager: ConfigManager = None,
+    ):
+        self.config_manager = config_manager or ConfigManager()
+        if env_manager is None:
+            pool_size = self.config_manager.get("pool_size", 2)
+            env_manager = EnvironmentManager(
+                pool=VenvPool(size=pool_size) if pool_size else None
+            )
+        self.env_manager = env_manager
+        self.cache_manager = cache_manager or CacheManager(
+            max_bytes=self.config_manager.get("cache_max_bytes"),
+            max_age_days=self.config_manager.get("cache_max_age_days"),
+            policy=self.config_manager.get("cache_eviction_policy", "lru"),
+        )
         self.running = False
         self.watcher_thread = None
         self.watcher = None
+        self._pool_thread = None
         self.pyspace_json_path = Path.cwd() / "pyspace.json"
+        # Every unit of work (watcher events, timers, external requests) goes
+        # through this queue and is handled on the daemon's main loop.
+        self.events = queue.Queue()
+        self._timers = []
+        self._handlers: Dict[str, Callable[[Any], None]] = {
+            "config_changed": lambda payload: self._check_auto_sync(),
+            "sync": lambda payload: self._check_auto_sync(),
+            "prune": lambda payload: self.cache_manager.prune_cache(
+                max_age_days=self.cache_manager.max_age_days,
+                max_bytes=self.cache_manager.max_bytes,
+            ),
+            "pool_refill": lambda payload: self._refill_pool(),
+        }
+        self._last_config_hash = None
+        self._run_id = 0
+        self.events_processed = 0
 
     def start(self):
         """Start the daemon."""
         logger.info("Starting PySpace daemon")
         self.running = True
+        self._run_id += 1
+        self._timers = []
 
         # Start file watcher in a separate thread
         self.watcher_thread = threading.Thread(
@@ -30,11 +69,20 @@ class PySpaceDaemon:
         )
         self.watcher_thread.start()
 
+        # Periodic safety nets; normal syncs are triggered by watcher events
+        self.schedule("sync", self.config_manager.get("sync_interval", 300))
+        if self.cache_manager.max_bytes is not None:
+            self.schedule("prune", self.config_manager.get("prune_interval", 3600))
+        if self.env_manager.pool:
+            self.schedule(
+                "pool_refill", self.config_manager.get("pool_refill_interval", 60)
+            )
+            self.submit("pool_refill")
+        self.submit("sync")
+
         logger.success("PySpace daemon started")
         try:
-            while self.running:
-                self._check_auto_sync()
-                time.sleep(5)  # Check every 5 seconds
+            self._run_loop()
         except KeyboardInterrupt:
             logger.info("Daemon interrupted by user")
         except Exception as e:
@@ -46,6 +94,8 @@ class PySpaceDaemon:
         """Stop the daemon."""
         logger.info("Stopping PySpace daemon")
         self.running = False
+        # Wake the main loop so shutdown does not wait for the next timer
+        self.events.put(("stop", self._run_id))
         if self.watcher_thread and self.watcher_thread.is_alive():
             # Stop the file watcher gracefully
             try:
@@ -57,18 +107,90 @@ class PySpaceDaemon:
                 logger.warning(f"Error stopping watcher thread: {e}")
         logger.success("PySpace daemon stopped")
 
+    def submit(self, kind: str, payload: Any = None):
+        """Queue work for the daemon loop. Safe to call from any thread."""
+        self.events.put((kind, payload))
+
+    def schedule(self, kind: str, interval: float):
+        """Submit an event of the given kind every interval seconds."""
+        heapq.heappush(self._timers, (time.monotonic() + interval, interval, kind))
+
+    def register_handler(self, kind: str, handler: Callable[[Any], None]):
+        """Register the function that handles queued events of a kind."""
+        self._handlers[kind] = handler
+
+    def _run_loop(self):
+        """Process queued events until stopped, sleeping until the next timer."""
+        while self.running:
+            timeout = None
+            if self._timers:
+                timeout = max(0.0, self._timers[0][0] - time.monotonic())
+            try:
+                kind, payload = self.events.get(timeout=timeout)
+            except queue.Empty:
+                self._fire_due_timers()
+                continue
+            if kind == "stop":
+                # Ignore stop requests left over from a previous run
+                if payload == self._run_id:
+                    break
+                continue
+            self._dispatch(kind, payload)
+
+    def _fire_due_timers(self):
+        now = time.monotonic()
+        while self._timers and self._timers[0][0] <= now:
+            _, interval, kind = heapq.heappop(self._timers)
+            heapq.heappush(self._timers, (now + interval, interval, kind))
+            self._dispatch(kind, None)
+
+    def _dispatch(self, kind: str, payload: Any):
+        handler = self._handlers.get(kind)
+        if handler is None:
+            logger.warning(f"No handler for daemon event '{kind}'")
+            return
+        try:
+            handler(payload)
+        except Exception as e:
+            logger.error(f"Error handling daemon event '{kind}': {e}")
+        self.events_processed += 1
+
+    def _refill_pool(self):
+        """Top up the env pool on a worker thread; building can take seconds."""
+        if self._pool_thread and self._pool_thread.is_alive():
+            return
+        self._pool_thread = threading.Thread(target=self._fill_pool, daemon=True)
+        self._pool_thread.start()
+
+    def _fill_pool(self):
+        """Top up pooled envs for each configured interpreter version."""
+        pool = self.env_manager.pool
+        versions = self.config_manager.get("pool_pythons") or [
+            self.config_manager.get("python_version", "3.11")
+        ]
+        try:
+            for version in versions:
+                python_exe = self.env_manager.find_python(version)
+                if python_exe:
+                    pool.fill(python_exe)
+            pool.refill()
+        except Exception as e:
+            logger.error(f"Error refilling environment pool: {e}")
+
     def _start_file_watcher(self):
         """Start watching pyspace.json for changes."""
         # Keep a reference so we can stop it later
         self.watcher = FileWatcher(
-            self.pyspace_json_path, self._on_pyspace_json_changed
+            self.pyspace_json_path,
+            self._on_pyspace_json_changed,
+            debounce=self.config_manager.get("watch_debounce", 0.2),
         )
         self.watcher.start_watching()
 
-    def _on_pyspace_json_changed(self):
+    def _on_pyspace_json_changed(self, *args):
         """Callback when pyspace.json changes."""
         logger.info("pyspace.json has changed, triggering auto-sync")
-        self._check_auto_sync()
+        self.submit("config_changed")
 
     def _check_auto_sync(self):
         """Check for pyspace.json changes and sync."""
@@ -77,6 +199,13 @@ class PySpaceDaemon:
 
         try:
             local_config = self.config_manager.get_local_config()
+            config_hash = hashlib.sha256(
+                json.dumps(local_config, sort_keys=True).encode()
+            ).hexdigest()
+            if config_hash == self._last_config_hash:
+                logger.debug("pyspace.json unchanged, skipping sync")
+                return
+            self._last_config_hash = config_hash
             env_name = local_config.get("environment")
             if env_name:
                 if not self.env_manager.is_active(env_name):
@@ -92,6 +221,8 @@ class PySpaceDaemon:
         """Get daemon status."""
         return {
             "running": self.running,
-            "environments": len(self.env_manager.list_environments()),
+            "environments": self.env_manager.count_environments(),
             "cache_info": self.cache_manager.get_cache_info(),
+            "pending_events": self.events.qsize(),
+            "events_processed": self.events_processed,
         }
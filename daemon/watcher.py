@@ -1,24 +1,107 @@
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import sys
+import threading
 import time
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Optional
 from loguru import logger
 
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal ctypes binding for a single inotify directory watch."""
+
+    def __init__(self, directory: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def read_events(self):
+        """Yield (mask, name) for every pending event."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            yield mask, os.fsdecode(name)
+
+    def close(self):
+        os.close(self.fd)
+
 
 class FileWatcher:
-    def __init__(self, file_path: Path, callback: Callable):
+    def __init__(
+        self,
+        file_path: Path,
+        callback: Callable,
+        debounce: float = 0.2,
+        poll_interval: float = 1.0,
+        backend: str = "auto",
+    ):
         self.file_path = file_path
         self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.backend = backend
         self.last_modified = None
+        self.last_digest = None
+        self._initialized = False
         self.watching = False
+        self._stop_event = threading.Event()
+        self._wake_r, self._wake_w = None, None
 
     def start_watching(self):
         """Start watching for file changes."""
         logger.info(f"Starting to watch file: {self.file_path}")
         self.watching = True
+        self._stop_event.clear()
+        self._record_baseline()
         try:
-            while self.watching:
-                self.watch()
-                time.sleep(1)  # Check every second
+            inotify = self._open_inotify()
+            if inotify:
+                self._watch_inotify(inotify)
+            else:
+                self._watch_polling()
         except Exception as e:
             logger.error(f"Error while watching file: {e}")
 
@@ -26,45 +109,115 @@ class FileWatcher:
         """Stop watching for file changes."""
         logger.info("Stopping file watcher")
         self.watching = False
+        self._stop_event.set()
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"x")
+            except OSError:
+                pass
 
     def set_callback(self, callback: Callable):
         """Update the callback invoked when the watched file changes."""
         logger.debug("Updating file watcher callback")
         self.callback = callback
 
+    def _open_inotify(self) -> Optional[_Inotify]:
+        if self.backend == "polling" or not sys.platform.startswith("linux"):
+            return None
+        try:
+            return _Inotify(self.file_path.parent)
+        except (OSError, AttributeError) as e:
+            if self.backend == "inotify":
+                raise
+            logger.warning(f"inotify unavailable ({e}), falling back to polling")
+            return None
+
+    def _watch_inotify(self, inotify: _Inotify):
+        """Block on inotify events for the watched file's directory."""
+        logger.debug(f"Using inotify backend for {self.file_path}")
+        self._wake_r, self._wake_w = os.pipe()
+        try:
+            pending_since = None
+            while self.watching:
+                timeout = None
+                if pending_since is not None:
+                    timeout = max(0.0, pending_since + self.debounce - time.monotonic())
+                readable, _, _ = select.select(
+                    [inotify.fd, self._wake_r], [], [], timeout
+                )
+                if self._wake_r in readable or not self.watching:
+                    break
+                if inotify.fd in readable:
+                    for mask, name in inotify.read_events():
+                        if mask & (IN_DELETE_SELF | IN_IGNORED):
+                            logger.warning(
+                                f"{self.file_path.parent} is no longer watchable"
+                            )
+                            self.watching = False
+                        elif name == self.file_path.name:
+                            # Restart the debounce window on every event in a burst
+                            pending_since = time.monotonic()
+                elif pending_since is not None:
+                    pending_since = None
+                    self.watch()
+        finally:
+            inotify.close()
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self._wake_r, self._wake_w = None, None
+
+    def _watch_polling(self):
+        """Poll the file's content hash every poll_interval seconds."""
+        logger.debug(f"Using polling backend for {self.file_path}")
+        while self.watching:
+            self.watch()
+            if self._stop_event.wait(self.poll_interval):
+                break
+
+    def _digest(self) -> Optional[str]:
+        try:
+            return hashlib.sha256(self.file_path.read_bytes()).hexdigest()
+        except FileNotFoundError:
+            return None
+
+    def _record_baseline(self):
+        self.last_digest = self._digest()
+        if self.last_digest is not None:
+            self.last_modified = self.file_path.stat().st_mtime
+        self._initialized = True
+
     def watch(self):
-        """Watch for file changes."""
+        """Check the file once and fire the callback if its content changed."""
         try:
             if not self.file_path.exists():
                 return
 
-            current_modified = self.file_path.stat().st_mtime
-            if self.last_modified is None:
-                self.last_modified = current_modified
-                logger.debug(f"Initial file modification time: {current_modified}")
-            elif current_modified > self.last_modified:
-                logger.info(f"File {self.file_path} has been modified")
-                self.last_modified = current_modified
-                # Callbacks may accept different signatures in tests (file_path, action)
-                try:
-                    self.callback(self.file_path, "modified")
-                except TypeError:
-                    # Fallback to no-arg callback for backwards compatibility
-                    self.callback()
+            if not self._initialized:
+                self._record_baseline()
+                logger.debug(f"Initial file digest: {self.last_digest}")
+                return
+            current_digest = self._digest()
+            # A missing file is usually the middle of an atomic-rename save
+            if current_digest is None or current_digest == self.last_digest:
+                return
+            logger.info(f"File {self.file_path} has been modified")
+            self.last_digest = current_digest
+            self.last_modified = self.file_path.stat().st_mtime
+            self._notify(self.file_path, "modified")
         except Exception as e:
             logger.error(f"Error checking file modification: {e}")
 
-    def set_callback(self, callback):
-        """Set or replace the callback used when a file changes."""
-        self.callback = callback
+    def _notify(self, file_path, action):
+        # Callbacks may accept different signatures in tests (file_path, action)
+        try:
+            self.callback(file_path, action)
+        except TypeError:
+            # Fallback to no-arg callback for backwards compatibility
+            self.callback()
 
     def _on_file_change(self, instance, file_path, action):
         """Helper used by tests to simulate an on-change event."""
         try:
-            # Ensure callback receives consistent parameters
-            try:
-                self.callback(file_path, action)
-            except TypeError:
-                self.callback()
+            self._notify(file_path, action)
         except Exception as e:
             logger.error(f"Error in _on_file_change callback: {e}")
@@ -1,49 +1,252 @@
+import atexit
 import hashlib
 import json
+import shutil
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict
 from loguru import logger
+from env_manager.tracing import traced
+
+EVICTION_ORDER = {
+    "lru": "last_access ASC",
+    "lfu": "access_count ASC, last_access ASC",
+}
+
+# Open managers whose buffered access times are written at interpreter exit
+_open_managers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_managers():
+    for manager in list(_open_managers):
+        manager.flush_access()
 
 
 class CacheManager:
-    def __init__(self, cache_dir: Path = None):
+    def __init__(
+        self,
+        cache_dir: Path = None,
+        max_bytes: int = None,
+        max_age_days: int = None,
+        policy: str = "lru",
+    ):
+        if policy not in EVICTION_ORDER:
+            raise ValueError(f"Unknown eviction policy '{policy}'")
         self.cache_dir = cache_dir or Path.home() / ".pyspace" / "cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.policy = policy
+        self.db_path = self.cache_dir / "metadata.db"
+        # Legacy JSON store, imported once and then retired
         self.metadata_file = self.cache_dir / "metadata.json"
-        self._load_metadata()
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        # checksum -> (last access time, number of hits) not yet written to disk
+        self._pending_access = {}
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._init_db()
+        self._migrate_json_metadata()
+        _open_managers.add(self)
+
+    def _init_db(self):
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS packages (
+                    checksum TEXT PRIMARY KEY,
+                    package TEXT NOT NULL,
+                    version TEXT,
+                    cached_at TEXT
+                )
+            """)
+            # Columns added after the first SQLite release of the cache
+            columns = {
+                row[1] for row in self._conn.execute("PRAGMA table_info(packages)")
+            }
+            for column, definition in (
+                ("path", "TEXT"),
+                ("size", "INTEGER NOT NULL DEFAULT 0"),
+                ("last_access", "REAL NOT NULL DEFAULT 0"),
+                ("access_count", "INTEGER NOT NULL DEFAULT 0"),
+            ):
+                if column not in columns:
+                    self._conn.execute(
+                        f"ALTER TABLE packages ADD COLUMN {column} {definition}"
+                    )
+                    if column == "last_access":
+                        # Existing entries start their age from the upgrade
+                        self._conn.execute(
+                            "UPDATE packages SET last_access = ?", (time.time(),)
+                        )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_packages_last_access "
+                "ON packages (last_access)"
+            )
+            # Running totals kept up to date by triggers so get_cache_info is O(1)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_stats (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    total_size INTEGER NOT NULL,
+                    total_packages INTEGER NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                INSERT OR IGNORE INTO cache_stats (id, total_size, total_packages)
+                SELECT 0, COALESCE(SUM(size), 0), COUNT(*) FROM packages
+            """)
+            self._conn.executescript("""
+                CREATE TRIGGER IF NOT EXISTS packages_insert AFTER INSERT ON packages
+                BEGIN
+                    UPDATE cache_stats SET total_size = total_size + NEW.size,
+                        total_packages = total_packages + 1;
+                END;
+                CREATE TRIGGER IF NOT EXISTS packages_delete AFTER DELETE ON packages
+                BEGIN
+                    UPDATE cache_stats SET total_size = total_size - OLD.size,
+                        total_packages = total_packages - 1;
+                END;
+                CREATE TRIGGER IF NOT EXISTS packages_resize
+                AFTER UPDATE OF size ON packages
+                BEGIN
+                    UPDATE cache_stats SET total_size = total_size - OLD.size + NEW.size;
+                END;
+            """)
+            self._conn.commit()
 
-    def _load_metadata(self):
-        if self.metadata_file.exists():
+    def _migrate_json_metadata(self):
+        """Import entries from the old metadata.json file, if present."""
+        if not self.metadata_file.exists():
+            return
+        try:
             with open(self.metadata_file) as f:
-                self.metadata = json.load(f)
-        else:
-            self.metadata = {}
-            self._save_metadata()
+                metadata = json.load(f)
+            with self.batch():
+                for checksum, entry in metadata.items():
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO packages "
+                        "(checksum, package, version, cached_at, last_access) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (
+                            checksum,
+                            entry.get("package"),
+                            entry.get("version"),
+                            entry.get("cached_at"),
+                            time.time(),
+                        ),
+                    )
+            self.metadata_file.rename(self.metadata_file.with_suffix(".json.bak"))
+            logger.info(f"Migrated {len(metadata)} cache entries to {self.db_path}")
+        except Exception as e:
+            logger.error(f"Failed to migrate cache metadata: {e}")
+
+    def _is_metadata_file(self, path: Path) -> bool:
+        return path.name.startswith("metadata.")
+
+    def _commit(self):
+        if self._batch_depth == 0:
+            self._write_access()
+            self._conn.commit()
 
-    def _save_metadata(self):
-        with open(self.metadata_file, "w") as f:
-            json.dump(self.metadata, f, indent=2)
+    def _write_access(self):
+        if not self._pending_access:
+            return
+        self._conn.executemany(
+            "UPDATE packages SET last_access = MAX(last_access, ?), "
+            "access_count = access_count + ? WHERE checksum = ?",
+            [
+                (last_access, hits, checksum)
+                for checksum, (last_access, hits) in self._pending_access.items()
+            ],
+        )
+        self._pending_access.clear()
+
+    def flush_access(self):
+        """Persist access times recorded by is_cached."""
+        with self._lock:
+            if self._pending_access and self._batch_depth == 0:
+                try:
+                    self._commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not record cache access times: {e}")
+
+    @contextmanager
+    def batch(self):
+        """Group several cache writes into a single transaction."""
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            except Exception:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.rollback()
+                raise
+            self._batch_depth -= 1
+            self._commit()
+            if self.max_bytes is not None and self._batch_depth == 0:
+                self._enforce_budget()
 
     def _calculate_checksum(self, package: str, version: str = None) -> str:
         """Calculate checksum for package."""
         key = f"{package}@{version}" if version else package
         return hashlib.md5(key.encode()).hexdigest()
 
+    @traced("cache_lookup", "cache")
     def is_cached(self, package: str, version: str = None) -> bool:
-        """Check if package is cached."""
+        """Check if package is cached, recording the access for eviction."""
         checksum = self._calculate_checksum(package, version)
-        return checksum in self.metadata
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM packages WHERE checksum = ?", (checksum,)
+            ).fetchone()
+            if row is None:
+                return False
+            # Access times are buffered so lookups stay read-only
+            _, hits = self._pending_access.get(checksum, (0, 0))
+            self._pending_access[checksum] = (time.time(), hits + 1)
+        if len(self._pending_access) >= 256:
+            self.flush_access()
+        return True
 
-    def cache_package(self, package: str, version: str = None):
-        """Cache a package."""
+    @traced("cache_store", "cache")
+    def cache_package(self, package: str, version: str = None, artifact: Path = None):
+        """Cache a package, optionally copying its artifact into the cache."""
         logger.info(f"Caching package '{package}' (version: {version or 'latest'})")
         checksum = self._calculate_checksum(package, version)
-        self.metadata[checksum] = {
-            "package": package,
-            "version": version,
-            "cached_at": str(Path.cwd()),
-        }
-        self._save_metadata()
+        path, size = None, 0
+        if artifact is not None:
+            path = self.cache_dir / artifact.name
+            if artifact.resolve() != path.resolve():
+                shutil.copy2(artifact, path)
+            size = path.stat().st_size
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO packages "
+                "(checksum, package, version, cached_at, path, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (checksum) DO UPDATE SET cached_at = excluded.cached_at, "
+                "path = excluded.path, size = excluded.size, "
+                "last_access = excluded.last_access",
+                (
+                    checksum,
+                    package,
+                    version,
+                    str(Path.cwd()),
+                    str(path) if path else None,
+                    size,
+                    time.time(),
+                ),
+            )
+            self._commit()
+            if self.max_bytes is not None and self._batch_depth == 0:
+                self._enforce_budget()
         logger.success(f"Package '{package}' cached successfully")
 
     def clear_cache(self):
@@ -51,29 +254,93 @@ class CacheManager:
         logger.info("Clearing package cache")
         try:
             for item in self.cache_dir.iterdir():
-                if item.is_file() and item != self.metadata_file:
+                if item.is_file() and not self._is_metadata_file(item):
                     item.unlink()
-            self.metadata = {}
-            self._save_metadata()
+            with self._lock:
+                self._conn.execute("DELETE FROM packages")
+                self._commit()
             logger.success("Cache cleared successfully")
         except Exception as e:
             logger.error(f"Failed to clear cache: {e}")
 
-    def prune_cache(self, max_age_days: int = 30):
-        """Prune old cache entries."""
-        logger.info(f"Pruning cache entries older than {max_age_days} days")
-        # Simplified - in practice, check timestamps
-        logger.info("Cache pruning completed")
+    def _enforce_budget(self):
+        if self._total_size() > self.max_bytes:
+            self.prune_cache(max_age_days=self.max_age_days, max_bytes=self.max_bytes)
+
+    def _total_size(self) -> int:
+        (total_size,) = self._conn.execute(
+            "SELECT total_size FROM cache_stats WHERE id = 0"
+        ).fetchone()
+        return total_size
+
+    def _evict(self, rows) -> int:
+        """Delete the given (checksum, path, size) rows and their artifacts."""
+        freed = 0
+        for checksum, path, size in rows:
+            if path:
+                Path(path).unlink(missing_ok=True)
+            self._conn.execute("DELETE FROM packages WHERE checksum = ?", (checksum,))
+            freed += size
+        return freed
+
+    def prune_cache(
+        self, max_age_days: int = 30, max_bytes: int = None, policy: str = None
+    ) -> Dict:
+        """Evict entries unused for max_age_days, then shrink below max_bytes."""
+        policy = policy or self.policy
+        if policy not in EVICTION_ORDER:
+            raise ValueError(f"Unknown eviction policy '{policy}'")
+        logger.info(
+            f"Pruning cache (max age: {max_age_days} days, max size: {max_bytes}, "
+            f"policy: {policy})"
+        )
+        removed, freed = 0, 0
+        with self._lock:
+            self._write_access()
+            if max_age_days is not None:
+                cutoff = time.time() - max_age_days * 86400
+                rows = self._conn.execute(
+                    "SELECT checksum, path, size FROM packages WHERE last_access < ?",
+                    (cutoff,),
+                ).fetchall()
+                freed += self._evict(rows)
+                removed += len(rows)
+            if max_bytes is not None:
+                excess = self._total_size() - max_bytes
+                if excess > 0:
+                    victims = []
+                    cursor = self._conn.execute(
+                        "SELECT checksum, path, size FROM packages "
+                        f"ORDER BY {EVICTION_ORDER[policy]}"
+                    )
+                    for row in cursor:
+                        victims.append(row)
+                        excess -= row[2]
+                        if excess <= 0:
+                            break
+                    freed += self._evict(victims)
+                    removed += len(victims)
+            self._commit()
+        logger.info(
+            f"Cache pruning completed: removed {removed} entries ({freed} bytes)"
+        )
+        return {"removed": removed, "freed": freed}
 
     def get_cache_info(self) -> Dict:
         """Get cache information."""
-        total_size = 0
-        for item in self.cache_dir.iterdir():
-            if item.is_file() and item != self.metadata_file:
-                total_size += item.stat().st_size
-
+        with self._lock:
+            total_size, total_packages = self._conn.execute(
+                "SELECT total_size, total_packages FROM cache_stats WHERE id = 0"
+            ).fetchone()
         return {
-            "total_packages": len(self.metadata),
+            "total_packages": total_packages,
             "total_size": total_size,
             "cache_dir": str(self.cache_dir),
         }
+
+    def close(self):
+        """Close the underlying database connection."""
+        self.flush_access()
+        _open_managers.discard(self)
+        with self._lock:
+            self._conn.close()
@@ -2,6 +2,19 @@ import json
 from pathlib import Path
 from typing import Dict, Any
 from loguru import logger
+from env_manager.store import get_store
+
+DEFAULT_CONFIG = {
+    "python_version": "3.11",
+    "default_env": None,
+    "auto_sync": True,
+    "cache_max_bytes": None,
+    "cache_max_age_days": 30,
+    "cache_eviction_policy": "lru",
+    "pool_size": 2,
+    "pool_pythons": [],
+    "bulk_workers": 4,
+}
 
 
 class ConfigManager:
@@ -9,30 +22,21 @@ class ConfigManager:
         self.config_dir = Path.home() / ".pyspace"
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.global_config_file = self.config_dir / "config.json"
-        self._load_config()
-
-    def _load_config(self):
-        if self.global_config_file.exists():
-            with open(self.global_config_file) as f:
-                self.config = json.load(f)
-        else:
-            self.config = {
-                "python_version": "3.11",
-                "default_env": None,
-                "auto_sync": True,
-            }
-            self._save_config()
-
-    def _save_config(self):
-        with open(self.global_config_file, "w") as f:
-            json.dump(self.config, f, indent=2)
+        # Shared with the daemon's ConfigManager and EnvironmentManager
+        self.store = get_store(self.global_config_file)
+
+    @property
+    def config(self) -> Dict:
+        return {**DEFAULT_CONFIG, **self.store.load()}
 
     def get(self, key: str, default: Any = None) -> Any:
-        return self.config.get(key, default)
+        config = self.store.load()
+        if key in config:
+            return config[key]
+        return DEFAULT_CONFIG.get(key) if default is None else default
 
     def set(self, key: str, value: Any):
-        self.config[key] = value
-        self._save_config()
+        self.store.set(key, value)
 
     def get_local_config(self) -> Dict:
         """Get local pyspace.json config."""
@@ -1,49 +1,97 @@
 import os
+import fnmatch
 import json
 import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional, Dict, List
 from loguru import logger
-from env_manager.utils import run_command
+from env_manager import utils
+from env_manager.interpreters import InterpreterRegistry
+from env_manager.metrics import OPERATION_SECONDS
+from env_manager.stats import STAT_FIELDS, EnvStatsCache
+from env_manager.store import get_store
+from env_manager.tracing import propagate, span, traced
+
+SORT_FIELDS = ("name", "python_version") + STAT_FIELDS
+DEFAULT_CONFIG = {"python_version": "3.11", "default_env": None}
 
 
 class EnvironmentManager:
-    def __init__(self, base_dir: Path = None):
+    def __init__(self, base_dir: Path = None, pool=None):
         self.base_dir = base_dir or Path.home() / ".pyspace" / "envs"
+        # Optional VenvPool of pre-built environments to claim instead of creating
+        self.pool = pool
+        self.interpreters = InterpreterRegistry()
+        self.stats = EnvStatsCache()
+        self._index = None
         self.base_dir.mkdir(parents=True, exist_ok=True)
         self.config_dir = Path.home() / ".pyspace"
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.config_file = self.config_dir / "config.json"
         self.metadata_file = self.config_dir / "metadata.json"
-        self._load_config()
-        self._load_metadata()
-
-    def _load_config(self):
-        if self.config_file.exists():
-            with open(self.config_file) as f:
-                self.config = json.load(f)
-        else:
-            self.config = {"python_version": "3.11", "default_env": None}
-            self._save_config()
-
-    def _save_config(self):
-        with open(self.config_file, "w") as f:
-            json.dump(self.config, f, indent=2)
-
-    def _load_metadata(self):
-        if self.metadata_file.exists():
-            with open(self.metadata_file) as f:
-                self.metadata = json.load(f)
-        else:
-            self.metadata = {}
-            self._save_metadata()
-
-    def _save_metadata(self):
-        with open(self.metadata_file, "w") as f:
-            json.dump(self.metadata, f, indent=2)
-
-    def create_environment(self, name: str, python_version: str = None) -> bool:
-        """Create a new virtual environment."""
+        self.config_store = get_store(self.config_file)
+        self.metadata_store = get_store(self.metadata_file)
+        # Metadata changes waiting to be written; batch() defers them to the end
+        self._metadata_lock = threading.RLock()
+        self._batch_depth = 0
+        self._pending_metadata: Dict[str, Optional[Dict]] = {}
+
+    @property
+    def config(self) -> Dict:
+        return {**DEFAULT_CONFIG, **self.config_store.load()}
+
+    @property
+    def metadata(self) -> Dict:
+        """Environment metadata by name, as last written. Treat as read-only."""
+        return self.metadata_store.load()
+
+    def _update_metadata(self, name: str, entry: Optional[Dict]):
+        """Record or (with entry=None) drop an environment's metadata."""
+        with self._metadata_lock:
+            self._pending_metadata[name] = entry
+            if self._batch_depth:
+                return
+        self._flush_metadata()
+
+    def _flush_metadata(self):
+        with self._metadata_lock:
+            pending, self._pending_metadata = self._pending_metadata, {}
+        if not pending:
+            return
+        with span("metadata_write", entries=len(pending)):
+            with self.metadata_store.transaction() as metadata:
+                for name, entry in pending.items():
+                    if entry is None:
+                        metadata.pop(name, None)
+                    else:
+                        metadata[name] = entry
+
+    @contextmanager
+    def batch(self):
+        """Write metadata once for all environment changes made inside the block."""
+        with self._metadata_lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._metadata_lock:
+                self._batch_depth -= 1
+                done = self._batch_depth == 0
+            if done:
+                self._flush_metadata()
+
+    @traced("create_environment")
+    def create_environment(
+        self, name: str, python_version: str = None, install_python: bool = False
+    ) -> bool:
+        """Create a new virtual environment.
+
+        With install_python, a missing pyenv interpreter is installed first.
+        """
         logger.info(
             f"Creating environment '{name}' with Python {python_version or 'default'}"
         )
@@ -53,6 +101,9 @@ class EnvironmentManager:
             return False
 
         python_version = python_version or self.config["python_version"]
+        if install_python and not self.install_python(python_version):
+            logger.error(f"Could not install Python {python_version} with pyenv")
+            return False
         # Resolve Python executable (pyenv or system)
         python_exe = self._find_python(python_version)
         if not python_exe:
@@ -60,43 +111,50 @@ class EnvironmentManager:
             return False
 
         try:
-            # Create the venv using the resolved python executable to ensure correct interpreter
-            returncode, out, err = run_command(
-                [python_exe, "-m", "venv", str(env_path)]
+            with OPERATION_SECONDS.time(operation="venv_create"), span("venv_create"):
+                if self.pool and self.pool.claim(python_exe, env_path):
+                    logger.debug(f"Using pooled environment for '{name}'")
+                else:
+                    env_path.mkdir(parents=True)
+                    # Create the venv using the resolved python executable to ensure correct interpreter
+                    returncode, out, err = utils.run_command(
+                        [python_exe, "-m", "venv", str(env_path)]
+                    )
+                    if returncode != 0:
+                        logger.error(f"venv creation failed: {err}")
+                        shutil.rmtree(env_path, ignore_errors=True)
+                        return False
+            self._update_metadata(
+                name,
+                {
+                    "python_version": python_version,
+                    "path": str(env_path),
+                    "created": str(Path.cwd()),
+                },
             )
-            if returncode != 0:
-                logger.error(f"venv creation failed: {err}")
-                return False
-            # Update metadata
-            self.metadata[name] = {
-                "python_version": python_version,
-                "path": str(env_path),
-                "created": str(Path.cwd()),
-            }
-            self._save_metadata()
             logger.success(f"Created environment '{name}' successfully")
             return True
         except Exception as e:
             logger.error(f"Failed to create environment '{name}': {e}")
             return False
 
+    def find_python(self, version: str = None) -> Optional[str]:
+        """Return the interpreter new environments of a Python version would use."""
+        return self._find_python(version or self.config["python_version"])
+
+    @traced("find_python")
     def _find_python(self, version: str) -> Optional[str]:
         """Find Python executable for given version."""
-        # Try pyenv first (if available)
-        try:
-            rc, out, err = run_command(["pyenv", "which", f"python{version}"])
-            if rc == 0 and out.strip():
-                return out.strip()
-        except Exception:
-            # pyenv not available or error invoking it; fall back below
-            pass
+        # Installed interpreters (pyenv, PATH, standard prefixes) resolve
+        # from the registry without running any subprocess
+        path = self.interpreters.find(version)
+        if path:
+            return path
 
-        # If version looks like a pyenv style (x.y.z), try to ensure it's installed
-        if self._is_valid_python_version(version):
-            # Attempt to get pyenv-managed python path
-            path = self._get_pyenv_python_path(version)
-            if path:
-                return path
+        # Lookup only: ask pyenv once, never install from here
+        path = self._get_pyenv_python_path(version)
+        if path:
+            return path
 
         # Fallback to system Python
         import sys
@@ -111,7 +169,7 @@ class EnvironmentManager:
     def _install_python_version(self, version: str) -> bool:
         """Install a Python version using pyenv."""
         try:
-            rc, out, err = run_command(["pyenv", "install", version])
+            rc, out, err = utils.run_command(["pyenv", "install", version])
             return rc == 0
         except Exception:
             return False
@@ -121,7 +179,7 @@ class EnvironmentManager:
         try:
             # Many setups respond to `pyenv which python` when PYENV_VERSION is set.
             # Simpler: ask pyenv for the path directly (tests mock run_command accordingly).
-            rc, out, err = run_command(["pyenv", "which", f"python{version}"])
+            rc, out, err = utils.run_command(["pyenv", "which", f"python{version}"])
             if rc == 0 and out.strip():
                 return out.strip()
             return None
@@ -130,7 +188,7 @@ class EnvironmentManager:
 
     def _list_pyenv_versions(self) -> List[str]:
         """Return list of installed pyenv versions (parsed)."""
-        rc, out, err = run_command(["pyenv", "versions"])
+        rc, out, err = utils.run_command(["pyenv", "versions"])
         if rc != 0:
             return []
         versions = []
@@ -141,8 +199,17 @@ class EnvironmentManager:
             versions.append(v)
         return versions
 
+    def install_python(self, version: str) -> bool:
+        """Install a pyenv Python version unless it is already available."""
+        if not self._is_valid_python_version(version):
+            logger.error(f"Not a full Python version: {version}")
+            return False
+        return self._ensure_pyenv_version(version)
+
     def _ensure_pyenv_version(self, version: str) -> bool:
         """Ensure a pyenv version is installed; install if missing."""
+        if self.interpreters.find(version):
+            return True
         installed = self._list_pyenv_versions()
         if version in installed:
             return True
@@ -160,27 +227,85 @@ class EnvironmentManager:
         else:  # Unix
             return str(env_path / "bin" / "activate")
 
-    def list_environments(self) -> List[Dict]:
-        """List all environments."""
+    def _env_names(self) -> List[str]:
+        """Return environment names, rescanning base_dir only when its mtime changes."""
+        mtime = self.base_dir.stat().st_mtime_ns
+        if self._index is None or self._index[0] != mtime:
+            with os.scandir(self.base_dir) as entries:
+                names = sorted(entry.name for entry in entries if entry.is_dir())
+            self._index = (mtime, names)
+        return self._index[1]
+
+    def count_environments(self) -> int:
+        return len(self._env_names())
+
+    def list_environments(self, **query) -> List[Dict]:
+        """List environments; see query_environments for the options."""
+        return self.query_environments(**query)["environments"]
+
+    def query_environments(
+        self,
+        pattern: str = None,
+        python_version: str = None,
+        sort: str = "name",
+        reverse: bool = False,
+        offset: int = 0,
+        limit: int = None,
+        stats: bool = False,
+    ) -> Dict:
+        """Filter, sort and page environments.
+
+        Basic fields come from the directory index and metadata. Size,
+        package count and last use are only computed when requested or
+        sorted on, and then only for the environments that need them.
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by '{sort}'; use one of {SORT_FIELDS}")
         envs = []
-        for name in self.base_dir.iterdir():
-            if name.is_dir():
-                metadata = self.metadata.get(name.name, {})
-                envs.append(
-                    {
-                        "name": name.name,
-                        "path": str(name),
-                        "python_version": metadata.get("python_version", "unknown"),
-                        "active": self.is_active(name.name),
-                    }
-                )
-        return envs
+        base = str(self.base_dir)
+        metadata = self.metadata
+        for name in self._env_names():
+            if pattern and not fnmatch.fnmatchcase(name, pattern):
+                continue
+            version = metadata.get(name, {}).get("python_version", "unknown")
+            if python_version and not (
+                version == python_version or version.startswith(python_version + ".")
+            ):
+                continue
+            envs.append(
+                {
+                    "name": name,
+                    "path": os.path.join(base, name),
+                    "python_version": version,
+                }
+            )
+
+        if sort in STAT_FIELDS:
+            self._add_stats(envs)
+        if sort != "name" or reverse:
+            present = [env for env in envs if env[sort] is not None]
+            missing = [env for env in envs if env[sort] is None]
+            envs = sorted(present, key=lambda env: env[sort], reverse=reverse)
+            envs += missing
+
+        page = envs[offset : None if limit is None else offset + limit]
+        if stats and sort not in STAT_FIELDS:
+            self._add_stats(page)
+        for env in page:
+            env["active"] = self.is_active(env["name"])
+        return {"environments": page, "total": len(envs)}
+
+    def _add_stats(self, envs: List[Dict]):
+        computed = self.stats.get_stats([env["path"] for env in envs])
+        for env in envs:
+            env.update(computed[env["path"]])
 
     def is_active(self, name: str) -> bool:
         """Check if environment is currently active."""
         # This is a simplified check - in practice, would need to track active env
         return False
 
+    @traced("remove_environment")
     def remove_environment(self, name: str) -> bool:
         """Remove an environment."""
         logger.info(f"Removing environment '{name}'")
@@ -190,22 +315,65 @@ class EnvironmentManager:
             return False
 
         try:
-            import shutil
-
             shutil.rmtree(env_path)
-            if name in self.metadata:
-                del self.metadata[name]
-                self._save_metadata()
+            self.stats.forget(str(env_path))
+            self._update_metadata(name, None)
             logger.success(f"Removed environment '{name}' successfully")
             return True
         except Exception as e:
             logger.error(f"Failed to remove environment '{name}': {e}")
             return False
 
-    def get_current_environment(self) -> Optional[str]:
+    def match_environments(self, pattern: str) -> List[str]:
+        """Return the names of environments matching a glob pattern."""
+        return [
+            name for name in self._env_names() if fnmatch.fnmatchcase(name, pattern)
+        ]
+
+    def _run_bulk(self, fn, names: List[str], max_workers: int) -> Dict[str, bool]:
+        names = list(dict.fromkeys(names))
+        if not names:
+            return {}
+        with self.batch(), ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(names)))
+        ) as executor:
+            return dict(zip(names, executor.map(propagate(fn), names)))
+
+    def create_environments(
+        self,
+        names: List[str],
+        python_version: str = None,
+        max_workers: int = 4,
+        install_python: bool = False,
+    ) -> Dict[str, bool]:
+        """Create several environments in parallel; return success per name."""
+        logger.info(f"Creating {len(names)} environments with {max_workers} workers")
+        if install_python and not self.install_python(
+            python_version or self.config["python_version"]
+        ):
+            return {name: False for name in names}
+        # Resolve the interpreter once up front rather than racing on it per env
+        self.find_python(python_version)
+        return self._run_bulk(
+            lambda name: self.create_environment(name, python_version),
+            names,
+            max_workers,
+        )
+
+    def remove_environments(
+        self, names: List[str] = None, pattern: str = None, max_workers: int = 4
+    ) -> Dict[str, bool]:
+        """Remove the named and/or pattern-matched environments in parallel."""
+        names = list(names or [])
+        if pattern:
+            names.extend(self.match_environments(pattern))
+        logger.info(f"Removing {len(names)} environments with {max_workers} workers")
+        return self._run_bulk(self.remove_environment, names, max_workers)
+
+    def get_current_environment(self, cwd: Path = None) -> Optional[str]:
         """Get currently active environment name."""
-        # Check for pyspace.json in current directory
-        pyspace_json = Path.cwd() / "pyspace.json"
+        # Check for pyspace.json in the given (or current) directory
+        pyspace_json = (cwd or Path.cwd()) / "pyspace.json"
         if pyspace_json.exists():
             with open(pyspace_json) as f:
                 data = json.load(f)
@@ -214,5 +382,4 @@ class EnvironmentManager:
 
     def set_default_environment(self, name: str):
         """Set default environment."""
-        self.config["default_env"] = name
-        self._save_config()
+        self.config_store.set("default_env", name)
@@ -0,0 +1,182 @@
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from loguru import logger
+from env_manager.tracing import traced
+from env_manager.utils import run_command
+
+INTERPRETER_RE = re.compile(r"^python(\d+(\.\d+)?)?(\.exe)?$")
+STANDARD_PREFIXES = [
+    "/usr/bin",
+    "/usr/local/bin",
+    "/opt/homebrew/bin",
+    "/Library/Frameworks/Python.framework/Versions/Current/bin",
+]
+PROBE_SCRIPT = (
+    "import json, sys, sysconfig; i = sys.implementation; v = sys.version_info; "
+    "print(json.dumps({'version': '%d.%d.%d' % v[:3], 'implementation': i.name, "
+    "'abi': {'cpython': 'cp', 'pypy': 'pp'}.get(i.name, i.name) + '%d%d' % v[:2] "
+    "+ ('t' if sysconfig.get_config_var('Py_GIL_DISABLED') else ''), "
+    "'soabi': sysconfig.get_config_var('SOABI')}))"
+)
+
+
+def _version_key(version: str):
+    return tuple(int(part) for part in version.split(".") if part.isdigit())
+
+
+class InterpreterRegistry:
+    """Persistent index of the Python interpreters installed on this machine.
+
+    Search directories (pyenv versions, PATH, standard prefixes) are scanned
+    once and recorded with their mtime; a directory is only rescanned when
+    its mtime changes, and each interpreter binary is probed for its version
+    and ABI only once per binary mtime. Lookups therefore cost a few stat
+    calls instead of a `pyenv which` subprocess.
+    """
+
+    def __init__(self, registry_file: Path = None):
+        self.registry_file = (
+            registry_file or Path.home() / ".pyspace" / "interpreters.json"
+        )
+        self.pyenv_root = Path(
+            os.environ.get("PYENV_ROOT", Path.home() / ".pyenv")
+        ).expanduser()
+        self._data = None
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def _load(self) -> Dict:
+        if self._data is None:
+            try:
+                with open(self.registry_file) as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+            self._data.setdefault("dirs", {})
+            self._data.setdefault("probes", {})
+        return self._data
+
+    def _save(self):
+        if not self._dirty:
+            return
+        self.registry_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.registry_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._data, f, indent=2)
+        os.replace(tmp, self.registry_file)
+        self._dirty = False
+
+    def search_dirs(self) -> List[str]:
+        """Return the directories to scan, in lookup priority order."""
+        dirs = []
+        versions_dir = self.pyenv_root / "versions"
+        try:
+            for entry in sorted(os.scandir(versions_dir), key=lambda e: e.name):
+                dirs.append(os.path.join(entry.path, "bin"))
+        except OSError:
+            pass
+        dirs.extend(os.environ.get("PATH", "").split(os.pathsep))
+        dirs.extend(STANDARD_PREFIXES)
+        shims = str(self.pyenv_root / "shims")
+        seen, result = set(), []
+        for directory in dirs:
+            # pyenv shims re-run pyenv on every call; the versions dir covers them
+            if directory and directory != shims and directory not in seen:
+                seen.add(directory)
+                result.append(directory)
+        return result
+
+    def refresh(self) -> bool:
+        """Rescan directories whose mtime changed; return True if anything did."""
+        with self._lock:
+            return self._refresh()
+
+    @traced("interpreter_scan")
+    def _refresh(self) -> bool:
+        data = self._load()
+        changed = False
+        for directory in self.search_dirs():
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                mtime = None
+            record = data["dirs"].get(directory)
+            if record and record["mtime"] == mtime:
+                continue
+            data["dirs"][directory] = {
+                "mtime": mtime,
+                "interpreters": self._scan_dir(directory) if mtime else [],
+            }
+            changed = True
+        if changed:
+            self._dirty = True
+            self._save()
+        return changed
+
+    def _scan_dir(self, directory: str) -> List[str]:
+        found = []
+        try:
+            entries = sorted(os.scandir(directory), key=lambda e: e.name)
+        except OSError:
+            return found
+        for entry in entries:
+            if INTERPRETER_RE.match(entry.name) and os.access(entry.path, os.X_OK):
+                if self._probe(entry.path):
+                    found.append(entry.path)
+        return found
+
+    def _probe(self, path: str) -> Optional[Dict]:
+        """Return version/ABI info for an interpreter, probing it at most once."""
+        probes = self._load()["probes"]
+        real = os.path.realpath(path)
+        try:
+            mtime = os.stat(real).st_mtime_ns
+        except OSError:
+            return None
+        info = probes.get(real)
+        if info and info["mtime"] == mtime:
+            return info
+        try:
+            returncode, out, err = run_command([real, "-c", PROBE_SCRIPT])
+            info = json.loads(out) if returncode == 0 else None
+        except (OSError, ValueError):
+            info = None
+        if not info:
+            logger.debug(f"Skipping {path}: not a usable Python interpreter")
+            return None
+        info["mtime"] = mtime
+        probes[real] = info
+        self._dirty = True
+        return info
+
+    def list_interpreters(self) -> List[Dict]:
+        """Return every known interpreter with its version and ABI, deduplicated."""
+        with self._lock:
+            self._refresh()
+            data = self._data
+            seen, result = set(), []
+            for directory in self.search_dirs():
+                for path in data["dirs"].get(directory, {}).get("interpreters", []):
+                    real = os.path.realpath(path)
+                    info = data["probes"].get(real)
+                    if info and real not in seen:
+                        seen.add(real)
+                        result.append({"path": path, **info})
+            return result
+
+    @traced("interpreter_find")
+    def find(self, version: str) -> Optional[str]:
+        """Return the newest interpreter matching `3`, `3.11` or `3.11.7`."""
+        matches = [
+            entry
+            for entry in self.list_interpreters()
+            if entry["version"] == version or entry["version"].startswith(version + ".")
+        ]
+        if not matches:
+            return None
+        # max() keeps the first of equal versions, so search order breaks ties
+        return max(matches, key=lambda entry: _version_key(entry["version"]))["path"]
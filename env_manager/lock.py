@@ -0,0 +1,222 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence
+from loguru import logger
+from packaging.version import InvalidVersion, Version
+from env_manager import utils
+from env_manager.stats import find_site_packages
+from pyspace_daemon.cache_manager import normalize_name
+
+LOCK_FILE = "pyspace.lock"
+LOCK_VERSION = 1
+# Installer tooling is left alone even when nothing in the lock needs it
+TOOLING = {"pip", "setuptools", "wheel"}
+
+
+def compare_versions(a: str, b: str) -> int:
+    """Return -1, 0 or 1 as version a is older than, equal to or newer than b."""
+    try:
+        a, b = Version(a), Version(b)
+    except InvalidVersion:
+        # Not PEP 440; plain string order is the best we can do
+        pass
+    return (a > b) - (a < b)
+
+
+def source_args(index_url: str = None, find_links: str = None) -> List[str]:
+    """Return pip arguments selecting where packages come from."""
+    args = []
+    if index_url:
+        args += ["--index-url", index_url]
+    elif find_links:
+        args.append("--no-index")
+    if find_links:
+        args += ["--find-links", find_links]
+    return args
+
+
+def resolve_lock(
+    env_path: Path, requirements: Sequence[str], pip_args: Sequence[str] = ()
+) -> Dict:
+    """Resolve requirements for env_path's interpreter into a lock with hashes.
+
+    Uses `pip install --dry-run --report`, so nothing is installed and the
+    resolution honours the environment's Python version and platform.
+    """
+    lock = {
+        "version": LOCK_VERSION,
+        "requirements": list(requirements),
+        "pip_args": list(pip_args),
+        "packages": [],
+    }
+    if not requirements:
+        return lock
+    python_exe = utils.get_python_executable(env_path)
+    with tempfile.TemporaryDirectory() as tmp:
+        report_file = Path(tmp) / "report.json"
+        returncode, out, err = utils.run_command(
+            [
+                str(python_exe),
+                "-m",
+                "pip",
+                "install",
+                "--dry-run",
+                "--ignore-installed",
+                "--quiet",
+                "--report",
+                str(report_file),
+                *pip_args,
+                *requirements,
+            ]
+        )
+        if returncode != 0:
+            raise RuntimeError(f"Dependency resolution failed: {err.strip()}")
+        report = json.loads(report_file.read_text())
+
+    for item in report.get("install", []):
+        download = item.get("download_info", {})
+        archive = download.get("archive_info", {})
+        hashes = dict(archive.get("hashes") or {})
+        if not hashes and "hash" in archive:
+            algorithm, _, digest = archive["hash"].partition("=")
+            hashes[algorithm] = digest
+        lock["packages"].append(
+            {
+                "name": item["metadata"]["name"],
+                "version": item["metadata"]["version"],
+                "url": download.get("url"),
+                "hashes": [
+                    f"{algo}:{digest}" for algo, digest in sorted(hashes.items())
+                ],
+            }
+        )
+    lock["packages"].sort(key=lambda package: normalize_name(package["name"]))
+    python_version = report.get("environment", {}).get("python_full_version")
+    if python_version:
+        lock["python"] = python_version
+    return lock
+
+
+def write_lock(lock: Dict, path: Path):
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(lock, indent=2) + "\n")
+    os.replace(tmp, path)
+
+
+def read_lock(path: Path) -> Dict:
+    with open(path) as f:
+        lock = json.load(f)
+    if lock.get("version") != LOCK_VERSION:
+        raise ValueError(f"Unsupported lockfile version in {path}")
+    return lock
+
+
+def installed_distributions(env_path: Path) -> Dict[str, str]:
+    """Return {normalized name: version} for env_path, without starting its Python."""
+    site_packages = find_site_packages(str(env_path))
+    if site_packages is None:
+        return {}
+    installed = {}
+    for dist in metadata.distributions(path=[site_packages]):
+        name = dist.metadata["Name"]
+        if name:
+            installed[normalize_name(name)] = dist.version
+    return installed
+
+
+def plan_sync(lock: Dict, installed: Dict[str, str]) -> Dict[str, List]:
+    """Work out the smallest set of changes that makes installed match lock."""
+    plan = {
+        "install": [],
+        "upgrade": [],
+        "downgrade": [],
+        "remove": [],
+        "unchanged": [],
+    }
+    locked = {normalize_name(package["name"]): package for package in lock["packages"]}
+    for name, package in locked.items():
+        current = installed.get(name)
+        if current is None:
+            plan["install"].append(package)
+            continue
+        order = compare_versions(package["version"], current)
+        if order == 0:
+            plan["unchanged"].append(name)
+        else:
+            change = dict(package, installed=current)
+            plan["upgrade" if order > 0 else "downgrade"].append(change)
+    plan["remove"] = sorted(installed.keys() - locked.keys() - TOOLING)
+    return plan
+
+
+def _requirement_lines(packages: List[Dict]) -> List[str]:
+    """Return exact pins, hash-checked when every package has hashes."""
+    # pip requires hashes on every line once any line has one
+    with_hashes = all(package["hashes"] for package in packages)
+    lines = []
+    for package in packages:
+        line = f"{package['name']}=={package['version']}"
+        if with_hashes:
+            line += "".join(f" --hash={h}" for h in package["hashes"])
+        lines.append(line)
+    return lines
+
+
+@contextmanager
+def _requirements_file(lines: List[str]) -> Iterator[Path]:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "requirements.txt"
+        path.write_text("\n".join(lines) + "\n")
+        yield path
+
+
+def sync_environment(
+    env_path: Path, lock: Dict, installer, dry_run: bool = False, offline: bool = False
+) -> Dict:
+    """Bring env_path in line with lock and return the plan that was applied.
+
+    installer is a pyspace_daemon Installer, so the configured backend (pip
+    or uv) and the local wheel cache are used. With uv this is one
+    `uv pip sync` of the whole lock, with installed tooling pinned so it is
+    kept. pip has no such command, so there everything missing or at the
+    wrong version goes through one `--no-deps` install of exact pins and
+    extras are removed with one uninstall. Offline syncs install from the
+    wheel cache only and ignore the lock's own index arguments.
+    """
+    installed = installed_distributions(env_path)
+    plan = plan_sync(lock, installed)
+    if dry_run:
+        return plan
+    changes = plan["install"] + plan["upgrade"] + plan["downgrade"]
+    options = [] if offline else list(lock.get("pip_args", []))
+    if installer.supports_sync:
+        if changes or plan["remove"]:
+            lines = _requirement_lines(lock["packages"])
+            locked = {normalize_name(package["name"]) for package in lock["packages"]}
+            lines += [
+                f"{name}=={installed[name]}"
+                for name in sorted(TOOLING & installed.keys() - locked)
+            ]
+            with _requirements_file(lines) as path:
+                synced = installer.sync(env_path, [str(path)], offline, options)
+            if not synced:
+                raise RuntimeError(f"Sync of {env_path} failed; see the log")
+    else:
+        if changes:
+            options = ["--no-deps"] + options
+            with _requirements_file(_requirement_lines(changes)) as path:
+                ok = installer.install(env_path, ["-r", str(path)], offline, options)
+            if not ok:
+                raise RuntimeError(f"Install into {env_path} failed; see the log")
+        if plan["remove"] and not installer.uninstall(env_path, plan["remove"]):
+            raise RuntimeError(f"Uninstall from {env_path} failed; see the log")
+    logger.info(
+        f"Synced {env_path}: {len(plan['install'])} installed, "
+        f"{len(plan['upgrade']) + len(plan['downgrade'])} changed, "
+        f"{len(plan['remove'])} removed"
+    )
+    return plan
@@ -0,0 +1,182 @@
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+from loguru import logger
+from env_manager.metrics import POOL_CLAIMS
+from env_manager.tracing import traced
+from env_manager.utils import run_command
+
+# Directory name of every template; it doubles as the prompt token that the
+# activation scripts carry until a claimed env is relocated.
+TEMPLATE_NAME = "pyspace-template"
+
+
+def relocate_env(env_path: Path, old_path: Path):
+    """Rewrite references to old_path inside a moved venv to point at env_path.
+
+    Covers pyvenv.cfg, the activation scripts and console-script shebangs.
+    Symlinks to the base interpreter are absolute and stay valid. Windows
+    launcher .exe files embed their target and are left untouched.
+    """
+    replacements = [
+        (os.fsencode(old_path), os.fsencode(env_path)),
+        (os.fsencode(TEMPLATE_NAME), os.fsencode(env_path.name)),
+    ]
+    files = [env_path / "pyvenv.cfg"]
+    for scripts in (env_path / "bin", env_path / "Scripts"):
+        if scripts.is_dir():
+            files.extend(scripts.iterdir())
+    for path in files:
+        if path.is_symlink() or not path.is_file() or path.suffix == ".exe":
+            continue
+        data = path.read_bytes()
+        updated = data
+        for old, new in replacements:
+            updated = updated.replace(old, new)
+        if updated != data:
+            path.write_bytes(updated)
+
+
+class VenvPool:
+    """Pre-built virtual environments that can be claimed instead of created.
+
+    Each interpreter gets a template venv (built once with `python -m venv`)
+    and a few ready clones of it. Claiming renames a ready clone into place,
+    which is atomic, so concurrent claims never hand out the same env.
+    """
+
+    def __init__(self, pool_dir: Path = None, size: int = 2):
+        self.pool_dir = pool_dir or Path.home() / ".pyspace" / "pool"
+        self.pool_dir.mkdir(parents=True, exist_ok=True)
+        self.size = size
+        self._fill_lock = threading.Lock()
+
+    def _key_dir(self, python_exe: str) -> Path:
+        # A changed interpreter binary (upgrade, rebuild) gets a fresh template
+        real = os.path.realpath(python_exe)
+        stamp = f"{real}:{os.stat(real).st_mtime_ns}"
+        return self.pool_dir / hashlib.sha256(stamp.encode()).hexdigest()[:16]
+
+    def available(self, python_exe: str) -> int:
+        """Return how many ready envs are pooled for an interpreter."""
+        ready = self._key_dir(python_exe) / "ready"
+        return len(list(ready.iterdir())) if ready.exists() else 0
+
+    @traced("pool_claim")
+    def claim(self, python_exe: str, target: Path) -> bool:
+        """Move a pooled env for python_exe to target; False if none can be used."""
+        try:
+            key_dir = self._key_dir(python_exe)
+        except OSError:
+            return False
+        template = key_dir / TEMPLATE_NAME
+        if not template.exists():
+            POOL_CLAIMS.inc(result="miss")
+            return False
+        if target.exists():
+            # Never rename over or clean up a directory we did not create
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        ready = key_dir / "ready"
+        for entry in sorted(ready.iterdir()) if ready.exists() else []:
+            try:
+                os.rename(entry, target)
+            except OSError:
+                # Claimed by someone else, or target is on another filesystem
+                continue
+            relocate_env(target, template)
+            POOL_CLAIMS.inc(result="hit")
+            logger.info(f"Claimed pooled environment for {target}")
+            return True
+        # Pool drained: copying the template still skips ensurepip
+        try:
+            shutil.copytree(template, target, symlinks=True)
+        except FileExistsError:
+            # Created by someone else since the check above; leave it alone
+            POOL_CLAIMS.inc(result="miss")
+            return False
+        except (OSError, shutil.Error) as e:
+            logger.warning(f"Could not clone template env into {target}: {e}")
+            shutil.rmtree(target, ignore_errors=True)
+            POOL_CLAIMS.inc(result="miss")
+            return False
+        relocate_env(target, template)
+        POOL_CLAIMS.inc(result="template")
+        logger.info(f"Cloned template environment into {target}")
+        return True
+
+    def fill(self, python_exe: str) -> int:
+        """Build the template and clones until the pool is full; return envs added."""
+        if not self._fill_lock.acquire(blocking=False):
+            return 0
+        try:
+            return self._fill(python_exe)
+        finally:
+            self._fill_lock.release()
+
+    def _fill(self, python_exe: str) -> int:
+        key_dir = self._key_dir(python_exe)
+        template = key_dir / TEMPLATE_NAME
+        building = key_dir / "building"
+        ready = key_dir / "ready"
+        building.mkdir(parents=True, exist_ok=True)
+        ready.mkdir(exist_ok=True)
+        if not template.exists():
+            # Build off to the side so a crash never leaves a partial template
+            staging = building / uuid.uuid4().hex / TEMPLATE_NAME
+            rc, out, err = run_command([python_exe, "-m", "venv", str(staging)])
+            if rc != 0:
+                logger.error(f"Template venv for {python_exe} failed: {err}")
+                shutil.rmtree(staging.parent, ignore_errors=True)
+                return 0
+            os.rename(staging, template)
+            relocate_env(template, staging)
+            shutil.rmtree(staging.parent, ignore_errors=True)
+            (key_dir / "python").write_text(python_exe)
+        added = 0
+        while self.available(python_exe) < self.size:
+            staging = building / uuid.uuid4().hex
+            try:
+                shutil.copytree(template, staging, symlinks=True)
+                os.rename(staging, ready / staging.name)
+            except (OSError, shutil.Error) as e:
+                logger.error(f"Failed to refill env pool for {python_exe}: {e}")
+                shutil.rmtree(staging, ignore_errors=True)
+                break
+            added += 1
+        if added:
+            logger.info(f"Added {added} pooled environments for {python_exe}")
+        return added
+
+    def refill(self) -> int:
+        """Top up every interpreter that already has a template."""
+        added = 0
+        for python_file in self.pool_dir.glob("*/python"):
+            python_exe = python_file.read_text()
+            try:
+                if self._key_dir(python_exe) == python_file.parent:
+                    added += self.fill(python_exe)
+                else:
+                    # The interpreter changed since this template was built
+                    shutil.rmtree(python_file.parent, ignore_errors=True)
+            except OSError:
+                shutil.rmtree(python_file.parent, ignore_errors=True)
+        return added
+
+    def status(self) -> Dict[str, int]:
+        """Return the number of ready envs per pooled interpreter."""
+        return {
+            python_file.read_text(): len(list((python_file.parent / "ready").iterdir()))
+            for python_file in self.pool_dir.glob("*/python")
+            if (python_file.parent / "ready").exists()
+        }
+
+    def clear(self, python_exe: Optional[str] = None):
+        """Remove pooled envs for one interpreter, or the whole pool."""
+        target = self._key_dir(python_exe) if python_exe else self.pool_dir
+        shutil.rmtree(target, ignore_errors=True)
+        self.pool_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,155 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from loguru import logger
+
+STAT_FIELDS = ("size", "packages", "last_used")
+
+
+def find_site_packages(env_path: str) -> Optional[str]:
+    windows = os.path.join(env_path, "Lib", "site-packages")
+    if os.path.isdir(windows):
+        return windows
+    try:
+        versions = sorted(os.listdir(os.path.join(env_path, "lib")))
+    except OSError:
+        return None
+    for name in versions:
+        candidate = os.path.join(env_path, "lib", name, "site-packages")
+        if name.startswith("python") and os.path.isdir(candidate):
+            return candidate
+    return None
+
+
+def _disk_usage(path: str) -> int:
+    """Return the apparent size of a directory tree without following symlinks."""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+    return total
+
+
+def _count_distributions(site_packages: Optional[str]) -> int:
+    if site_packages is None:
+        return 0
+    try:
+        return sum(
+            1
+            for name in os.listdir(site_packages)
+            if name.endswith((".dist-info", ".egg-info"))
+        )
+    except OSError:
+        return 0
+
+
+class EnvStatsCache:
+    """Disk usage and package counts per environment, cached by directory mtime.
+
+    An entry is recomputed only when the env directory or its site-packages
+    directory changes mtime, which is what installs and removals touch.
+    """
+
+    def __init__(self, cache_file: Path = None, max_workers: int = 8):
+        self.cache_file = cache_file or Path.home() / ".pyspace" / "env_stats.json"
+        self.max_workers = max_workers
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict:
+        if self._entries is None:
+            try:
+                with open(self.cache_file) as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp, self.cache_file)
+
+    @staticmethod
+    def _mtime(path: Optional[str]):
+        try:
+            return os.stat(path).st_mtime_ns if path else None
+        except OSError:
+            return None
+
+    @staticmethod
+    def _last_used(env_path: str, site_packages_mtime) -> Optional[float]:
+        # site.py reads pyvenv.cfg on every interpreter start, so its atime
+        # tracks use; site-packages mtime tracks the latest install
+        times = [site_packages_mtime / 1e9] if site_packages_mtime else []
+        try:
+            times.append(os.stat(os.path.join(env_path, "pyvenv.cfg")).st_atime)
+        except OSError:
+            pass
+        return max(times) if times else None
+
+    def get_stats(self, env_paths: List[str]) -> Dict[str, Dict]:
+        """Return {path: {size, packages, last_used}}, computing stale entries in parallel."""
+        with self._lock:
+            entries = self._load()
+            results, stale = {}, []
+            for env_path in env_paths:
+                entry = entries.get(env_path)
+                site_packages = entry and entry.get("site_packages")
+                if not site_packages or not os.path.isdir(site_packages):
+                    site_packages = find_site_packages(env_path)
+                fingerprint = [self._mtime(env_path), self._mtime(site_packages)]
+                results[env_path] = {
+                    "last_used": self._last_used(env_path, fingerprint[1])
+                }
+                if entry is None or entry["fingerprint"] != fingerprint:
+                    stale.append((env_path, site_packages, fingerprint))
+                else:
+                    results[env_path].update(entry["stats"])
+
+            if stale:
+                logger.debug(f"Computing stats for {len(stale)} environments")
+                with ThreadPoolExecutor(
+                    max_workers=min(self.max_workers, len(stale))
+                ) as executor:
+                    computed = executor.map(
+                        lambda item: {
+                            "size": _disk_usage(item[0]),
+                            "packages": _count_distributions(item[1]),
+                        },
+                        stale,
+                    )
+                    for (env_path, site_packages, fingerprint), stats in zip(
+                        stale, computed
+                    ):
+                        entries[env_path] = {
+                            "fingerprint": fingerprint,
+                            "site_packages": site_packages,
+                            "stats": stats,
+                        }
+                        results[env_path].update(stats)
+                self._save()
+            return results
+
+    def forget(self, env_path: str):
+        """Drop the cached entry of a removed environment."""
+        with self._lock:
+            if self._load().pop(env_path, None) is not None:
+                self._save()
@@ -0,0 +1,135 @@
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator
+from loguru import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads within one process are serialized
+    fcntl = None
+
+_stores: Dict[str, "JsonStore"] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path: Path) -> "JsonStore":
+    """Return the process-wide store for path, so every user shares one cache."""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = JsonStore(Path(key))
+        return store
+
+
+class JsonStore:
+    """A JSON object on disk that several processes can safely share.
+
+    Reads are answered from memory until the file's mtime, size or inode
+    changes, so an unchanged file is never parsed twice. Writes run inside
+    transaction(): it takes an advisory lock on a sidecar ``.lock`` file,
+    re-reads the latest contents, and on exit writes the result once via
+    temp file and rename. Readers never see a partial file, and concurrent
+    writers never lose each other's updates.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock_path = path.with_name(path.name + ".lock")
+        self._data: Dict = {}
+        self._stamp = None
+        self._loaded = False
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._pending: Dict = None
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _refresh(self) -> Dict:
+        stamp = self._stat()
+        if self._loaded and stamp == self._stamp:
+            return self._data
+        data = {}
+        if stamp is not None:
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+            except ValueError as e:
+                logger.warning(f"Ignoring unreadable {self.path}: {e}")
+        self._data, self._stamp, self._loaded = data, stamp, True
+        return data
+
+    def load(self) -> Dict:
+        """Return the current contents. Treat the result as read-only."""
+        with self._lock:
+            if self._pending is not None:
+                return self._pending
+            return self._refresh()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.load().get(key, default)
+
+    def set(self, key: str, value: Any):
+        with self.transaction() as data:
+            data[key] = value
+
+    def update(self, values: Dict):
+        with self.transaction() as data:
+            data.update(values)
+
+    @contextmanager
+    def transaction(self) -> Iterator[Dict]:
+        """Yield the latest contents for editing; changes are saved once at the end.
+
+        Transactions nest, and only the outermost one writes. If the block
+        raises, nothing is written.
+        """
+        with self._lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield self._pending
+                finally:
+                    self._depth -= 1
+                return
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            lock_file = open(self.lock_path, "a")
+            try:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                original = self._refresh()
+                self._pending = json.loads(json.dumps(original))
+                self._depth = 1
+                try:
+                    yield self._pending
+                    if self._pending != original:
+                        self._write(self._pending)
+                finally:
+                    self._depth = 0
+                    self._pending = None
+            finally:
+                # Closing the file releases the flock
+                lock_file.close()
+
+    def _write(self, data: Dict):
+        fd, tmp = tempfile.mkstemp(
+            dir=self.path.parent, prefix=self.path.name, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self._data, self._stamp, self._loaded = data, self._stat(), True
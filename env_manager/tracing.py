@@ -0,0 +1,193 @@
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from loguru import logger
+
+# The tracer collecting spans for the current command or request, if any
+_current: ContextVar[Optional["Tracer"]] = ContextVar("pyspace_tracer", default=None)
+
+
+class Tracer:
+    """Collects nested spans as Chrome trace events.
+
+    Open the saved file in chrome://tracing or https://ui.perfetto.dev.
+    Timestamps are wall-clock microseconds, so a CLI trace and the daemon
+    traces it includes line up on one timeline.
+    """
+
+    def __init__(self, name: str = "pyspace", path: Path = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.path = Path(path) if path else None
+        self.pid = os.getpid()
+        self._origin = time.time() * 1e6 - time.perf_counter() * 1e6
+        self._events: List[Dict] = []
+        self._threads: Dict[int, str] = {}
+        self._included: List[Path] = []
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return self._origin + time.perf_counter() * 1e6
+
+    def add(self, name: str, start: float, end: float, category: str, args: Dict):
+        """Record a completed span that ran on the calling thread."""
+        tid = threading.get_ident()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round(start, 1),
+            "dur": round(end - start, 1),
+            "pid": self.pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._events.append(event)
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+
+    def include(self, path: Path):
+        """Merge the events of another trace file (e.g. the daemon's) when saving."""
+        with self._lock:
+            self._included.append(Path(path))
+
+    def events(self) -> List[Dict]:
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+            included = list(self._included)
+        meta = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": 0,
+                "args": {"name": self.name},
+            }
+        ]
+        meta += [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": thread_name},
+            }
+            for tid, thread_name in threads.items()
+        ]
+        for path in included:
+            try:
+                events.extend(json.loads(path.read_text())["traceEvents"])
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Could not merge trace {path}: {e}")
+        return meta + events
+
+    def save(self, path: Path = None) -> Path:
+        """Write everything recorded so far; safe to call again as spans arrive."""
+        path = Path(path or self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{self.id}.tmp")
+        tmp.write_text(
+            json.dumps({"traceEvents": self.events(), "displayTimeUnit": "ms"})
+        )
+        os.replace(tmp, path)
+        return path
+
+
+def current() -> Optional[Tracer]:
+    return _current.get()
+
+
+@contextmanager
+def activate(tracer: Optional[Tracer]):
+    """Make tracer the current one for the block (None disables tracing)."""
+    token = _current.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str, category: str = "pyspace", **args):
+    """Record the block as a span when tracing is active; otherwise a no-op."""
+    tracer = _current.get()
+    if tracer is None:
+        yield
+        return
+    start = tracer.now()
+    try:
+        yield
+    finally:
+        tracer.add(name, start, tracer.now(), category, args)
+
+
+def traced(name: str = None, category: str = "pyspace"):
+    """Decorator form of span(), named after the function by default."""
+
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with span(span_name, category):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def propagate(fn: Callable) -> Callable:
+    """Bind fn to the current tracer so spans it records on a worker thread count.
+
+    Thread pools do not copy context variables, so wrap callables before
+    handing them to an executor.
+    """
+    tracer = _current.get()
+    if tracer is None:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with activate(tracer):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def profile(trace_path: Path = None, cprofile_path: Path = None, name="pyspace"):
+    """Trace the block to a Chrome trace and/or cProfile it, writing both on exit.
+
+    cProfile only sees the calling thread; the trace covers every thread
+    that work was propagated to.
+    """
+    tracer = Tracer(name, trace_path) if trace_path else None
+    profiler = cProfile.Profile() if cprofile_path else None
+    token = _current.set(tracer) if tracer else None
+    if profiler:
+        profiler.enable()
+    try:
+        with span(name, "command"):
+            yield tracer
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(str(cprofile_path))
+            logger.info(f"Wrote cProfile stats to {cprofile_path}")
+        if tracer:
+            _current.reset(token)
+            logger.info(f"Wrote trace to {tracer.save()}")
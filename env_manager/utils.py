@@ -2,12 +2,17 @@ import os
 import subprocess
 from pathlib import Path
 from typing import Optional
+from env_manager.metrics import SUBPROCESSES_IN_FLIGHT
+from env_manager.tracing import span
 
 
 def run_command(cmd: list, cwd: Optional[Path] = None) -> tuple[int, str, str]:
     """Run a command and return (returncode, stdout, stderr)."""
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
+        with SUBPROCESSES_IN_FLIGHT.track(), span(
+            "run_command", "subprocess", argv=" ".join(map(str, cmd))
+        ):
+            result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
         return result.returncode, result.stdout, result.stderr
     except FileNotFoundError:
         return 1, "", "Command not found"
@@ -1,16 +1,85 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from typing import Dict, List
+from env_manager.environment import EnvironmentManager
+from env_manager.metrics import REGISTRY
+from env_manager.pool import VenvPool
 from .workspace_manager import WorkspaceManager
 from .cache_manager import CacheManager
 from .env_manager import create_workspace_env
+from .installer import OfflineInstallError, get_installer
 from .config_manager import ConfigManager
+from .jobs import Job, JobQueue
+from .snapshot import SnapshotEngine
+from .tracing import TraceMiddleware
+from .utils import logger
 from pathlib import Path
-import subprocess
+import asyncio
+import sys
+import threading
+import time
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _schedule_pool_refill()
+    yield
+    jobs.shutdown()
+    # Flush records still queued for the log sinks
+    await logger.complete()
+
+
+app = FastAPI(lifespan=lifespan)
 
 config = ConfigManager()
+app.add_middleware(
+    TraceMiddleware,
+    trace_dir=config.get("trace_dir"),
+    trace_all=config.get("trace_requests"),
+)
 wm = WorkspaceManager(Path.home() / ".pyspace" / "metadata.db")
-cm = CacheManager(Path(config.get("default_cache_path")))
+# Pre-built envs that workspace and environment creation claim from
+pool = VenvPool(size=config.get("pool_size")) if config.get("pool_size") else None
+# Shared with the CLI, which forwards commands here when the daemon runs
+em = EnvironmentManager(pool=pool)
+cm = CacheManager(
+    Path(config.get("default_cache_path")).expanduser(),
+    index_url=config.get("index_url"),
+    find_links=config.get("find_links"),
+    build_sdists=config.get("build_sdists"),
+)
+# One batched invocation per install job, via pip or uv depending on use_uv
+installer = get_installer(cm.get_index_url(), config.get("use_uv"))
+snapshots = SnapshotEngine()
+# Long-running operations run here instead of on the request threadpool
+jobs = JobQueue(max_workers=config.get("job_workers"))
+
+
+# Workspace name -> the job creating it, so a name is only created once at a time
+_creating: Dict[str, Job] = {}
+_creating_lock = threading.Lock()
+
+
+def _workspace_root() -> Path:
+    return Path(config.get("workspace_root")).expanduser()
+
+
+def _job_response(job: Job):
+    return {"job_id": job.id, "status": job.status}
+
+
+def _refill_pool():
+    # Workspaces use the daemon's interpreter; environments the configured version
+    pythons = {sys.executable, em.find_python(config.get("python_version"))}
+    added = sum(pool.fill(python) for python in pythons if python)
+    return {"added": added + pool.refill()}
+
+
+def _schedule_pool_refill():
+    """Top the env pool back up in the background after it was drawn from."""
+    if pool and not any(job.kind == "pool_refill" for job in jobs.list("queued")):
+        jobs.submit("pool_refill", _refill_pool)
 
 
 @app.get("/")
@@ -19,17 +88,37 @@ def read_root():
 
 
 @app.get("/workspaces")
-def list_workspaces():
-    return {"workspaces": wm.list_workspaces()}
+def list_workspaces(
+    prefix: str = "", after: str = "", limit: int = Query(100, ge=1, le=1000)
+):
+    """List workspaces by name; pass the returned `next` as `after` for the next page."""
+    workspaces = wm.list_workspaces(prefix=prefix, after=after, limit=limit)
+    next_after = workspaces[-1]["name"] if len(workspaces) == limit else None
+    return {"workspaces": workspaces, "next": next_after}
 
 
-@app.post("/workspaces")
+@app.post("/workspaces", status_code=202)
 def create_workspace(name: str):
-    workspace_root = Path(config.get("workspace_root"))
-    env_path = create_workspace_env(name, workspace_root)
-    if wm.create_workspace(name, str(env_path)):
-        return {"message": f"Workspace {name} created"}
-    raise HTTPException(status_code=400, detail="Workspace already exists")
+    with _creating_lock:
+        for pending in [n for n, job in _creating.items() if job.finished]:
+            del _creating[pending]
+        if name in _creating:
+            raise HTTPException(
+                status_code=409, detail="Workspace is already being created"
+            )
+        if wm.get_workspace(name):
+            raise HTTPException(status_code=400, detail="Workspace already exists")
+        job = jobs.submit("create_workspace", _create_workspace, name)
+        _creating[name] = job
+    return _job_response(job)
+
+
+def _create_workspace(name: str):
+    env_path = create_workspace_env(name, _workspace_root(), pool)
+    _schedule_pool_refill()
+    if not wm.create_workspace(name, str(env_path)):
+        raise RuntimeError("Workspace already exists")
+    return {"message": f"Workspace {name} created"}
 
 
 @app.get("/workspaces/{name}")
@@ -40,60 +129,131 @@ def get_workspace(name: str):
     raise HTTPException(status_code=404, detail="Workspace not found")
 
 
-@app.post("/install/{workspace}")
-def install_package(workspace: str, package: str):
+def _check_offline(packages: List[str], offline: bool = None) -> bool:
+    """Resolve the per-request offline flag and reject what the cache lacks."""
+    if offline is None:
+        offline = bool(config.get("offline"))
+    if offline:
+        missing = cm.missing(packages)
+        if missing:
+            raise HTTPException(
+                status_code=409, detail=str(OfflineInstallError(missing))
+            )
+    return offline
+
+
+def _install_packages(env_path: Path, packages: List[str], offline: bool) -> bool:
+    if not offline:
+        cm.prefetch(packages, max_workers=config.get("prefetch_workers"))
+    return installer.install(env_path, packages, offline=offline)
+
+
+@app.post("/install/{workspace}", status_code=202)
+def install_package(workspace: str, package: str, offline: bool = None):
     env_path = wm.get_workspace(workspace)
     if not env_path:
         raise HTTPException(status_code=404, detail="Workspace not found")
-    cm.download_wheel(package)
-    from .env_manager import install_package
+    offline = _check_offline([package], offline)
+    job = jobs.submit(
+        "install", _install_package, workspace, Path(env_path), package, offline
+    )
+    return _job_response(job)
+
 
-    if install_package(Path(env_path), package, cm.get_cache_path()):
-        return {"message": f"Installed {package} in {workspace}"}
-    raise HTTPException(status_code=500, detail="Install failed")
+def _install_package(workspace: str, env_path: Path, package: str, offline: bool):
+    if not _install_packages(env_path, [package], offline):
+        raise RuntimeError(f"Install of {package} failed")
+    return {"message": f"Installed {package} in {workspace}"}
 
 
-@app.post("/workspaces/{name}/reset")
+@app.post("/workspaces/{name}/reset", status_code=202)
 def reset_workspace(name: str):
     env_path_str = wm.get_workspace(name)
     if not env_path_str:
         raise HTTPException(status_code=404, detail="Workspace not found")
-    env_path = Path(env_path_str)
+    return _job_response(
+        jobs.submit("reset_workspace", _reset_workspace, name, Path(env_path_str))
+    )
+
+
+def _reset_workspace(name: str, env_path: Path):
     if env_path.exists():
         import shutil
 
         shutil.rmtree(env_path)
-    workspace_root = Path(config.get("workspace_root"))
-    create_workspace_env(name, workspace_root)
+    create_workspace_env(name, _workspace_root(), pool)
+    _schedule_pool_refill()
     return {"message": f"Reset workspace {name}"}
 
 
-@app.post("/workspaces/{name}/snapshot")
+@app.post("/workspaces/snapshot", status_code=202)
+def snapshot_workspaces(name: List[str] = Query(None), prefix: str = ""):
+    """Snapshot the named workspaces, or every workspace matching prefix."""
+    if name:
+        targets = {n: wm.get_workspace(n) for n in name}
+        missing = [n for n, path in targets.items() if not path]
+        if missing:
+            raise HTTPException(
+                status_code=404, detail=f"Workspaces not found: {', '.join(missing)}"
+            )
+    else:
+        targets = {w["name"]: w["path"] for w in wm.list_workspaces(prefix=prefix)}
+    return _job_response(
+        jobs.submit(
+            "snapshot",
+            _snapshot_workspaces,
+            targets,
+            description=f"{len(targets)} workspaces",
+        )
+    )
+
+
+def _snapshot_workspaces(targets: Dict[str, str]):
+    results = snapshots.snapshot_many([Path(path) for path in targets.values()])
+    return {"results": {name: results[path] for name, path in targets.items()}}
+
+
+@app.post("/workspaces/{name}/snapshot", status_code=202)
 def snapshot_workspace(name: str):
     env_path_str = wm.get_workspace(name)
     if not env_path_str:
         raise HTTPException(status_code=404, detail="Workspace not found")
-    env_path = Path(env_path_str)
-    requirements_file = env_path / "requirements.txt"
-    # Generate requirements.txt using pip freeze
-    python_exe = (
-        env_path / "Scripts" / "python.exe"
-        if (env_path / "Scripts").exists()
-        else env_path / "bin" / "python"
+    return _job_response(
+        jobs.submit("snapshot", _snapshot_workspace, name, Path(env_path_str))
     )
-    result = subprocess.run(
-        [str(python_exe), "-m", "pip", "freeze"],
-        capture_output=True,
-        text=True,
-        cwd=env_path,
-    )
-    if result.returncode == 0:
-        requirements_file.write_text(result.stdout)
-        return {"message": f"Snapshot saved for {name}"}
-    else:
-        raise HTTPException(
-            status_code=500, detail="Failed to generate requirements.txt"
-        )
+
+
+def _snapshot_workspace(name: str, env_path: Path):
+    # Read from dist-info metadata rather than running pip freeze in the env
+    result = snapshots.snapshot(env_path)
+    return {"message": f"Snapshot saved for {name}", **result}
+
+
+@app.get("/jobs")
+def list_jobs(status: str = None):
+    return {"jobs": [job.to_dict() for job in jobs.list(status)]}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = 0):
+    """Return a job, optionally long-polling up to `wait` seconds for it to finish."""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    deadline = time.monotonic() + min(wait, 60)
+    while not job.finished and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    return job.to_dict()
+
+
+@app.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not jobs.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Job already finished")
+    return job.to_dict()
 
 
 @app.post("/cache/clean")
@@ -102,6 +262,154 @@ def clean_cache():
     return {"message": "Cache cleaned"}
 
 
+@app.post("/cache/prefetch")
+def prefetch_cache(requirements: List[str]):
+    results = cm.prefetch(requirements, max_workers=config.get("prefetch_workers"))
+    failed = [req for req, ok in results.items() if not ok]
+    return {"fetched": len(results) - len(failed), "failed": failed}
+
+
+@app.get("/environments")
+def list_environments(
+    pattern: str = None,
+    python: str = None,
+    sort: str = "name",
+    reverse: bool = False,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(None, ge=1),
+    stats: bool = False,
+):
+    """List environments with optional filters, sorting, paging and disk stats."""
+    try:
+        return em.query_environments(
+            pattern=pattern,
+            python_version=python,
+            sort=sort,
+            reverse=reverse,
+            offset=offset,
+            limit=limit,
+            stats=stats,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/environments", status_code=202)
+def create_environments(
+    name: List[str] = Query(...),
+    python: str = None,
+    workers: int = None,
+    install_python: bool = False,
+):
+    """Create one or more environments; the job result maps each name to success."""
+    job = jobs.submit(
+        "create_environment",
+        _create_environments,
+        name,
+        python,
+        workers or config.get("bulk_workers"),
+        install_python,
+        description=", ".join(name),
+    )
+    return _job_response(job)
+
+
+def _create_environments(
+    names: List[str], python: str, workers: int, install_python: bool = False
+):
+    results = em.create_environments(
+        names, python, max_workers=workers, install_python=install_python
+    )
+    _schedule_pool_refill()
+    return {"results": results}
+
+
+@app.delete("/environments", status_code=202)
+def remove_environments(
+    name: List[str] = Query(None), pattern: str = None, workers: int = None
+):
+    """Remove environments by name and/or glob pattern, e.g. `ci-*`."""
+    if not name and not pattern:
+        raise HTTPException(status_code=400, detail="Give a name or a pattern")
+    job = jobs.submit(
+        "remove_environment",
+        lambda: {
+            "results": em.remove_environments(
+                name, pattern, max_workers=workers or config.get("bulk_workers")
+            )
+        },
+        description=pattern or ", ".join(name),
+    )
+    return _job_response(job)
+
+
+@app.post("/environments/install", status_code=202)
+def install_into_environment(
+    cwd: str, package: List[str] = Query(...), offline: bool = None
+):
+    name = em.get_current_environment(Path(cwd))
+    if not name:
+        raise HTTPException(status_code=404, detail="No active environment")
+    env_path = em.base_dir / name
+    if not env_path.exists():
+        raise HTTPException(status_code=404, detail=f"Environment '{name}' not found")
+    offline = _check_offline(package, offline)
+    job = jobs.submit(
+        "install", _install_into_environment, name, env_path, package, offline
+    )
+    return _job_response(job)
+
+
+def _install_into_environment(
+    name: str, env_path: Path, packages: List[str], offline: bool
+):
+    if _install_packages(env_path, packages, offline):
+        return {"environment": name, "installed": packages, "failed": []}
+    return {"environment": name, "installed": [], "failed": packages}
+
+
+def _job_counts():
+    counts = {(status,): 0 for status in ("queued", "running")}
+    for job in jobs.list():
+        if not job.finished:
+            counts[(job.status,)] = counts.get((job.status,), 0) + 1
+    return counts
+
+
+REGISTRY.gauge(
+    "pyspace_jobs", "Background jobs waiting or running.", ["status"], _job_counts
+)
+REGISTRY.gauge(
+    "pyspace_pool_ready",
+    "Pre-built environments ready to claim, per interpreter.",
+    ["python"],
+    lambda: {(python,): n for python, n in pool.status().items()} if pool else {},
+)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Prometheus text exposition of the daemon's in-process metrics."""
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/status")
+def get_status(cwd: str = None):
+    return {
+        "current_environment": em.get_current_environment(Path(cwd) if cwd else None),
+        "daemon": {
+            "running": True,
+            "environments": em.count_environments(),
+            "workspaces": wm.count_workspaces(),
+            "cache_info": cm.get_cache_info(),
+            "jobs_queued": jobs.pending(),
+            "pool": pool.status() if pool else {},
+        },
+    }
+
+
 @app.get("/config")
 def get_config():
     return config.config
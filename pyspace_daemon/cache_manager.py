@@ -1,30 +1,476 @@
-import subprocess
+import hashlib
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import sysconfig
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from env_manager.metrics import CACHE_LOOKUPS, OPERATION_SECONDS, SQLITE_QUERY_SECONDS
+from env_manager.tracing import propagate, traced
+from .jobs import run_process
 from .utils import logger
 
+ARCHIVE_SUFFIXES = (".whl", ".tar.gz", ".zip", ".tar.bz2")
+ABI_PROBE = (
+    "import sys, sysconfig; "
+    "print(sys.implementation.cache_tag, sysconfig.get_platform())"
+)
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a project name as described in PEP 503."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def parse_artifact_filename(filename: str):
+    """Return (name, version, python_tag, abi_tag, platform_tag) for an artifact."""
+    if filename.endswith(".whl"):
+        parts = filename[: -len(".whl")].split("-")
+        if len(parts) not in (5, 6):
+            return None
+        name, version = parts[0], parts[1]
+        python_tag, abi_tag, platform_tag = parts[-3:]
+        return normalize_name(name), version, python_tag, abi_tag, platform_tag
+    for suffix in ARCHIVE_SUFFIXES[1:]:
+        if filename.endswith(suffix):
+            stem = filename[: -len(suffix)]
+            if "-" not in stem:
+                return None
+            name, version = stem.rsplit("-", 1)
+            # Source distributions are not tagged; record them under a fixed tag set
+            return normalize_name(name), version, "source", "none", "any"
+    return None
+
+
+REQUIREMENT_RE = re.compile(
+    r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(\[[^\]]*\])?\s*(.*?)\s*$"
+)
+
+
+def split_requirement(requirement: str):
+    """Split a requirement string into (normalized name, extras, specifier)."""
+    match = REQUIREMENT_RE.match(requirement.split(";")[0])
+    if not match:
+        return None
+    name, extras, specifier = match.groups()
+    return normalize_name(name), extras or "", specifier.replace(" ", "")
+
+
+def read_requirements(path: Path) -> List[str]:
+    """Read requirement lines from a requirements file, skipping options."""
+    requirements = []
+    for line in Path(path).read_text().splitlines():
+        line = line.split(" #")[0].strip()
+        if not line or line.startswith(("#", "-")):
+            continue
+        requirements.append(line)
+    return requirements
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 class CacheManager:
-    def __init__(self, cache_dir: Path):
+    """Content-addressed wheel store.
+
+    Artifacts live under ``objects/<sha256[:2]>/<sha256>/<filename>`` and are
+    indexed by (normalized name, version, python tag, abi tag, platform tag).
+    A PEP 503 ``simple/`` tree is kept next to them so installers only read
+    the pages of the projects they actually need. Wheels built from stored
+    sdists are stored the same way and recorded per (sdist digest, ABI,
+    platform), so each sdist is compiled once per interpreter.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        index_url: str = None,
+        find_links: str = None,
+        build_sdists: bool = False,
+    ):
         self.cache_dir = cache_dir
+        self.index_url = index_url
+        self.find_links = find_links
+        self.build_sdists = build_sdists
+        self._interpreter_tags: Dict[str, Tuple[str, str]] = {}
+        self._build_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._build_locks_guard = threading.Lock()
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.objects_dir = self.cache_dir / "objects"
+        self.simple_dir = self.cache_dir / "simple"
+        self.staging_dir = self.cache_dir / "tmp"
+        self.index_path = self.cache_dir / "index.db"
+        for directory in (self.objects_dir, self.simple_dir, self.staging_dir):
+            directory.mkdir(exist_ok=True)
+        self._init_db()
 
-    def download_wheel(self, package: str):
-        """Download package wheel to cache."""
-        cmd = ["pip", "download", "--dest", str(self.cache_dir), package]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            logger.info(f"Downloaded {package} to cache")
-            return True
+    def _init_db(self):
+        with sqlite3.connect(self.index_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS artifacts (
+                    name TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    python_tag TEXT NOT NULL,
+                    abi_tag TEXT NOT NULL,
+                    platform_tag TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (name, version, python_tag, abi_tag, platform_tag)
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_artifacts_digest ON artifacts (digest)"
+            )
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS built_wheels (
+                    sdist_digest TEXT NOT NULL,
+                    abi TEXT NOT NULL,
+                    platform TEXT NOT NULL,
+                    wheel_digest TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    PRIMARY KEY (sdist_digest, abi, platform)
+                )
+            """)
+
+    def _object_path(self, digest: str, filename: str) -> Path:
+        return self.objects_dir / digest[:2] / digest / filename
+
+    def store(self, path: Path) -> Optional[Path]:
+        """Move an artifact into the store and index it; return its stored path."""
+        tags = parse_artifact_filename(path.name)
+        if tags is None:
+            logger.warning(f"Skipping unrecognised artifact {path.name}")
+            return None
+        digest = file_digest(path)
+        object_dir = self.objects_dir / digest[:2] / digest
+        existing = list(object_dir.iterdir()) if object_dir.exists() else []
+        if existing:
+            stored = existing[0]
+            path.unlink()
+            logger.debug(f"Artifact {path.name} already stored as {digest}")
         else:
-            logger.error(f"Failed to download {package}: {result.stderr}")
+            object_dir.mkdir(parents=True, exist_ok=True)
+            stored = object_dir / path.name
+            os.replace(path, stored)
+        with sqlite3.connect(self.index_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO artifacts "
+                "(name, version, python_tag, abi_tag, platform_tag, digest, filename, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*tags, digest, stored.name, stored.stat().st_size),
+            )
+            conn.commit()
+        self._write_project_page(tags[0])
+        return stored
+
+    def _write_project_page(self, name: str):
+        """Regenerate the PEP 503 page for a single project."""
+        with sqlite3.connect(self.index_path) as conn:
+            rows = conn.execute(
+                "SELECT digest, filename FROM artifacts WHERE name = ? ORDER BY filename",
+                (name,),
+            ).fetchall()
+        project_dir = self.simple_dir / name
+        if not rows:
+            shutil.rmtree(project_dir, ignore_errors=True)
+            return
+        project_dir.mkdir(exist_ok=True)
+        links = "\n".join(
+            f'<a href="{self._object_path(digest, filename).as_uri()}#sha256={digest}">'
+            f"{escape(filename)}</a><br/>"
+            for digest, filename in rows
+        )
+        page = f"<!DOCTYPE html>\n<html><body>\n{links}\n</body></html>\n"
+        fd, tmp = tempfile.mkstemp(dir=project_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(page)
+        os.replace(tmp, project_dir / "index.html")
+
+    @traced("cache_lookup", "cache")
+    @SQLITE_QUERY_SECONDS.timed(database="wheel_index", query="lookup")
+    def lookup(
+        self,
+        name: str,
+        version: str = None,
+        python_tag: str = None,
+        platform_tag: str = None,
+    ) -> List[Path]:
+        """Return stored artifacts matching a name and optional version/tags."""
+        query = "SELECT digest, filename FROM artifacts WHERE name = ?"
+        params = [normalize_name(name)]
+        for column, value in (
+            ("version", version),
+            ("python_tag", python_tag),
+            ("platform_tag", platform_tag),
+        ):
+            if value is not None:
+                query += f" AND {column} = ?"
+                params.append(value)
+        with sqlite3.connect(self.index_path) as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [self._object_path(digest, filename) for digest, filename in rows]
+
+    @traced("wheel_download", "cache")
+    def download_wheel(self, package: str) -> List[Path]:
+        """Download a package and its dependencies into the store.
+
+        Returns the stored artifact paths, or an empty list on failure.
+        """
+        staging = Path(tempfile.mkdtemp(dir=self.staging_dir))
+        try:
+            cmd = ["pip", "download", "--dest", str(staging), *self._source_args()]
+            cmd.append(package)
+            with OPERATION_SECONDS.time(operation="wheel_download"):
+                result = run_process(cmd)
+            if result.returncode != 0:
+                logger.error(f"Failed to download {package}: {result.stderr}")
+                return []
+            artifacts = []
+            for file in staging.iterdir():
+                stored = self.store(file)
+                if stored:
+                    artifacts.append(stored)
+            if self.build_sdists:
+                sdists = [a for a in artifacts if not a.name.endswith(".whl")]
+                for sdist in sdists:
+                    built = self.build_wheel(sdist)
+                    if built:
+                        artifacts.append(built)
+            logger.info(f"Downloaded {package} to cache ({len(artifacts)} artifacts)")
+            return artifacts
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def interpreter_tags(self, python_exe: str) -> Tuple[str, str]:
+        """Return (ABI cache tag, platform) for an interpreter, e.g. cpython-311."""
+        tags = self._interpreter_tags.get(python_exe)
+        if tags is None:
+            if python_exe == sys.executable:
+                tags = (sys.implementation.cache_tag, sysconfig.get_platform())
+            else:
+                result = run_process([python_exe, "-c", ABI_PROBE])
+                if result.returncode != 0:
+                    raise RuntimeError(f"Cannot run {python_exe}: {result.stderr}")
+                tags = tuple(result.stdout.split())
+            self._interpreter_tags[python_exe] = tags
+        return tags
+
+    def _build_lock(self, key: Tuple[str, str, str]) -> threading.Lock:
+        with self._build_locks_guard:
+            return self._build_locks.setdefault(key, threading.Lock())
+
+    @traced("sdist_build", "cache")
+    def build_wheel(self, sdist: Path, python_exe: str = None) -> Optional[Path]:
+        """Build a stored sdist into a stored wheel, reusing an earlier build.
+
+        Builds are keyed by the sdist's digest and the interpreter's ABI and
+        platform. Returns the wheel path, or None if the build failed.
+        """
+        python_exe = python_exe or sys.executable
+        digest = sdist.parent.name
+        abi, platform = self.interpreter_tags(python_exe)
+        with self._build_lock((digest, abi, platform)):
+            with sqlite3.connect(self.index_path) as conn:
+                row = conn.execute(
+                    "SELECT wheel_digest, filename FROM built_wheels "
+                    "WHERE sdist_digest = ? AND abi = ? AND platform = ?",
+                    (digest, abi, platform),
+                ).fetchone()
+            if row and self._object_path(*row).exists():
+                return self._object_path(*row)
+
+            staging = Path(tempfile.mkdtemp(dir=self.staging_dir))
+            try:
+                cmd = [python_exe, "-m", "pip", "wheel", "--no-deps"]
+                cmd += ["--wheel-dir", str(staging), *self._source_args(), str(sdist)]
+                with OPERATION_SECONDS.time(operation="sdist_build"):
+                    result = run_process(cmd)
+                wheels = list(staging.glob("*.whl"))
+                if result.returncode != 0 or not wheels:
+                    logger.error(f"Failed to build {sdist.name}: {result.stderr}")
+                    return None
+                stored = self.store(wheels[0])
+                if stored is None:
+                    logger.error(f"Could not store {wheels[0].name} from {sdist.name}")
+                    return None
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+            with sqlite3.connect(self.index_path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO built_wheels VALUES (?, ?, ?, ?, ?)",
+                    (digest, abi, platform, stored.parent.name, stored.name),
+                )
+            logger.info(f"Built {stored.name} from {sdist.name} for {abi}")
+            return stored
+
+    def build_all(
+        self,
+        python_exe: str = None,
+        max_workers: int = 4,
+        requirements: Iterable[str] = None,
+    ) -> Dict[str, bool]:
+        """Build stored sdists for an interpreter in parallel.
+
+        With requirements, only the sdists of those projects are built
+        (just the pinned version for ``==`` pins); otherwise every stored
+        sdist is. Returns a mapping of sdist filename to whether a wheel is
+        available.
+        """
+        if requirements is None:
+            with sqlite3.connect(self.index_path) as conn:
+                rows = conn.execute(
+                    "SELECT digest, filename FROM artifacts "
+                    "WHERE python_tag = 'source'"
+                ).fetchall()
+            sdists = [self._object_path(digest, filename) for digest, filename in rows]
+        else:
+            sdists = {}
+            for requirement in requirements:
+                parts = split_requirement(requirement)
+                if parts is None:
+                    continue
+                name, _, specifier = parts
+                pinned = specifier.startswith("==") and "," not in specifier
+                version = specifier[2:] if pinned else None
+                for sdist in self.lookup(name, version, python_tag="source"):
+                    sdists.setdefault(sdist)
+            sdists = list(sdists)
+        if not sdists:
+            return {}
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(sdists)))
+        ) as pool:
+            build = propagate(lambda sdist: self.build_wheel(sdist, python_exe))
+            built = pool.map(build, sdists)
+            return {
+                sdist.name: wheel is not None for sdist, wheel in zip(sdists, built)
+            }
+
+    def _source_args(self) -> List[str]:
+        """Return pip arguments selecting where artifacts are downloaded from."""
+        args = []
+        if self.index_url:
+            args += ["--index-url", self.index_url]
+        if self.find_links:
+            if not self.index_url:
+                args.append("--no-index")
+            args += ["--find-links", self.find_links]
+        return args
+
+    def is_cached(self, requirement: str) -> bool:
+        """Check whether a requirement is already satisfied by the store.
+
+        Only bare names and ``==`` pins can be answered from the index; any
+        other specifier needs the resolver and is reported as not cached.
+        """
+        parts = split_requirement(requirement)
+        if parts is None:
             return False
+        name, _, specifier = parts
+        if not specifier:
+            return bool(self.lookup(name))
+        if specifier.startswith("==") and "," not in specifier:
+            return bool(self.lookup(name, specifier[2:]))
+        return False
+
+    def missing(self, requirements: Iterable[str]) -> List[str]:
+        """Return the requirements the store certainly cannot satisfy.
+
+        A requirement is missing when no artifact of that project is stored,
+        or when it pins an ``==`` version that is not stored. Ranges are left
+        to the installer's resolver.
+        """
+        missing = []
+        for requirement in requirements:
+            parts = split_requirement(requirement)
+            if parts is None:
+                continue
+            name, _, specifier = parts
+            if not self.lookup(name) or (
+                specifier.startswith("==")
+                and "," not in specifier
+                and not self.lookup(name, specifier[2:])
+            ):
+                missing.append(requirement.strip())
+        return missing
+
+    @traced("cache_prefetch", "cache")
+    def prefetch(
+        self, requirements: Iterable[str], max_workers: int = 8
+    ) -> Dict[str, bool]:
+        """Download missing requirements concurrently.
+
+        Requirements are deduplicated by normalized name and specifier, and
+        anything already in the store is skipped. Returns a mapping of each
+        unique requirement to whether it is now available in the cache.
+        """
+        unique = {}
+        for requirement in requirements:
+            parts = split_requirement(requirement)
+            key = parts if parts else requirement.strip()
+            unique.setdefault(key, requirement.strip())
+
+        results = {}
+        missing = []
+        for requirement in unique.values():
+            if self.is_cached(requirement):
+                CACHE_LOOKUPS.inc(result="hit")
+                results[requirement] = True
+            else:
+                CACHE_LOOKUPS.inc(result="miss")
+                missing.append(requirement)
+        logger.info(
+            f"Prefetching {len(missing)} of {len(unique)} requirements "
+            f"({len(unique) - len(missing)} already cached)"
+        )
+        if missing:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                for requirement, artifacts in zip(
+                    missing, pool.map(propagate(self.download_wheel), missing)
+                ):
+                    results[requirement] = bool(artifacts)
+        return results
 
     def clean_cache(self):
         """Remove all cached packages."""
-        for file in self.cache_dir.iterdir():
-            if file.is_file():
-                file.unlink()
+        for directory in (self.objects_dir, self.simple_dir, self.staging_dir):
+            shutil.rmtree(directory, ignore_errors=True)
+            directory.mkdir()
+        with sqlite3.connect(self.index_path) as conn:
+            conn.execute("DELETE FROM artifacts")
+            conn.execute("DELETE FROM built_wheels")
+            conn.commit()
         logger.info("Cache cleaned")
 
+    def get_cache_info(self) -> Dict:
+        """Return the number and total size of stored artifacts."""
+        with sqlite3.connect(self.index_path) as conn:
+            total_artifacts, total_size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts"
+            ).fetchone()
+        return {
+            "total_artifacts": total_artifacts,
+            "total_size": total_size,
+            "cache_dir": str(self.cache_dir),
+        }
+
     def get_cache_path(self):
         return self.cache_dir
+
+    def get_index_url(self) -> str:
+        """Return the file:// URL of the local PEP 503 index."""
+        return self.simple_dir.as_uri()
@@ -1,38 +1,55 @@
-import json
 from pathlib import Path
+from env_manager.store import get_store
 
 DEFAULT_CONFIG = {
     "python_version": "3.11",
     "default_cache_path": "~/.pyspace/cache/wheels",
     "workspace_root": "~/.pyspace/workspaces",
     "daemon_port": 5132,
+    "daemon_socket": "~/.pyspace/daemon.sock",
     "use_uv": False,
+    "offline": False,
+    "prefetch_workers": 8,
+    "index_url": None,
+    "find_links": None,
+    "build_sdists": True,
+    "job_workers": 4,
+    "pool_size": 2,
+    "bulk_workers": 4,
+    "log_file": "~/.pyspace/logs/daemon.log",
+    # Roll the log file over at this size, keeping this many old files
+    "log_rotation": "10 MB",
+    "log_retention": 3,
+    "log_level": "INFO",
+    "log_file_level": "DEBUG",
+    "log_json": False,
+    # e.g. {"pyspace_daemon.cache_manager": "WARNING"}
+    "log_module_levels": {},
+    # Keep only every Nth DEBUG record from each call site
+    "log_debug_sample": 1,
+    # Requests sent with an X-PySpace-Trace header are always traced
+    "trace_requests": False,
+    "trace_dir": "~/.pyspace/traces",
 }
 
 
 class ConfigManager:
+    """Daemon settings from ~/.pyspace/config.json, with defaults for missing keys.
+
+    Defaults are merged in memory; the file only ever holds values that were
+    set explicitly, and is not touched just by reading it.
+    """
+
     def __init__(self):
         self.config_path = Path.home() / ".pyspace" / "config.json"
-        self.config_path.parent.mkdir(parents=True, exist_ok=True)
-        if not self.config_path.exists():
-            self.config = DEFAULT_CONFIG.copy()
-            self.save()
-        else:
-            with open(self.config_path) as f:
-                self.config = json.load(f)
-            # Merge with defaults for missing keys
-            for key, value in DEFAULT_CONFIG.items():
-                if key not in self.config:
-                    self.config[key] = value
-            self.save()
-
-    def save(self):
-        with open(self.config_path, "w") as f:
-            json.dump(self.config, f, indent=4)
+        self.store = get_store(self.config_path)
+
+    @property
+    def config(self):
+        return {**DEFAULT_CONFIG, **self.store.load()}
 
     def get(self, key):
-        return self.config.get(key)
+        return self.store.get(key, DEFAULT_CONFIG.get(key))
 
     def set(self, key, value):
-        self.config[key] = value
-        self.save()
+        self.store.set(key, value)
@@ -1,16 +1,20 @@
+import sys
 import venv
-import subprocess
 from pathlib import Path
+from env_manager.metrics import OPERATION_SECONDS
+from env_manager.tracing import span
 from .utils import logger
 
 
-def create_workspace_env(name: str, workspace_root: Path):
+def create_workspace_env(name: str, workspace_root: Path, pool=None):
     """Create a workspace with venv and directories."""
     workspace_path = workspace_root / name
     workspace_path.mkdir(parents=True, exist_ok=True)
     env_path = workspace_path / ".env"
-    env_path.mkdir(exist_ok=True)
-    venv.create(str(env_path), with_pip=True)
+    with OPERATION_SECONDS.time(operation="venv_create"), span("venv_create"):
+        if not (pool and pool.claim(sys.executable, env_path)):
+            env_path.mkdir(exist_ok=True)
+            venv.create(str(env_path), with_pip=True)
     # Create subdirs
     (workspace_path / "notebooks").mkdir(exist_ok=True)
     (workspace_path / "scripts").mkdir(exist_ok=True)
@@ -24,26 +28,3 @@ def create_workspace_env(name: str, workspace_root: Path):
 def get_workspace_env_path(name: str, workspace_root: Path):
     """Get the path to the workspace's virtual environment."""
     return workspace_root / name / ".env"
-
-
-def install_package(env_path: Path, package: str, cache_path: Path):
-    """Install a package in the virtual environment using cache."""
-    python_exe = env_path / "bin" / "python"  # Unix
-    if not python_exe.exists():
-        python_exe = env_path / "Scripts" / "python.exe"  # Windows
-    cmd = [
-        str(python_exe),
-        "-m",
-        "pip",
-        "install",
-        "--find-links",
-        str(cache_path),
-        package,
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode == 0:
-        logger.info(f"Installed {package} in {env_path}")
-        return True
-    else:
-        logger.error(f"Failed to install {package}: {result.stderr}")
-        return False
@@ -0,0 +1,203 @@
+import re
+import shutil
+from pathlib import Path
+from typing import List, Sequence
+from env_manager.metrics import OPERATION_SECONDS
+from env_manager.tracing import span
+from env_manager.utils import get_python_executable
+from .jobs import run_process
+from .utils import logger
+
+# How pip and uv name a requirement they could not find in the index
+MISSING_RE = re.compile(
+    r"No matching distribution found for (\S+)|Because (\S+) was not found"
+)
+
+
+class OfflineInstallError(RuntimeError):
+    """Raised when an offline install needs artifacts the wheel store lacks."""
+
+    def __init__(self, missing: List[str]):
+        super().__init__(f"Missing from the wheel cache: {', '.join(missing)}")
+        self.missing = missing
+
+
+class Installer:
+    """Installs requirements into an environment with a single pip invocation.
+
+    The local wheel cache is always offered as an extra index, so anything
+    already prefetched is installed without touching the network. Offline
+    installs use it as the only index and ignore pip's environment and
+    user configuration, so no other index can be reached.
+    """
+
+    name = "pip"
+    # Whether sync() can replace an install plus uninstall with one command
+    supports_sync = False
+
+    def __init__(self, index_url: str):
+        self.index_url = index_url
+
+    def command(
+        self,
+        python_exe: Path,
+        requirements: List[str],
+        offline: bool = False,
+        options: Sequence[str] = (),
+    ) -> List[str]:
+        cmd = [str(python_exe), "-m", "pip", "install"]
+        if offline:
+            cmd += ["--isolated", "--disable-pip-version-check"]
+            cmd += ["--index-url", self.index_url]
+        else:
+            cmd += ["--extra-index-url", self.index_url]
+        return cmd + list(options) + requirements
+
+    def uninstall_command(self, python_exe: Path, names: List[str]) -> List[str]:
+        return [str(python_exe), "-m", "pip", "uninstall", "-y", *names]
+
+    def install(
+        self,
+        env_path: Path,
+        requirements: List[str],
+        offline: bool = False,
+        options: Sequence[str] = (),
+    ) -> bool:
+        """Install all requirements into env_path; return whether it succeeded.
+
+        options are passed to the backend before the requirements (e.g.
+        `--no-deps`). Offline failures caused by missing artifacts raise
+        OfflineInstallError.
+        """
+        if not requirements:
+            return True
+        cmd = self.command(
+            get_python_executable(env_path), list(requirements), offline, options
+        )
+        return self._apply("install", cmd, env_path, requirements, offline)
+
+    def sync_command(
+        self,
+        python_exe: Path,
+        requirements: List[str],
+        offline: bool = False,
+        options: Sequence[str] = (),
+    ) -> List[str]:
+        raise NotImplementedError(f"{self.name} has no single-command sync")
+
+    def sync(
+        self,
+        env_path: Path,
+        requirement_files: List[str],
+        offline: bool = False,
+        options: Sequence[str] = (),
+    ) -> bool:
+        """Make env_path hold exactly what requirement_files pin, removing the rest.
+
+        Only backends with supports_sync implement this; errors are handled
+        as in install.
+        """
+        cmd = self.sync_command(
+            get_python_executable(env_path), list(requirement_files), offline, options
+        )
+        return self._apply("sync", cmd, env_path, requirement_files, offline)
+
+    def _apply(
+        self,
+        operation: str,
+        cmd: List[str],
+        env_path: Path,
+        requirements: List[str],
+        offline: bool,
+    ) -> bool:
+        with OPERATION_SECONDS.time(operation=operation), span(
+            operation, "installer", backend=self.name, count=len(requirements)
+        ):
+            result = run_process(cmd)
+        if result.returncode == 0:
+            logger.info(
+                f"Installed {len(requirements)} requirements in {env_path} "
+                f"with {self.name}"
+            )
+            return True
+        logger.error(f"Failed to {operation} {requirements}: {result.stderr}")
+        if offline:
+            missing = [a or b for a, b in MISSING_RE.findall(result.stderr)]
+            if missing:
+                raise OfflineInstallError(missing)
+        return False
+
+    def uninstall(self, env_path: Path, names: List[str]) -> bool:
+        """Uninstall the named distributions from env_path."""
+        if not names:
+            return True
+        cmd = self.uninstall_command(get_python_executable(env_path), list(names))
+        with span("uninstall", "installer", backend=self.name, count=len(names)):
+            result = run_process(cmd)
+        if result.returncode == 0:
+            return True
+        logger.error(f"Failed to uninstall {names}: {result.stderr}")
+        return False
+
+
+class UvInstaller(Installer):
+    """Installer backed by `uv pip install`, which targets the env's interpreter.
+
+    `uv pip sync` also removes what the requirements leave out, so lock syncs
+    take a single invocation.
+    """
+
+    name = "uv"
+    supports_sync = True
+
+    def __init__(self, index_url: str, uv_path: str):
+        super().__init__(index_url)
+        self.uv_path = uv_path
+
+    def command(
+        self,
+        python_exe: Path,
+        requirements: List[str],
+        offline: bool = False,
+        options: Sequence[str] = (),
+    ) -> List[str]:
+        return self._command("install", python_exe, requirements, offline, options)
+
+    def sync_command(
+        self,
+        python_exe: Path,
+        requirements: List[str],
+        offline: bool = False,
+        options: Sequence[str] = (),
+    ) -> List[str]:
+        # An empty lock is a valid target: it clears the environment
+        options = ["--allow-empty-requirements", *options]
+        return self._command("sync", python_exe, requirements, offline, options)
+
+    def _command(
+        self,
+        subcommand: str,
+        python_exe: Path,
+        requirements: List[str],
+        offline: bool,
+        options: Sequence[str],
+    ) -> List[str]:
+        cmd = [self.uv_path, "pip", subcommand, "--python", str(python_exe)]
+        if offline:
+            cmd += ["--offline", "--no-config", "--index-url", self.index_url]
+        else:
+            cmd += ["--extra-index-url", self.index_url]
+        return cmd + list(options) + requirements
+
+    def uninstall_command(self, python_exe: Path, names: List[str]) -> List[str]:
+        return [self.uv_path, "pip", "uninstall", "--python", str(python_exe), *names]
+
+
+def get_installer(index_url: str, use_uv: bool = False) -> Installer:
+    """Return the uv installer when enabled and available, otherwise pip."""
+    if use_uv:
+        uv_path = shutil.which("uv")
+        if uv_path:
+            return UvInstaller(index_url, uv_path)
+        logger.warning("use_uv is enabled but uv is not on PATH; using pip")
+    return Installer(index_url)
@@ -0,0 +1,207 @@
+import subprocess
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from env_manager.metrics import REGISTRY, SUBPROCESSES_IN_FLIGHT
+from env_manager import tracing
+from .utils import logger
+
+JOB_SECONDS = REGISTRY.histogram(
+    "pyspace_job_duration_seconds", "Run time of background jobs.", ["kind"]
+)
+JOBS_FINISHED = REGISTRY.counter(
+    "pyspace_jobs_finished_total",
+    "Background jobs by final status.",
+    ["kind", "status"],
+)
+
+_local = threading.local()
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once it has been cancelled."""
+
+
+class Job:
+    def __init__(self, kind: str, description: str = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.description = description
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = False
+        # Spans recorded by the job join the trace of the request that queued it
+        self.tracer = tracing.current()
+        self.done = threading.Event()
+        self._future = None
+        self._processes = set()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed", "cancelled")
+
+    def attach_process(self, proc: subprocess.Popen):
+        with self._lock:
+            self._processes.add(proc)
+
+    def detach_process(self, proc: subprocess.Popen):
+        with self._lock:
+            self._processes.discard(proc)
+
+    def terminate_processes(self):
+        with self._lock:
+            for proc in self._processes:
+                if proc.poll() is None:
+                    proc.terminate()
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "description": self.description,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+def current_job() -> Optional[Job]:
+    """Return the job running on this thread, if any."""
+    return getattr(_local, "job", None)
+
+
+def run_process(cmd: List[str], cwd=None) -> subprocess.CompletedProcess:
+    """Run a command like subprocess.run(capture_output=True, text=True).
+
+    When called from a job, the process is registered with it so that
+    cancelling the job terminates the process.
+    """
+    job = current_job()
+    if job and job.cancel_requested:
+        raise JobCancelled(job.id)
+    with SUBPROCESSES_IN_FLIGHT.track(), tracing.span(
+        "run_process", "subprocess", argv=" ".join(map(str, cmd))
+    ):
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, cwd=cwd
+        )
+        if job:
+            job.attach_process(proc)
+        try:
+            stdout, stderr = proc.communicate()
+        finally:
+            if job:
+                job.detach_process(proc)
+    if job and job.cancel_requested:
+        raise JobCancelled(job.id)
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+class JobQueue:
+    """Runs long operations on a bounded worker pool and tracks their state."""
+
+    def __init__(self, max_workers: int = 4, max_finished: int = 1000):
+        self.max_workers = max_workers
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="pyspace-job"
+        )
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(
+        self, kind: str, fn: Callable, *args, description: str = None, **kwargs
+    ) -> Job:
+        """Queue fn(*args, **kwargs) and return its Job immediately."""
+        job = Job(kind, description)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._forget_finished()
+        job._future = self._executor.submit(self._run, job, fn, args, kwargs)
+        logger.info(f"Queued {kind} job {job.id}")
+        return job
+
+    def _finish_cancelled(self, job: Job):
+        """Record a job cancelled before it started running."""
+        job.status = "cancelled"
+        job.finished_at = time.time()
+        JOBS_FINISHED.inc(kind=job.kind, status=job.status)
+        job.done.set()
+        logger.info(f"{job.kind} job {job.id} cancelled before it started")
+
+    def _run(self, job: Job, fn: Callable, args, kwargs):
+        if job.cancel_requested:
+            # Cancelled after a worker took the job but before it started
+            self._finish_cancelled(job)
+            return
+        job.status = "running"
+        job.started_at = time.time()
+        _local.job = job
+        try:
+            with tracing.activate(job.tracer), tracing.span(
+                f"job:{job.kind}", "job", job_id=job.id
+            ):
+                job.result = fn(*args, **kwargs)
+            job.status = "cancelled" if job.cancel_requested else "succeeded"
+        except JobCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            job.status = "cancelled" if job.cancel_requested else "failed"
+            job.error = str(e)
+            logger.error(f"{job.kind} job {job.id} failed: {e}")
+        finally:
+            _local.job = None
+            job.finished_at = time.time()
+            JOB_SECONDS.observe(job.finished_at - job.started_at, kind=job.kind)
+            JOBS_FINISHED.inc(kind=job.kind, status=job.status)
+            if job.tracer and job.tracer.path:
+                # Saved before done is set so waiting clients see the full trace
+                job.tracer.save()
+            job.done.set()
+        logger.info(f"{job.kind} job {job.id} {job.status}")
+
+    def _forget_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self, status: str = None) -> List[Job]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job for job in jobs if status is None or job.status == status]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job, or terminate the processes of a running one."""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel_requested = True
+        if job._future is not None and job._future.cancel():
+            self._finish_cancelled(job)
+        else:
+            job.terminate_processes()
+        logger.info(f"Cancellation requested for job {job_id}")
+        return True
+
+    def pending(self) -> int:
+        """Return the number of jobs waiting for a worker."""
+        return sum(1 for job in self.list("queued"))
+
+    def shutdown(self):
+        for job in self.list():
+            self.cancel(job.id)
+        self._executor.shutdown(wait=False)
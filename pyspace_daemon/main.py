@@ -1,28 +1,52 @@
-from fastapi import FastAPI
+import argparse
+import socket
+from pathlib import Path
 import uvicorn
-
-app = FastAPI(
-    title="PySpace Daemon",
-    description="Background service for PySpace environment management",
-)
-
-
-@app.get("/")
-def read_root():
-    return {"message": "PySpace Daemon is running"}
-
-
-@app.get("/workspaces")
-def list_workspaces():
-    # TODO: implement
-    return {"workspaces": []}
-
-
-@app.post("/workspaces")
-def create_workspace(name: str):
-    # TODO: implement
-    return {"message": f"Workspace {name} created"}
+from .config_manager import ConfigManager
+from .utils import configure_logging, logger
+
+
+def _socket_in_use(path: Path) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def main(argv=None):
+    """Serve the daemon API on a Unix socket (default) or a TCP port."""
+    config = ConfigManager()
+    configure_logging(config)
+    parser = argparse.ArgumentParser(description="PySpace daemon")
+    parser.add_argument("--socket", default=config.get("daemon_socket"))
+    parser.add_argument(
+        "--port", type=int, help="Listen on 127.0.0.1:PORT instead of the socket"
+    )
+    args = parser.parse_args(argv)
+
+    if args.port or not hasattr(socket, "AF_UNIX"):
+        port = args.port or config.get("daemon_port")
+        logger.info(f"Starting PySpace daemon on 127.0.0.1:{port}")
+        uvicorn.run("pyspace_daemon.api:app", host="127.0.0.1", port=port)
+        return
+
+    socket_path = Path(args.socket).expanduser()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        if _socket_in_use(socket_path):
+            raise SystemExit(f"A PySpace daemon is already listening on {socket_path}")
+        # Left behind by a daemon that did not shut down cleanly
+        socket_path.unlink()
+    logger.info(f"Starting PySpace daemon on {socket_path}")
+    try:
+        uvicorn.run("pyspace_daemon.api:app", uds=str(socket_path))
+    finally:
+        socket_path.unlink(missing_ok=True)
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    main()
@@ -0,0 +1,148 @@
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.parser import HeaderParser
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from env_manager.metrics import OPERATION_SECONDS
+from env_manager.stats import find_site_packages
+from env_manager.tracing import propagate, traced
+from .cache_manager import normalize_name
+from .utils import logger
+
+# Same defaults as `pip freeze` without --all
+FREEZE_EXCLUDES = {"pip", "setuptools", "wheel", "distribute"}
+REQUIREMENT_NAME_RE = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+def _snapshot_key(name: str, line: str) -> str:
+    # Editable lines carry no name, so they are compared by the line itself
+    return line if line.startswith("-e ") else normalize_name(name)
+
+
+def parse_snapshot(text: str) -> Dict[str, str]:
+    """Map normalized project names to their lines in a requirements/freeze file."""
+    packages = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("-e "):
+            packages[line] = line
+            continue
+        match = REQUIREMENT_NAME_RE.match(line)
+        if match and not line.startswith("#"):
+            packages[_snapshot_key(match.group(1), line)] = line
+    return packages
+
+
+def diff_snapshots(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, List]:
+    """Return what was added, removed or changed between two parsed snapshots."""
+    return {
+        "added": [new[name] for name in sorted(new.keys() - old.keys())],
+        "removed": [old[name] for name in sorted(old.keys() - new.keys())],
+        "changed": [
+            {"name": name, "from": old[name], "to": new[name]}
+            for name in sorted(old.keys() & new.keys())
+            if old[name] != new[name]
+        ],
+    }
+
+
+class SnapshotEngine:
+    """Builds `pip freeze`-equivalent snapshots from dist-info metadata.
+
+    Nothing is executed inside the environment: each *.dist-info (or
+    *.egg-info) directory is read once and cached by its mtime, so repeat
+    snapshots of an unchanged env only cost a directory listing.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max_workers
+        self._dists: Dict[str, Tuple[int, Optional[Tuple[str, str]]]] = {}
+        self._lock = threading.Lock()
+
+    def _read_dist(self, path: str) -> Optional[Tuple[str, str]]:
+        """Return (snapshot key, freeze line) for one installed distribution."""
+        metadata_file = os.path.join(
+            path, "METADATA" if path.endswith(".dist-info") else "PKG-INFO"
+        )
+        try:
+            with open(metadata_file, encoding="utf-8", errors="replace") as f:
+                headers = HeaderParser().parse(f, headersonly=True)
+        except OSError:
+            return None
+        name, version = headers.get("Name"), headers.get("Version")
+        if not name or not version:
+            return None
+        line = f"{name}=={version}"
+        try:
+            with open(os.path.join(path, "direct_url.json")) as f:
+                direct_url = json.load(f)
+            if direct_url.get("dir_info", {}).get("editable"):
+                line = f"-e {direct_url['url']}"
+            elif "url" in direct_url:
+                line = f"{name} @ {direct_url['url']}"
+        except (OSError, ValueError):
+            pass
+        if normalize_name(name) in FREEZE_EXCLUDES:
+            return None
+        return _snapshot_key(name, line), line
+
+    def distributions(self, env_path: Path) -> Dict[str, str]:
+        """Return {snapshot key: freeze line} for everything installed in env_path."""
+        site_packages = find_site_packages(str(env_path))
+        if site_packages is None:
+            return {}
+        packages = {}
+        with os.scandir(site_packages) as entries:
+            for entry in entries:
+                if not entry.name.endswith((".dist-info", ".egg-info")):
+                    continue
+                if not entry.is_dir():
+                    continue
+                mtime = entry.stat().st_mtime_ns
+                cached = self._dists.get(entry.path)
+                if cached is None or cached[0] != mtime:
+                    cached = (mtime, self._read_dist(entry.path))
+                    with self._lock:
+                        self._dists[entry.path] = cached
+                if cached[1]:
+                    packages[cached[1][0]] = cached[1][1]
+        return packages
+
+    @traced("snapshot")
+    @OPERATION_SECONDS.timed(operation="snapshot")
+    def snapshot(self, env_path: Path) -> Dict:
+        """Write env_path/requirements.txt and return the package count and diff."""
+        requirements_file = env_path / "requirements.txt"
+        try:
+            previous = parse_snapshot(requirements_file.read_text())
+        except OSError:
+            previous = {}
+        current = self.distributions(env_path)
+        lines = sorted(current.values(), key=str.lower)
+        text = "".join(f"{line}\n" for line in lines)
+        tmp = requirements_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(text)
+        os.replace(tmp, requirements_file)
+        return {"packages": len(current), "diff": diff_snapshots(previous, current)}
+
+    def snapshot_many(self, env_paths: List[Path]) -> Dict[str, Dict]:
+        """Snapshot several environments in parallel, keyed by path."""
+        if not env_paths:
+            return {}
+
+        def run(env_path):
+            try:
+                return self.snapshot(env_path)
+            except Exception as e:
+                logger.error(f"Snapshot of {env_path} failed: {e}")
+                return {"error": str(e)}
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(env_paths))
+        ) as executor:
+            return dict(
+                zip(map(str, env_paths), executor.map(propagate(run), env_paths))
+            )
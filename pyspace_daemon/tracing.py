@@ -0,0 +1,79 @@
+import time
+from pathlib import Path
+from env_manager.tracing import Tracer, activate
+from .utils import logger
+
+TRACE_HEADER = "X-PySpace-Trace"
+
+
+class TraceMiddleware:
+    """ASGI middleware that records a Chrome trace per request.
+
+    Requests carrying the X-PySpace-Trace header are traced, or every
+    request when trace_all is set. The trace is saved under trace_dir and
+    its path is returned in the same response header; jobs queued by the
+    request add their spans and save the file again when they finish.
+    """
+
+    def __init__(self, app, trace_dir: Path, trace_all: bool = False, keep: int = 200):
+        self.app = app
+        self.trace_dir = Path(trace_dir).expanduser()
+        self.trace_all = trace_all
+        self.keep = keep
+        self._header = TRACE_HEADER.lower().encode()
+
+    def _wants_trace(self, scope) -> bool:
+        return self.trace_all or any(
+            name == self._header for name, _ in scope.get("headers", [])
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wants_trace(scope):
+            await self.app(scope, receive, send)
+            return
+        tracer = Tracer("pyspace daemon")
+        tracer.path = (
+            self.trace_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{tracer.id}.json"
+        )
+
+        name = f"{scope['method']} {scope['path']}"
+        args = {"query": scope.get("query_string", b"").decode()}
+        start = tracer.now()
+        saved = False
+
+        def finish():
+            nonlocal saved
+            if not saved:
+                saved = True
+                tracer.add(name, start, tracer.now(), "request", args)
+                tracer.save()
+                self._prune()
+
+        async def send_with_header(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((self._header, str(tracer.path).encode()))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body" and not message.get(
+                "more_body"
+            ):
+                # Written before the last chunk so the client can read it at once
+                finish()
+            await send(message)
+
+        with activate(tracer):
+            try:
+                await self.app(scope, receive, send_with_header)
+            finally:
+                finish()
+
+    def _prune(self):
+        """Keep only the newest traces."""
+        try:
+            traces = sorted(
+                self.trace_dir.glob("*.json"), key=lambda p: p.stat().st_mtime_ns
+            )
+            for old in traces[: max(0, len(traces) - self.keep)]:
+                old.unlink()
+        except OSError as e:
+            logger.warning(f"Could not prune traces in {self.trace_dir}: {e}")
@@ -1,14 +1,225 @@
-from loguru import logger
+import asyncio
+import itertools
+import os
+import queue
+import re
 import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Union
+from loguru import logger
+
+CONSOLE_FORMAT = "<green>{time}</green> <level>{message}</level>"
+FILE_FORMAT = "{time} {level} {name}:{line} {message}"
+_STOP = object()
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+
+
+def parse_size(size: Union[int, str]) -> int:
+    """Return a byte count for sizes like 1048576, "500 KB" or "10 MB"."""
+    if isinstance(size, int):
+        return size
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B)\s*", size.upper())
+    if not match:
+        raise ValueError(f"Invalid size: {size!r}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+class LogFilter:
+    """Per-sink record filter with per-module levels and debug sampling.
+
+    module_levels maps a module or package name to the minimum level logged
+    for it, overriding the sink level. With debug_sample=N only every Nth
+    DEBUG (or TRACE) record from each call site is kept.
+    """
+
+    def __init__(
+        self, level: str, module_levels: Dict[str, str] = None, debug_sample: int = 1
+    ):
+        self.level_no = logger.level(level).no
+        self.module_levels = sorted(
+            (
+                (name, logger.level(lvl).no)
+                for name, lvl in (module_levels or {}).items()
+            ),
+            key=lambda item: -len(item[0]),
+        )
+        self.debug_sample = max(1, int(debug_sample or 1))
+        self.debug_no = logger.level("DEBUG").no
+        self._thresholds: Dict[str, int] = {}
+        self._counters = defaultdict(itertools.count)
+
+    @property
+    def min_level(self) -> int:
+        """Lowest level any module may log at; the sink's own level."""
+        return min([self.level_no] + [no for _, no in self.module_levels])
+
+    def _threshold(self, name: str) -> int:
+        threshold = self._thresholds.get(name)
+        if threshold is None:
+            threshold = self.level_no
+            for prefix, level_no in self.module_levels:
+                if name == prefix or name.startswith(prefix + "."):
+                    threshold = level_no
+                    break
+            self._thresholds[name] = threshold
+        return threshold
+
+    def __call__(self, record) -> bool:
+        name = record["name"] or ""
+        level_no = record["level"].no
+        if level_no < self._threshold(name):
+            return False
+        if self.debug_sample > 1 and level_no <= self.debug_no:
+            site = next(self._counters[(name, record["line"])])
+            return site % self.debug_sample == 0
+        return True
+
+
+class RotatingFile:
+    """Append-only log file that rolls over to path.1, path.2, ... by size."""
+
+    def __init__(self, path: Path, max_bytes: int = 10 * 1024 * 1024, backups: int = 3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file = open(path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def write(self, text: str):
+        if self._size and self._size + len(text) > self.max_bytes:
+            self._rotate()
+        self._file.write(text)
+        self._size += len(text)
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{i}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = 0
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class QueuedSink:
+    """Loguru sink that hands formatted records to a writer thread.
+
+    Callers only format and enqueue; the thread writes records in batches
+    and flushes once per batch, so slow stdout or disk never blocks a
+    request. It deliberately has no flush() method, which loguru would call
+    after every record.
+    """
+
+    def __init__(self, stream, close_stream: bool = False, interval: float = 0.05):
+        self._stream = stream
+        self._close_stream = close_stream
+        self._interval = interval
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, message: str):
+        self._queue.put(message)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            time.sleep(self._interval)
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            text = "".join(item for item in batch if isinstance(item, str))
+            if text:
+                try:
+                    self._stream.write(text)
+                    self._stream.flush()
+                except Exception as e:
+                    sys.stderr.write(f"Log sink write failed: {e}\n")
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            stopping = _STOP in batch
+        if self._close_stream:
+            self._stream.close()
+
+    def drain(self, timeout: float = 5):
+        """Block until everything queued so far has been written."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    async def complete(self):
+        # Awaited by `await logger.complete()`
+        await asyncio.get_running_loop().run_in_executor(None, self.drain)
+
+    def stop(self):
+        # Called by loguru when the handler is removed
+        self._queue.put(_STOP)
+        self._thread.join(5)
+
+
+def configure_logging(config) -> List[int]:
+    """Replace all loguru sinks with the daemon's queued console and file sinks.
+
+    Returns the handler ids.
+    """
+    module_levels = config.get("log_module_levels") or {}
+    debug_sample = config.get("log_debug_sample") or 1
+    serialize = bool(config.get("log_json"))
+    logger.remove()
+    console_filter = LogFilter(config.get("log_level"), module_levels, debug_sample)
+    handlers = [
+        logger.add(
+            QueuedSink(sys.stdout),
+            # Keep loguru's early exit for records no module may log
+            level=console_filter.min_level,
+            format=CONSOLE_FORMAT,
+            filter=console_filter,
+            colorize=not serialize and sys.stdout.isatty(),
+            serialize=serialize,
+        )
+    ]
+    log_file = config.get("log_file")
+    if log_file:
+        log_path = Path(log_file).expanduser()
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        file_filter = LogFilter(
+            config.get("log_file_level"), module_levels, debug_sample
+        )
+        handlers.append(
+            logger.add(
+                QueuedSink(
+                    RotatingFile(
+                        log_path,
+                        parse_size(config.get("log_rotation")),
+                        config.get("log_retention"),
+                    ),
+                    close_stream=True,
+                ),
+                level=file_filter.min_level,
+                format=FILE_FORMAT,
+                filter=file_filter,
+                colorize=False,
+                serialize=serialize,
+            )
+        )
+    return handlers
 
-# Configure logging
-logger.remove()
-logger.add(
-    sys.stdout, level="INFO", format="<green>{time}</green> <level>{message}</level>"
-)
-logger.add(
-    "pyspace.log", rotation="10 MB", level="DEBUG", format="{time} {level} {message}"
-)
 
 # Export logger for use in other modules
-__all__ = ["logger"]
+__all__ = ["logger", "configure_logging", "LogFilter", "QueuedSink"]
@@ -1,16 +1,77 @@
 import sqlite3
+import threading
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from env_manager.metrics import SQLITE_QUERY_SECONDS
+from env_manager.tracing import traced
 from .utils import logger
 
+# Statements are kept as constants so sqlite3's per-connection statement
+# cache reuses the prepared form instead of re-parsing them on every call.
+INSERT_WORKSPACE = "INSERT OR IGNORE INTO workspaces (name, path) VALUES (?, ?)"
+SELECT_PATH = "SELECT path FROM workspaces WHERE name = ?"
+DELETE_WORKSPACE = "DELETE FROM workspaces WHERE name = ?"
+COUNT_WORKSPACES = "SELECT COUNT(*) FROM workspaces"
+# Range conditions on name instead of LIKE so the UNIQUE index serves the
+# prefix filter, and keyset pagination (name > after) instead of OFFSET.
+SELECT_PAGE = """
+    SELECT name, path, created_at FROM workspaces
+    WHERE name > ? AND name >= ? ORDER BY name LIMIT ?
+"""
+SELECT_PREFIX_PAGE = """
+    SELECT name, path, created_at FROM workspaces
+    WHERE name > ? AND name >= ? AND name < ? ORDER BY name LIMIT ?
+"""
+
+
+def _timed(query: str):
+    def decorator(fn):
+        timed = SQLITE_QUERY_SECONDS.timed(database="workspaces", query=query)(fn)
+        return traced(f"sqlite:{query}", "sqlite")(timed)
+
+    return decorator
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Return the smallest string greater than every string starting with prefix."""
+    while prefix:
+        last = ord(prefix[-1])
+        if last < 0x10FFFF:
+            return prefix[:-1] + chr(last + 1)
+        prefix = prefix[:-1]
+    return None
+
 
 class WorkspaceManager:
     def __init__(self, db_path: Path):
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
         self._init_db()
 
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's long-lived connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Only this thread uses it; check_same_thread=False lets close() run anywhere
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=30,
+                cached_statements=256,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
     def _init_db(self):
-        with sqlite3.connect(self.db_path) as conn:
+        conn = self._conn()
+        with conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS workspaces (
                     id INTEGER PRIMARY KEY,
@@ -19,37 +80,73 @@ class WorkspaceManager:
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
-            logger.info("Initialized workspace database")
+        logger.info("Initialized workspace database")
+
+    def close(self):
+        """Close every pooled connection."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
 
     def create_workspace(self, name: str, path: str):
-        with sqlite3.connect(self.db_path) as conn:
-            try:
-                conn.execute(
-                    "INSERT INTO workspaces (name, path) VALUES (?, ?)", (name, path)
-                )
-                conn.commit()
-                logger.info(f"Created workspace '{name}' at {path}")
-                return True
-            except sqlite3.IntegrityError:
-                logger.error(f"Workspace '{name}' already exists")
-                return False
-
-    def list_workspaces(self):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT name, path, created_at FROM workspaces")
-            return [
-                {"name": row[0], "path": row[1], "created_at": row[2]}
-                for row in cursor.fetchall()
-            ]
+        if self.create_workspaces([(name, path)]):
+            logger.info(f"Created workspace '{name}' at {path}")
+            return True
+        logger.error(f"Workspace '{name}' already exists")
+        return False
+
+    @_timed("create_workspaces")
+    def create_workspaces(self, workspaces: Iterable[Tuple[str, str]]) -> List[str]:
+        """Insert (name, path) pairs in one transaction and return the names created."""
+        created = []
+        conn = self._conn()
+        with conn:
+            for name, path in workspaces:
+                if conn.execute(INSERT_WORKSPACE, (name, path)).rowcount:
+                    created.append(name)
+        return created
+
+    @_timed("list_workspaces")
+    def list_workspaces(
+        self, prefix: str = "", after: str = "", limit: int = None
+    ) -> List[Dict]:
+        """Return workspaces ordered by name, optionally one page at a time.
 
+        `after` is the last name of the previous page; `prefix` restricts the
+        listing to names starting with it.
+        """
+        limit = -1 if limit is None else limit
+        upper = _prefix_upper_bound(prefix)
+        if upper is None:
+            cursor = self._conn().execute(SELECT_PAGE, (after, prefix, limit))
+        else:
+            cursor = self._conn().execute(
+                SELECT_PREFIX_PAGE, (after, prefix, upper, limit)
+            )
+        return [
+            {"name": row[0], "path": row[1], "created_at": row[2]}
+            for row in cursor.fetchall()
+        ]
+
+    @_timed("count_workspaces")
+    def count_workspaces(self) -> int:
+        return self._conn().execute(COUNT_WORKSPACES).fetchone()[0]
+
+    @_timed("get_workspace")
     def get_workspace(self, name: str):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT path FROM workspaces WHERE name = ?", (name,))
-            row = cursor.fetchone()
-            return row[0] if row else None
+        row = self._conn().execute(SELECT_PATH, (name,)).fetchone()
+        return row[0] if row else None
 
     def delete_workspace(self, name: str):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM workspaces WHERE name = ?", (name,))
-            conn.commit()
-            logger.info(f"Deleted workspace '{name}'")
+        self.delete_workspaces([name])
+        logger.info(f"Deleted workspace '{name}'")
+
+    @_timed("delete_workspaces")
+    def delete_workspaces(self, names: Iterable[str]) -> int:
+        """Delete workspaces in one transaction and return how many existed."""
+        conn = self._conn()
+        with conn:
+            cursor = conn.executemany(DELETE_WORKSPACE, ((name,) for name in names))
+        return cursor.rowcount
@@ -1,4 +1,6 @@
 import os
+import zipfile
+from pathlib import Path
 import pytest
 
 
@@ -18,3 +20,26 @@ def pytest_collection_modifyitems(config, items):
     for item in items:
         if "integration" in item.keywords:
             item.add_marker(skip_marker)
+
+
+def write_wheel(directory: Path, name: str, version: str, requires=()) -> Path:
+    """Write a minimal installable pure-Python wheel into directory."""
+    dist_info = f"{name}-{version}.dist-info"
+    path = directory / f"{name}-{version}-py3-none-any.whl"
+    metadata = f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+    metadata += "".join(f"Requires-Dist: {req}\n" for req in requires)
+    with zipfile.ZipFile(path, "w") as whl:
+        whl.writestr(f"{name}/__init__.py", "")
+        whl.writestr(f"{dist_info}/METADATA", metadata)
+        whl.writestr(
+            f"{dist_info}/WHEEL",
+            "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+        )
+        whl.writestr(f"{dist_info}/RECORD", "")
+    return path
+
+
+@pytest.fixture
+def build_wheel():
+    """Factory for minimal wheels: build_wheel(directory, name, version, requires=())."""
+    return write_wheel
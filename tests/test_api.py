@@ -0,0 +1,48 @@
+import json
+import threading
+import pytest
+from fastapi import HTTPException
+
+
+@pytest.fixture
+def api(tmp_path_factory, monkeypatch):
+    """The daemon API module, with its job queue and workspaces in a scratch HOME."""
+    home = tmp_path_factory.mktemp("home")
+    (home / ".pyspace").mkdir()
+    (home / ".pyspace" / "config.json").write_text(json.dumps({"pool_size": 0}))
+    monkeypatch.setenv("HOME", str(home))
+    from pyspace_daemon import api as api_module
+    from pyspace_daemon.jobs import JobQueue
+    from pyspace_daemon.workspace_manager import WorkspaceManager
+
+    jobs = JobQueue(max_workers=2)
+    monkeypatch.setattr(api_module, "jobs", jobs)
+    monkeypatch.setattr(api_module, "wm", WorkspaceManager(home / "metadata.db"))
+    monkeypatch.setattr(api_module, "_creating", {})
+    yield api_module
+    jobs.shutdown()
+
+
+def test_concurrent_workspace_creation_is_rejected(api, monkeypatch):
+    """Test that a name being created cannot be queued a second time."""
+    release = threading.Event()
+    created = []
+
+    def fake_create(name):
+        release.wait(5)
+        created.append(name)
+        api.wm.create_workspace(name, f"/tmp/{name}")
+
+    monkeypatch.setattr(api, "_create_workspace", fake_create)
+    job_id = api.create_workspace("demo")["job_id"]
+    with pytest.raises(HTTPException) as exc_info:
+        api.create_workspace("demo")
+    assert exc_info.value.status_code == 409
+    assert api.create_workspace("other")["job_id"] != job_id
+
+    release.set()
+    assert api.jobs.get(job_id).done.wait(5)
+    with pytest.raises(HTTPException) as exc_info:
+        api.create_workspace("demo")
+    assert exc_info.value.status_code == 400
+    assert created.count("demo") == 1
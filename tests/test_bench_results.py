@@ -0,0 +1,34 @@
+from benchmarks.results import compare, load_results, save_results, summarize
+
+
+def test_summarize():
+    """Test the summary statistics recorded for a benchmark."""
+    summary = summarize([0.3, 0.1, 0.2])
+    assert summary["rounds"] == 3
+    assert summary["min"] == 0.1
+    assert summary["median"] == 0.2
+    assert summary["max"] == 0.3
+
+
+def test_compare_flags_regressions_past_threshold(tmp_path):
+    """Test that only slowdowns past the threshold and noise floor regress."""
+    baseline = {
+        "slow": summarize([0.100]),
+        "ok": summarize([0.100]),
+        "tiny": summarize([0.0001]),
+        "removed": summarize([0.1]),
+    }
+    current = {
+        "slow": summarize([0.150]),
+        "ok": summarize([0.110]),
+        "tiny": summarize([0.0004]),
+        "added": summarize([0.1]),
+    }
+    save_results(tmp_path / "baseline.json", baseline)
+    rows = compare(current, load_results(tmp_path / "baseline.json"), threshold=0.2)
+    assert {row["name"]: row["regressed"] for row in rows} == {
+        "ok": False,
+        "slow": True,
+        "tiny": False,
+    }
+    assert round(rows[1]["change"], 2) == 0.5
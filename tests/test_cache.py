@@ -0,0 +1,141 @@
+import gc
+import json
+import weakref
+from env_manager import cache as cache_module
+from env_manager.cache import CacheManager
+
+
+def test_cache_package_and_lookup(tmp_path):
+    """Test caching packages and checking for them."""
+    cm = CacheManager(cache_dir=tmp_path / "cache")
+    cm.cache_package("requests", "2.31.0")
+
+    assert cm.is_cached("requests", "2.31.0")
+    assert not cm.is_cached("requests", "2.0.0")
+    assert cm.get_cache_info()["total_packages"] == 1
+
+
+def test_cache_persists_across_instances(tmp_path):
+    """Test that cached entries survive a new CacheManager."""
+    CacheManager(cache_dir=tmp_path / "cache").cache_package("numpy")
+    assert CacheManager(cache_dir=tmp_path / "cache").is_cached("numpy")
+
+
+def test_batch_commits_once(tmp_path):
+    """Test that a batch of writes is visible only after it completes."""
+    cm = CacheManager(cache_dir=tmp_path / "cache")
+    other = CacheManager(cache_dir=tmp_path / "cache")
+
+    with cm.batch():
+        for i in range(100):
+            cm.cache_package(f"pkg{i}", "1.0")
+        assert not other.is_cached("pkg0", "1.0")
+
+    assert other.is_cached("pkg99", "1.0")
+    assert other.get_cache_info()["total_packages"] == 100
+
+
+def test_exit_hook_flushes_open_managers_without_keeping_them(tmp_path):
+    """Test that buffered accesses are flushed at exit and managers can be freed."""
+    cm = CacheManager(cache_dir=tmp_path / "cache")
+    cm.cache_package("requests", "1.0")
+    cm.is_cached("requests", "1.0")
+
+    cache_module._flush_open_managers()
+    assert not cm._pending_access
+    hits = cm._conn.execute("SELECT access_count FROM packages").fetchone()[0]
+    assert hits == 1
+
+    ref = weakref.ref(cm)
+    del cm
+    gc.collect()
+    assert ref() is None
+
+
+def test_migrates_legacy_json_metadata(tmp_path):
+    """Test that an old metadata.json is imported and retired."""
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    legacy = CacheManager(cache_dir=tmp_path / "scratch")
+    checksum = legacy._calculate_checksum("flask", "3.0.0")
+    (cache_dir / "metadata.json").write_text(
+        json.dumps({checksum: {"package": "flask", "version": "3.0.0"}})
+    )
+
+    cm = CacheManager(cache_dir=cache_dir)
+
+    assert cm.is_cached("flask", "3.0.0")
+    assert not (cache_dir / "metadata.json").exists()
+
+
+def test_clear_cache_keeps_database(tmp_path):
+    """Test that clearing the cache removes entries but not the store."""
+    cm = CacheManager(cache_dir=tmp_path / "cache")
+    cm.cache_package("requests")
+    (cm.cache_dir / "requests-2.31.0-py3-none-any.whl").write_bytes(b"wheel")
+
+    cm.clear_cache()
+
+    assert not cm.is_cached("requests")
+    assert cm.db_path.exists()
+    assert cm.get_cache_info()["total_size"] == 0
+
+
+def _artifact(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_cache_info_tracks_size_incrementally(tmp_path):
+    """Test that total size follows inserts, replacements and clears."""
+    cm = CacheManager(cache_dir=tmp_path / "cache")
+    cm.cache_package("a", "1.0", artifact=_artifact(tmp_path, "a.whl", 100))
+    cm.cache_package("b", "1.0", artifact=_artifact(tmp_path, "b.whl", 50))
+    assert cm.get_cache_info()["total_size"] == 150
+
+    cm.cache_package("a", "1.0", artifact=_artifact(tmp_path, "a.whl", 10))
+    assert cm.get_cache_info() == {
+        "total_packages": 2,
+        "total_size": 60,
+        "cache_dir": str(tmp_path / "cache"),
+    }
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    """Test that LRU eviction keeps recently used entries under the budget."""
+    cm = CacheManager(cache_dir=tmp_path / "cache")
+    for name in ("a", "b", "c"):
+        cm.cache_package(name, "1.0", artifact=_artifact(tmp_path, f"{name}.whl", 100))
+    assert cm.is_cached("a", "1.0")
+
+    result = cm.prune_cache(max_age_days=None, max_bytes=200)
+
+    assert result == {"removed": 1, "freed": 100}
+    assert not cm.is_cached("b", "1.0")
+    assert not (cm.cache_dir / "b.whl").exists()
+    assert cm.is_cached("a", "1.0") and cm.is_cached("c", "1.0")
+
+
+def test_prune_by_age(tmp_path):
+    """Test that entries unused for longer than max_age_days are evicted."""
+    cm = CacheManager(cache_dir=tmp_path / "cache")
+    cm.cache_package("old")
+    cm._conn.execute("UPDATE packages SET last_access = 0")
+    cm._conn.commit()
+    cm.cache_package("new")
+
+    assert cm.prune_cache(max_age_days=30)["removed"] == 1
+    assert cm.is_cached("new")
+    assert not cm.is_cached("old")
+
+
+def test_budget_enforced_on_write(tmp_path):
+    """Test that a configured byte budget is applied as packages are cached."""
+    cm = CacheManager(cache_dir=tmp_path / "cache", max_bytes=150, policy="lfu")
+    cm.cache_package("a", artifact=_artifact(tmp_path, "a.whl", 100))
+    cm.is_cached("a")
+    cm.cache_package("b", artifact=_artifact(tmp_path, "b.whl", 100))
+
+    assert cm.get_cache_info()["total_size"] == 100
+    assert cm.is_cached("a")
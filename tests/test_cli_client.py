@@ -0,0 +1,160 @@
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler
+from unittest.mock import MagicMock, patch
+import pytest
+import typer
+from cli import context
+from cli.client import DaemonClient, DaemonError
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix sockets not available"
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.split("?")[0] == "/environments":
+            env = {"name": "remote", "python_version": "3.11", "active": False}
+            self._reply(200, {"environments": [env]})
+        else:
+            self._reply(404, {"detail": "Not Found"})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects a (host, port) style address
+        return request, ("local", 0)
+
+
+@pytest.fixture
+def daemon_socket(tmp_path):
+    path = tmp_path / "daemon.sock"
+    server = _UnixHTTPServer(str(path), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield path
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_detects_missing_daemon(tmp_path):
+    """Test that no socket means no daemon."""
+    assert not DaemonClient(tmp_path / "missing.sock").is_running()
+
+
+def test_client_request(daemon_socket):
+    """Test a request round-trip over the Unix socket."""
+    client = DaemonClient(daemon_socket)
+    assert client.is_running()
+    assert client.get("/environments")["environments"][0]["name"] == "remote"
+
+
+def test_client_raises_daemon_errors(daemon_socket):
+    """Test that HTTP errors from the daemon are surfaced with their detail."""
+    with pytest.raises(DaemonError) as exc_info:
+        DaemonClient(daemon_socket).get("/missing")
+    assert exc_info.value.status == 404
+    assert exc_info.value.detail == "Not Found"
+
+
+def test_call_daemon_falls_back_without_daemon(tmp_path, monkeypatch):
+    """Test that commands run in-process when no daemon is listening."""
+    monkeypatch.setenv("PYSPACE_DAEMON_SOCKET", str(tmp_path / "missing.sock"))
+    context.get_daemon_client.cache_clear()
+    try:
+        assert context.call_daemon("GET", "/environments") is None
+    finally:
+        context.get_daemon_client.cache_clear()
+
+
+def test_run_daemon_job_reports_lost_daemon(monkeypatch):
+    """Test that a daemon dropping mid-job is a DaemonError, not a traceback."""
+    client = MagicMock()
+    client.request.return_value = {"job_id": "abc"}
+    client.wait_for_job.side_effect = ConnectionResetError("reset by peer")
+    get_client = MagicMock(return_value=client)
+    monkeypatch.setattr(context, "get_daemon_client", get_client)
+
+    with pytest.raises(DaemonError) as exc_info:
+        context.run_daemon_job("POST", "/environments", name=["demo"])
+    assert exc_info.value.status == 503
+    assert "job abc" in exc_info.value.detail
+    get_client.cache_clear.assert_called_once()
+
+
+def test_list_forwards_to_daemon(daemon_socket, monkeypatch, capsys):
+    """Test that `pyspace list` is answered by a running daemon."""
+    monkeypatch.setenv("PYSPACE_DAEMON_SOCKET", str(daemon_socket))
+    context.get_daemon_client.cache_clear()
+    try:
+        from cli.commands.list import list as list_cmd
+
+        with patch("cli.commands.list.get_env_manager") as mock_env_manager:
+            list_cmd()
+            mock_env_manager.assert_not_called()
+    finally:
+        context.get_daemon_client.cache_clear()
+    assert "remote" in capsys.readouterr().out
+
+
+@pytest.fixture
+def local_cli(tmp_path, monkeypatch):
+    """A fresh HOME with no daemon, so commands run in-process."""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("PYSPACE_NO_DAEMON", "1")
+    monkeypatch.chdir(tmp_path)
+    cached = (
+        context.get_env_manager,
+        context.get_venv_pool,
+        context.get_config_manager,
+        context.get_daemon_config_manager,
+        context.get_daemon_client,
+    )
+    for fn in cached:
+        fn.cache_clear()
+    yield tmp_path / "home" / ".pyspace"
+    for fn in cached:
+        fn.cache_clear()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses a POSIX venv layout")
+def test_install_without_daemon_runs_in_process(local_cli, tmp_path, build_wheel):
+    """Test that install falls back to the installer when no daemon runs."""
+    from cli.commands.install import install
+    from env_manager.lock import installed_distributions
+
+    wheelhouse = tmp_path / "wheels"
+    wheelhouse.mkdir()
+    build_wheel(wheelhouse, "alpha", "1.0")
+    local_cli.mkdir(parents=True)
+    (local_cli / "config.json").write_text(
+        json.dumps({"pool_size": 0, "find_links": str(wheelhouse)})
+    )
+    env_path = local_cli / "envs" / "demo"
+    subprocess.run([sys.executable, "-m", "venv", str(env_path)], check=True)
+    (tmp_path / "pyspace.json").write_text(json.dumps({"environment": "demo"}))
+
+    install(["alpha"], False)
+    assert installed_distributions(env_path)["alpha"] == "1.0"
+    with pytest.raises(typer.Exit):
+        install(["missing"], False, offline=True)
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time allowed for cli.main, in microseconds. typer itself
+# accounts for most of it; managers must not be imported at startup.
+STARTUP_BUDGET_US = 250_000
+EAGER_MODULES = (
+    "env_manager.environment",
+    "env_manager.cache",
+    "env_manager.config",
+    "daemon.daemon",
+    "pyspace_daemon",
+    "loguru",
+)
+
+
+def _import_times(tmp_path):
+    env = dict(os.environ, HOME=str(tmp_path), PYTHONPATH=str(REPO_ROOT))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import cli.main"],
+        capture_output=True,
+        text=True,
+        cwd=tmp_path,
+        env=env,
+    )
+    assert result.returncode == 0, result.stderr
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_does_not_construct_managers(tmp_path):
+    """Test that importing the CLI loads no managers and touches no files."""
+    times = _import_times(tmp_path)
+
+    loaded = [m for m in EAGER_MODULES if any(n.startswith(m) for n in times)]
+    assert loaded == []
+    assert not (tmp_path / ".pyspace").exists()
+
+
+def test_cli_import_time_budget(tmp_path):
+    """Test that importing the CLI stays within the startup budget."""
+    # Best of three to smooth out a cold filesystem cache
+    best = min(_import_times(tmp_path)["cli.main"] for _ in range(3))
+    assert best < STARTUP_BUDGET_US
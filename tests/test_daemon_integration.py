@@ -1,3 +1,6 @@
+import os
+import sys
+import time
 import pytest
 import threading
 from unittest.mock import patch, MagicMock, Mock
@@ -79,6 +82,56 @@ class TestDaemonAutoSync:
         assert self.daemon.watcher is not None
 
 
+class TestDaemonScheduler:
+    """Test the daemon's event queue and timers."""
+
+    def _run(self, daemon):
+        thread = threading.Thread(target=daemon.start, daemon=True)
+        with patch("daemon.daemon.PySpaceDaemon._start_file_watcher"):
+            thread.start()
+            time.sleep(0.1)
+        return thread
+
+    def test_stop_is_immediate(self):
+        """Test that stopping does not wait for the next timer."""
+        daemon = PySpaceDaemon()
+        thread = self._run(daemon)
+        started = time.monotonic()
+        daemon.stop()
+        thread.join(timeout=2)
+        assert not thread.is_alive()
+        assert time.monotonic() - started < 1
+
+    def test_submitted_events_are_handled(self):
+        """Test that work submitted from other threads runs on the loop."""
+        daemon = PySpaceDaemon()
+        handled = threading.Event()
+        daemon.register_handler("custom", lambda payload: handled.set())
+        thread = self._run(daemon)
+        try:
+            daemon.submit("custom", {"source": "api"})
+            assert handled.wait(timeout=2)
+        finally:
+            daemon.stop()
+            thread.join(timeout=2)
+
+    @patch("env_manager.environment.EnvironmentManager.is_active")
+    @patch("env_manager.config.ConfigManager.get_local_config")
+    def test_unchanged_config_skips_sync(self, mock_get_config, mock_is_active):
+        """Test that sync work is skipped when the parsed config is unchanged."""
+        mock_get_config.return_value = {"environment": "test_env"}
+        mock_is_active.return_value = False
+        daemon = PySpaceDaemon()
+
+        daemon._check_auto_sync()
+        daemon._check_auto_sync()
+        assert mock_is_active.call_count == 1
+
+        mock_get_config.return_value = {"environment": "other_env"}
+        daemon._check_auto_sync()
+        assert mock_is_active.call_count == 2
+
+
 class TestFileWatcher:
     """Test file watcher functionality."""
 
@@ -123,6 +176,78 @@ class TestFileWatcher:
         assert callback_called
 
 
+class TestFileWatcherBackends:
+    """Test change detection and the event-driven watcher backends."""
+
+    def _start(self, watcher):
+        thread = threading.Thread(target=watcher.start_watching, daemon=True)
+        thread.start()
+        time.sleep(0.1)
+        return thread
+
+    def _stop(self, watcher, thread):
+        watcher.stop_watching()
+        thread.join(timeout=2)
+        assert not thread.is_alive()
+
+    def test_same_mtime_edit_is_detected(self, tmp_path):
+        """Test that content hashing catches edits that keep the mtime."""
+        config = tmp_path / "pyspace.json"
+        config.write_text('{"environment": "a"}')
+        callback = Mock()
+        watcher = FileWatcher(config, callback)
+        watcher.watch()
+
+        mtime = config.stat().st_mtime_ns
+        config.write_text('{"environment": "b"}')
+        os.utime(config, ns=(mtime, mtime))
+        watcher.watch()
+
+        callback.assert_called_once_with(config, "modified")
+
+    @pytest.mark.parametrize("backend", ["inotify", "polling"])
+    def test_burst_of_writes_is_debounced(self, tmp_path, backend):
+        """Test that a burst of writes produces a single callback."""
+        if backend == "inotify" and not sys.platform.startswith("linux"):
+            pytest.skip("inotify is Linux only")
+        config = tmp_path / "pyspace.json"
+        config.write_text("{}")
+        callback = Mock()
+        watcher = FileWatcher(
+            config, callback, debounce=0.2, poll_interval=0.5, backend=backend
+        )
+        thread = self._start(watcher)
+        try:
+            for i in range(5):
+                config.write_text(f'{{"environment": "env{i}"}}')
+            deadline = time.monotonic() + 2
+            while not callback.called and time.monotonic() < deadline:
+                time.sleep(0.05)
+            time.sleep(0.5)
+        finally:
+            self._stop(watcher, thread)
+        callback.assert_called_once_with(config, "modified")
+
+    def test_atomic_rename_save(self, tmp_path):
+        """Test that editor-style atomic saves fire once, and not for no-op saves."""
+        if not sys.platform.startswith("linux"):
+            pytest.skip("inotify is Linux only")
+        config = tmp_path / "pyspace.json"
+        config.write_text('{"environment": "a"}')
+        callback = Mock()
+        watcher = FileWatcher(config, callback, debounce=0.1, backend="inotify")
+        thread = self._start(watcher)
+        try:
+            for content in ('{"environment": "b"}', '{"environment": "b"}'):
+                tmp = tmp_path / ".pyspace.json.swp"
+                tmp.write_text(content)
+                os.replace(tmp, config)
+                time.sleep(0.4)
+        finally:
+            self._stop(watcher, thread)
+        callback.assert_called_once_with(config, "modified")
+
+
 class TestDaemonIntegration:
     """Integration tests for daemon functionality."""
 
@@ -1,3 +1,5 @@
+import json
+import pytest
 from unittest.mock import patch
 from env_manager.environment import EnvironmentManager
 
@@ -46,3 +48,79 @@ def test_remove_environment(mock_run, tmp_path):
     # Verify it was removed
     envs = env_manager.list_environments()
     assert len(envs) == 0
+
+
+@patch("env_manager.utils.run_command")
+def test_bulk_create_and_remove(mock_run, tmp_path):
+    """Test bulk operations report per env and write metadata once per batch."""
+    mock_run.return_value = (0, "", "")
+    env_manager = EnvironmentManager(base_dir=tmp_path / "envs")
+    names = [f"ci-{i}" for i in range(6)] + ["keep"]
+
+    with patch("env_manager.environment.json.dump", wraps=json.dump) as mock_dump:
+        results = env_manager.create_environments(names, max_workers=4)
+    assert results == {name: True for name in names}
+    assert mock_dump.call_count == 1
+
+    results = env_manager.create_environments(["keep", "new"], max_workers=2)
+    assert results == {"keep": False, "new": True}
+
+    with patch("env_manager.environment.json.dump", wraps=json.dump) as mock_dump:
+        results = env_manager.remove_environments(
+            ["new", "missing"], pattern="ci-*", max_workers=4
+        )
+    assert results["missing"] is False
+    assert sum(results.values()) == 7
+    assert mock_dump.call_count == 1
+    assert [env["name"] for env in env_manager.list_environments()] == ["keep"]
+    assert not any(name.startswith("ci-") for name in env_manager.metadata)
+
+
+def _fake_env(base_dir, name, payload_size, packages):
+    site_packages = base_dir / name / "lib" / "python3.11" / "site-packages"
+    site_packages.mkdir(parents=True)
+    (site_packages / "payload.bin").write_bytes(b"x" * payload_size)
+    for i in range(packages):
+        (site_packages / f"pkg{i}-1.0.dist-info").mkdir()
+    return site_packages
+
+
+def test_query_environments(tmp_path):
+    """Test filtering, sorting and paging with lazily computed stats."""
+    env_manager = EnvironmentManager(base_dir=tmp_path / "envs")
+    env_manager.stats.cache_file = tmp_path / "env_stats.json"
+    _fake_env(env_manager.base_dir, "ci-small", 10, 1)
+    _fake_env(env_manager.base_dir, "ci-large", 5000, 3)
+    _fake_env(env_manager.base_dir, "dev", 100, 2)
+
+    result = env_manager.query_environments(pattern="ci-*")
+    assert result["total"] == 2
+    assert "size" not in result["environments"][0]
+
+    result = env_manager.query_environments(sort="size", reverse=True, limit=2)
+    assert [env["name"] for env in result["environments"]] == ["ci-large", "dev"]
+    assert result["total"] == 3
+    assert result["environments"][0]["packages"] == 3
+    assert result["environments"][0]["size"] >= 5000
+
+    page = env_manager.list_environments(offset=2, limit=2, stats=True)
+    assert [env["name"] for env in page] == ["dev"]
+    assert page[0]["packages"] == 2
+
+    with pytest.raises(ValueError):
+        env_manager.query_environments(sort="color")
+
+
+def test_environment_stats_cached_by_mtime(tmp_path):
+    """Test that stats are reused until an install changes site-packages."""
+    env_manager = EnvironmentManager(base_dir=tmp_path / "envs")
+    env_manager.stats.cache_file = tmp_path / "env_stats.json"
+    site_packages = _fake_env(env_manager.base_dir, "app", 10, 1)
+    assert env_manager.list_environments(stats=True)[0]["packages"] == 1
+
+    with patch("env_manager.stats._disk_usage") as mock_usage:
+        assert env_manager.list_environments(stats=True)[0]["packages"] == 1
+        mock_usage.assert_not_called()
+
+    (site_packages / "newpkg-2.0.dist-info").mkdir()
+    assert env_manager.list_environments(stats=True)[0]["packages"] == 2
@@ -0,0 +1,128 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from pyspace_daemon import installer as installer_module
+from pyspace_daemon.cache_manager import CacheManager
+from pyspace_daemon.installer import (
+    Installer,
+    OfflineInstallError,
+    UvInstaller,
+    get_installer,
+)
+
+
+def test_get_installer_honors_use_uv(monkeypatch):
+    """Test backend selection, falling back to pip when uv is missing."""
+    monkeypatch.setattr(installer_module.shutil, "which", lambda name: "/opt/uv")
+    assert type(get_installer("file:///idx")) is Installer
+    uv = get_installer("file:///idx", use_uv=True)
+    assert isinstance(uv, UvInstaller) and uv.uv_path == "/opt/uv"
+
+    monkeypatch.setattr(installer_module.shutil, "which", lambda name: None)
+    assert type(get_installer("file:///idx", use_uv=True)) is Installer
+
+
+def test_install_batches_requirements(tmp_path):
+    """Test that all requirements go to one installer run with the local index."""
+    completed = subprocess.CompletedProcess([], 0, "", "")
+    uv = UvInstaller("file:///idx", "/opt/uv")
+    with patch.object(installer_module, "run_process", return_value=completed) as run:
+        assert uv.install(tmp_path, ["six", "idna==3.4", "attrs"])
+    run.assert_called_once()
+    cmd = run.call_args[0][0]
+    assert cmd[:4] == ["/opt/uv", "pip", "install", "--python"]
+    assert cmd[cmd.index("--extra-index-url") + 1] == "file:///idx"
+    assert cmd[-3:] == ["six", "idna==3.4", "attrs"]
+
+
+def test_install_reports_failure(tmp_path):
+    """Test that a failing installer run is reported, and empty input is a no-op."""
+    failed = subprocess.CompletedProcess([], 1, "", "no matching distribution")
+    pip = Installer("file:///idx")
+    with patch.object(installer_module, "run_process", return_value=failed) as run:
+        assert not pip.install(tmp_path, ["missing"])
+        assert pip.install(tmp_path, [])
+    assert run.call_count == 1
+    assert run.call_args[0][0][1:4] == ["-m", "pip", "install"]
+
+
+def test_install_options_and_uninstall_commands(tmp_path):
+    """Test that options precede requirements and uninstall targets the env."""
+    pip_cmd = Installer("file:///idx").command(
+        Path("py"), ["-r", "req.txt"], options=["--no-deps"]
+    )
+    assert pip_cmd[-3:] == ["--no-deps", "-r", "req.txt"]
+    uv = UvInstaller("file:///idx", "uv")
+    assert uv.uninstall_command(Path("py"), ["six"]) == [
+        "uv",
+        "pip",
+        "uninstall",
+        "--python",
+        "py",
+        "six",
+    ]
+    completed = subprocess.CompletedProcess([], 0, "", "")
+    with patch.object(installer_module, "run_process", return_value=completed) as run:
+        assert Installer("file:///idx").uninstall(tmp_path, ["six"])
+        assert Installer("file:///idx").uninstall(tmp_path, [])
+    assert run.call_count == 1
+    assert run.call_args[0][0][1:] == ["-m", "pip", "uninstall", "-y", "six"]
+
+
+def test_sync_command(tmp_path):
+    """Test that uv syncs with one `uv pip sync` and pip has no sync."""
+    uv_cmd = UvInstaller("file:///idx", "uv").sync_command(
+        Path("py"), ["req.txt"], True
+    )
+    assert uv_cmd[:5] == ["uv", "pip", "sync", "--python", "py"]
+    assert "--offline" in uv_cmd and "--allow-empty-requirements" in uv_cmd
+    assert uv_cmd[-1] == "req.txt"
+    assert not Installer.supports_sync
+    with pytest.raises(NotImplementedError):
+        Installer("file:///idx").sync(tmp_path, ["req.txt"])
+
+
+def test_offline_command_uses_only_local_index(tmp_path):
+    """Test that offline installs cannot reach any configured index."""
+    pip_cmd = Installer("file:///idx").command(Path("py"), ["six"], offline=True)
+    assert "--isolated" in pip_cmd and "--extra-index-url" not in pip_cmd
+    assert pip_cmd[pip_cmd.index("--index-url") + 1] == "file:///idx"
+    uv_cmd = UvInstaller("file:///idx", "uv").command(Path("py"), ["six"], True)
+    assert "--offline" in uv_cmd and "--extra-index-url" not in uv_cmd
+
+
+def test_offline_failure_lists_missing(tmp_path):
+    """Test that installer output naming missing projects raises with the list."""
+    stderr = (
+        "ERROR: No matching distribution found for nothere\n"
+        "  cause: Because other was not found in the cache\n"
+    )
+    failed = subprocess.CompletedProcess([], 1, "", stderr)
+    with patch.object(installer_module, "run_process", return_value=failed):
+        with pytest.raises(OfflineInstallError) as excinfo:
+            Installer("file:///idx").install(tmp_path, ["nothere"], offline=True)
+    assert excinfo.value.missing == ["nothere", "other"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses a POSIX venv layout")
+def test_offline_install_ignores_pip_environment(tmp_path, monkeypatch, build_wheel):
+    """Test a real offline install from the store with a bogus index configured."""
+    wheelhouse = tmp_path / "wheelhouse"
+    wheelhouse.mkdir()
+    build_wheel(wheelhouse, "alpha", "1.0")
+    cm = CacheManager(tmp_path / "cache", find_links=str(wheelhouse))
+    assert cm.prefetch(["alpha"]) == {"alpha": True}
+    env_path = tmp_path / "env"
+    subprocess.run([sys.executable, "-m", "venv", str(env_path)], check=True)
+
+    monkeypatch.setenv("PIP_INDEX_URL", "http://127.0.0.1:9/simple")
+    monkeypatch.setenv("PIP_EXTRA_INDEX_URL", "http://127.0.0.1:9/simple")
+    pip = Installer(cm.get_index_url())
+    assert pip.install(env_path, ["alpha"], offline=True)
+    assert list(env_path.glob("lib/*/site-packages/alpha-1.0.dist-info"))
+    with pytest.raises(OfflineInstallError) as excinfo:
+        pip.install(env_path, ["beta"], offline=True)
+    assert excinfo.value.missing == ["beta"]
@@ -0,0 +1,79 @@
+import json
+import os
+import pytest
+from env_manager import interpreters
+from env_manager.interpreters import InterpreterRegistry
+
+
+def _fake_python(directory, name, version, probe_log):
+    """Write an executable that answers the registry probe like a real Python."""
+    info = {
+        "version": version,
+        "implementation": "cpython",
+        "abi": "cp" + "".join(version.split(".")[:2]),
+        "soabi": None,
+    }
+    path = directory / name
+    path.write_text(
+        f"#!/bin/sh\necho {path} >> {probe_log}\necho '{json.dumps(info)}'\n"
+    )
+    path.chmod(0o755)
+    return path
+
+
+@pytest.fixture
+def fake_system(tmp_path, monkeypatch):
+    pyenv_bin = tmp_path / "pyenv" / "versions" / "3.10.4" / "bin"
+    pyenv_bin.mkdir(parents=True)
+    path_bin = tmp_path / "bin"
+    path_bin.mkdir()
+    probe_log = tmp_path / "probes.log"
+    probe_log.touch()
+    _fake_python(pyenv_bin, "python", "3.10.4", probe_log)
+    _fake_python(path_bin, "python3.12", "3.12.1", probe_log)
+    os.symlink(path_bin / "python3.12", path_bin / "python3")
+    monkeypatch.setenv("PYENV_ROOT", str(tmp_path / "pyenv"))
+    monkeypatch.setenv("PATH", str(path_bin))
+    monkeypatch.setattr(interpreters, "STANDARD_PREFIXES", [])
+    return tmp_path, path_bin, probe_log
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses shell-script interpreters")
+def test_find_by_version_prefix(fake_system):
+    """Test lookups by major, minor and full version."""
+    tmp_path, path_bin, _ = fake_system
+    registry = InterpreterRegistry(tmp_path / "interpreters.json")
+    assert registry.find("3.10").endswith("3.10.4/bin/python")
+    assert registry.find("3.12.1") == str(path_bin / "python3")
+    assert registry.find("3") == str(path_bin / "python3")
+    assert registry.find("3.9") is None
+    # Symlinked names for one binary are listed once, with ABI info
+    listed = registry.list_interpreters()
+    assert [entry["abi"] for entry in listed] == ["cp310", "cp312"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses shell-script interpreters")
+def test_registry_persists_without_reprobing(fake_system):
+    """Test that a fresh registry answers from disk without running interpreters."""
+    tmp_path, _, probe_log = fake_system
+    InterpreterRegistry(tmp_path / "interpreters.json").find("3.10")
+    probes = len(probe_log.read_text().splitlines())
+    assert probes == 2
+
+    registry = InterpreterRegistry(tmp_path / "interpreters.json")
+    assert registry.find("3.12")
+    assert len(probe_log.read_text().splitlines()) == probes
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses shell-script interpreters")
+def test_directory_mtime_invalidates(fake_system):
+    """Test that newly installed interpreters are picked up."""
+    tmp_path, path_bin, probe_log = fake_system
+    registry = InterpreterRegistry(tmp_path / "interpreters.json")
+    assert registry.find("3.13") is None
+
+    _fake_python(path_bin, "python3.13", "3.13.0", probe_log)
+    # Make sure the directory mtime moves even on coarse-grained filesystems
+    stat = os.stat(path_bin)
+    os.utime(path_bin, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert registry.find("3.13") == str(path_bin / "python3.13")
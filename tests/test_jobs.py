@@ -0,0 +1,106 @@
+import sys
+import threading
+import time
+import pytest
+from pyspace_daemon.jobs import JOBS_FINISHED, JobQueue, current_job, run_process
+
+
+@pytest.fixture
+def queue():
+    jobs = JobQueue(max_workers=1)
+    yield jobs
+    jobs.shutdown()
+
+
+def _wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_job_succeeds(queue):
+    """Test that a job's return value becomes its result."""
+    job = queue.submit("add", lambda a, b: a + b, 2, 3)
+    assert job.done.wait(5)
+    assert job.status == "succeeded"
+    assert job.result == 5
+    assert job.to_dict()["finished_at"] is not None
+
+
+def test_job_failure_is_recorded(queue):
+    """Test that an exception marks the job failed with its message."""
+
+    def boom():
+        raise RuntimeError("install failed")
+
+    job = queue.submit("install", boom)
+    assert job.done.wait(5)
+    assert job.status == "failed"
+    assert job.error == "install failed"
+    assert queue.list("failed") == [job]
+
+
+def test_cancel_queued_job(queue):
+    """Test that a job still waiting for a worker never runs once cancelled."""
+    release = threading.Event()
+    blocker = queue.submit("block", release.wait)
+    ran = []
+    queued = queue.submit("noop", lambda: ran.append(True))
+    assert queue.pending() == 1
+
+    assert queue.cancel(queued.id)
+    release.set()
+    assert blocker.done.wait(5)
+    assert queued.status == "cancelled"
+    assert not ran
+    assert not queue.cancel(queued.id)
+
+
+def test_cancel_job_taken_by_worker_before_it_runs(queue, monkeypatch):
+    """Test that a job cancelled between pickup and start still finishes."""
+    gate = threading.Event()
+    run = JobQueue._run
+
+    def delayed_run(self, *args):
+        gate.wait(5)
+        run(self, *args)
+
+    monkeypatch.setattr(JobQueue, "_run", delayed_run)
+    before = JOBS_FINISHED.get(kind="late", status="cancelled")
+    ran = []
+    job = queue.submit("late", lambda: ran.append(True))
+    assert _wait_until(job._future.running)
+
+    assert queue.cancel(job.id)
+    assert job.status == "queued"
+    gate.set()
+    assert job.done.wait(5)
+    assert job.status == "cancelled" and job.finished_at is not None
+    assert not ran
+    assert JOBS_FINISHED.get(kind="late", status="cancelled") == before + 1
+
+
+def test_cancel_running_job_terminates_process(queue):
+    """Test that cancelling a running job kills its subprocess."""
+    seen = []
+
+    def slow():
+        seen.append(current_job())
+        return run_process([sys.executable, "-c", "import time; time.sleep(30)"])
+
+    job = queue.submit("slow", slow)
+    assert _wait_until(lambda: job._processes)
+    started = time.monotonic()
+    assert queue.cancel(job.id)
+    assert job.done.wait(5)
+    assert time.monotonic() - started < 5
+    assert job.status == "cancelled"
+    assert seen == [job]
+
+
+def test_run_process_outside_job():
+    """Test that run_process behaves like subprocess.run outside a job."""
+    result = run_process([sys.executable, "-c", "print('ok')"])
+    assert result.returncode == 0
+    assert result.stdout.strip() == "ok"
@@ -0,0 +1,111 @@
+import pytest
+from cli.loadgen import (
+    LoadGenerator,
+    LocalDaemon,
+    format_report,
+    parse_mix,
+    percentile,
+    wheelhouse_packages,
+)
+
+
+class FakeDaemon(LoadGenerator):
+    """Answers requests in-process; snapshots fail to exercise error counting."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__("/nonexistent.sock", *args, **kwargs)
+        self.sent = []
+
+    def request(self, method, path, params=None):
+        self.sent.append((method, path, params))
+        if path.endswith("/snapshot"):
+            return 500, {"detail": "boom"}
+        if method == "POST":
+            return 202, {"job_id": "j1", "status": "queued"}
+        if path.startswith("/jobs/"):
+            return 200, {"status": "succeeded"}
+        return 200, {"workspaces": []}
+
+
+def test_parse_mix():
+    """Test parsing and validating operation weights."""
+    assert parse_mix("list=3, install=1") == {"list": 3.0, "install": 1.0}
+    for bad in ("list=x", "delete=1", "list=0", "list=-1"):
+        with pytest.raises(ValueError):
+            parse_mix(bad)
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([5], 99) == 5
+    assert percentile([], 50) is None
+
+
+def test_wheelhouse_packages(tmp_path, build_wheel):
+    """Test that wheelhouses list their normalized project names once."""
+    build_wheel(tmp_path, "Load_Pkg", "1.0")
+    build_wheel(tmp_path, "load_pkg", "2.0")
+    build_wheel(tmp_path, "other", "1.0")
+    (tmp_path / "README.txt").write_text("")
+    assert wheelhouse_packages(tmp_path) == ["load-pkg", "other"]
+
+
+def test_install_requires_packages():
+    """Test that an install-weighted mix needs packages to install."""
+    with pytest.raises(ValueError):
+        FakeDaemon({"install": 1})
+
+
+def test_run_reports_mix_and_errors():
+    """Test scheduling, per-operation stats and error rates."""
+    generator = FakeDaemon(
+        {"list": 1, "install": 1, "snapshot": 1},
+        rate=200,
+        duration=0.5,
+        packages=["loadpkg0"],
+        workspaces=2,
+        wait_jobs=True,
+        seed=1,
+    )
+    generator.setup()
+    assert len(generator.targets) == 2
+    report = generator.run()
+
+    assert report["total"]["requests"] == 100
+    operations = report["operations"]
+    assert set(operations) == {"list", "install", "snapshot"}
+    assert operations["snapshot"]["error_rate"] == 1.0
+    assert list(operations["snapshot"]["error_kinds"]) == ["HTTP 500"]
+    assert operations["list"]["errors"] == 0
+    assert operations["install"]["job_p50"] is not None
+    assert report["elapsed"] >= 0.45
+    installs = [p for m, path, p in generator.sent if path.startswith("/install/")]
+    assert all(p == {"package": "loadpkg0", "offline": "true"} for p in installs)
+    text = format_report(report)
+    assert "snapshot" in text and "HTTP 500" in text
+
+
+@pytest.mark.integration
+def test_load_local_daemon(tmp_path, build_wheel):
+    """Test a short run against a throwaway daemon serving a local wheelhouse."""
+    wheelhouse = tmp_path / "wheels"
+    wheelhouse.mkdir()
+    for i in range(2):
+        build_wheel(wheelhouse, f"loadpkg{i}", "1.0")
+    with LocalDaemon(wheelhouse) as daemon:
+        generator = LoadGenerator(
+            daemon.socket_path,
+            {"list": 2, "install": 1},
+            rate=10,
+            duration=1,
+            packages=wheelhouse_packages(wheelhouse),
+            workspaces=1,
+            wait_jobs=True,
+        )
+        generator.setup()
+        report = generator.run()
+    assert report["total"]["errors"] == 0
+    assert not daemon.home.exists()
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from env_manager import lock as lock_module
+from env_manager.lock import (
+    compare_versions,
+    installed_distributions,
+    plan_sync,
+    resolve_lock,
+    source_args,
+    sync_environment,
+)
+from pyspace_daemon.cache_manager import CacheManager
+from pyspace_daemon.installer import Installer, get_installer
+
+
+def _package(name, version):
+    return {"name": name, "version": version, "url": None, "hashes": []}
+
+
+def test_plan_sync_minimal_diff():
+    """Test that only missing, changed and extra packages are touched."""
+    lock = {
+        "packages": [
+            _package("Requests", "2.31.0"),
+            _package("idna", "3.4"),
+            _package("urllib3", "1.26.18"),
+            _package("six", "1.16.0"),
+        ]
+    }
+    installed = {
+        "requests": "2.30.0",
+        "idna": "3.4",
+        "urllib3": "2.0.7",
+        "attrs": "23.1.0",
+        "pip": "23.2.1",
+    }
+    plan = plan_sync(lock, installed)
+    assert [p["name"] for p in plan["install"]] == ["six"]
+    assert [(p["name"], p["installed"]) for p in plan["upgrade"]] == [
+        ("Requests", "2.30.0")
+    ]
+    assert [p["name"] for p in plan["downgrade"]] == ["urllib3"]
+    assert plan["remove"] == ["attrs"]
+    assert plan["unchanged"] == ["idna"]
+
+
+def test_plan_sync_orders_pre_releases_and_equal_versions():
+    """Test PEP 440 ordering, including pre-releases and zero padding."""
+    assert compare_versions("1.0.0", "1.0.0rc1") == 1
+    assert compare_versions("1.0.0rc1", "1.0.0") == -1
+    assert compare_versions("1.0", "1.0.0") == 0
+    assert compare_versions("1.10", "1.9") == 1
+    lock = {"packages": [_package("a", "1.0.0"), _package("b", "2.0")]}
+    plan = plan_sync(lock, {"a": "1.0.0rc1", "b": "2.0.0"})
+    assert [p["name"] for p in plan["upgrade"]] == ["a"]
+    assert plan["unchanged"] == ["b"]
+
+
+class _RecordingInstaller:
+    supports_sync = False
+
+    def __init__(self):
+        self.calls = []
+
+    def install(self, env_path, requirements, offline=False, options=()):
+        lines = Path(requirements[1]).read_text().splitlines()
+        self.calls.append(("install", lines, offline, list(options)))
+        return True
+
+    def uninstall(self, env_path, names):
+        self.calls.append(("uninstall", list(names)))
+        return True
+
+    def sync(self, env_path, requirement_files, offline=False, options=()):
+        lines = Path(requirement_files[0]).read_text().splitlines()
+        self.calls.append(("sync", lines, offline, list(options)))
+        return True
+
+
+def test_sync_goes_through_installer(tmp_path):
+    """Test that sync uses the given installer, and offline drops lock sources."""
+    lock = {
+        "pip_args": ["--no-index", "--find-links", "/w"],
+        "packages": [{**_package("six", "1.16.0"), "hashes": ["sha256:abc"]}],
+    }
+    installed = {"extra": "1.0"}
+    installer = _RecordingInstaller()
+    with patch.object(lock_module, "installed_distributions", return_value=installed):
+        sync_environment(tmp_path, lock, installer)
+        sync_environment(tmp_path, lock, installer, offline=True)
+    assert installer.calls == [
+        (
+            "install",
+            ["six==1.16.0 --hash=sha256:abc"],
+            False,
+            ["--no-deps", "--no-index", "--find-links", "/w"],
+        ),
+        ("uninstall", ["extra"]),
+        ("install", ["six==1.16.0 --hash=sha256:abc"], True, ["--no-deps"]),
+        ("uninstall", ["extra"]),
+    ]
+
+
+def test_sync_is_one_call_when_installer_supports_it(tmp_path):
+    """Test that a syncing backend gets the whole lock plus installed tooling."""
+    lock = {
+        "pip_args": ["--find-links", "/w"],
+        "packages": [_package("six", "1.16.0"), _package("idna", "3.4")],
+    }
+    installer = _RecordingInstaller()
+    installer.supports_sync = True
+    before = {"idna": "3.4", "pip": "24.0", "extra": "1.0"}
+    after = {"six": "1.16.0", "idna": "3.4", "pip": "24.0"}
+    with patch.object(
+        lock_module, "installed_distributions", side_effect=[before, after]
+    ):
+        plan = sync_environment(tmp_path, lock, installer)
+        # Already in sync: nothing to run
+        sync_environment(tmp_path, lock, installer)
+    assert plan["remove"] == ["extra"]
+    assert installer.calls == [
+        (
+            "sync",
+            ["six==1.16.0", "idna==3.4", "pip==24.0"],
+            False,
+            ["--find-links", "/w"],
+        )
+    ]
+
+
+def test_resolve_lock_reads_pip_report(tmp_path):
+    """Test that the installation report becomes a sorted lock with hashes."""
+    report = {
+        "environment": {"python_full_version": "3.11.7"},
+        "install": [
+            {
+                "metadata": {"name": "zipp", "version": "3.17.0"},
+                "download_info": {
+                    "url": "https://example/zipp.whl",
+                    "archive_info": {"hash": "sha256=abc"},
+                },
+            },
+            {
+                "metadata": {"name": "attrs", "version": "23.1.0"},
+                "download_info": {
+                    "url": "https://example/attrs.whl",
+                    "archive_info": {"hashes": {"sha256": "def"}},
+                },
+            },
+        ],
+    }
+
+    def fake_run(cmd):
+        Path(cmd[cmd.index("--report") + 1]).write_text(json.dumps(report))
+        return 0, "", ""
+
+    with patch.object(lock_module.utils, "run_command", side_effect=fake_run):
+        lock = resolve_lock(tmp_path, ["attrs", "zipp"], ["--no-index"])
+    assert lock["python"] == "3.11.7"
+    assert lock["pip_args"] == ["--no-index"]
+    assert [(p["name"], p["hashes"]) for p in lock["packages"]] == [
+        ("attrs", ["sha256:def"]),
+        ("zipp", ["sha256:abc"]),
+    ]
+
+
+def test_source_args():
+    """Test that local wheel directories disable the default index."""
+    assert source_args(find_links="/w") == ["--no-index", "--find-links", "/w"]
+    assert source_args("https://idx", "/w") == [
+        "--index-url",
+        "https://idx",
+        "--find-links",
+        "/w",
+    ]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses a POSIX venv layout")
+def test_lock_and_sync_real_environment(tmp_path, build_wheel):
+    """Test locking from a local wheelhouse and syncing a venv in both directions."""
+    wheelhouse = tmp_path / "wheels"
+    wheelhouse.mkdir()
+    build_wheel(wheelhouse, "app", "1.0", ["helper>=1.0"])
+    build_wheel(wheelhouse, "helper", "1.0")
+    build_wheel(wheelhouse, "helper", "2.0")
+    build_wheel(wheelhouse, "stray", "0.1")
+    env_path = tmp_path / "env"
+    subprocess.run([sys.executable, "-m", "venv", str(env_path)], check=True)
+    pip_args = source_args(find_links=str(wheelhouse))
+
+    lock = resolve_lock(env_path, ["app", "helper<2"], pip_args)
+    assert [(p["name"], p["version"]) for p in lock["packages"]] == [
+        ("app", "1.0"),
+        ("helper", "1.0"),
+    ]
+    assert all(p["hashes"][0].startswith("sha256:") for p in lock["packages"])
+
+    subprocess.run(
+        [str(env_path / "bin" / "python"), "-m", "pip", "install", "-q", *pip_args]
+        + ["helper==2.0", "stray"],
+        check=True,
+    )
+    installer = Installer(CacheManager(tmp_path / "cache").get_index_url())
+    plan = sync_environment(env_path, lock, installer)
+    assert [p["name"] for p in plan["install"]] == ["app"]
+    assert [p["name"] for p in plan["downgrade"]] == ["helper"]
+    assert plan["remove"] == ["stray"]
+    installed = installed_distributions(env_path)
+    assert installed["app"] == "1.0" and installed["helper"] == "1.0"
+    assert "stray" not in installed
+
+    assert not any(
+        sync_environment(env_path, lock, installer, dry_run=True)[key]
+        for key in ("install", "upgrade", "downgrade", "remove")
+    )
+
+
+@pytest.mark.skipif(shutil.which("uv") is None, reason="uv is not installed")
+def test_sync_real_environment_with_uv(tmp_path, build_wheel):
+    """Test that a uv sync removes extras and keeps the env's own tooling."""
+    wheelhouse = tmp_path / "wheels"
+    wheelhouse.mkdir()
+    app = build_wheel(wheelhouse, "app", "1.0")
+    build_wheel(wheelhouse, "stray", "0.1")
+    env_path = tmp_path / "env"
+    subprocess.run([sys.executable, "-m", "venv", str(env_path)], check=True)
+    pip_args = source_args(find_links=str(wheelhouse))
+    subprocess.run(
+        [str(env_path / "bin" / "python"), "-m", "pip", "install", "-q", *pip_args]
+        + ["stray"],
+        check=True,
+    )
+    digest = hashlib.sha256(app.read_bytes()).hexdigest()
+    lock = {
+        "pip_args": pip_args,
+        "packages": [{**_package("app", "1.0"), "hashes": [f"sha256:{digest}"]}],
+    }
+    index_url = CacheManager(tmp_path / "cache").get_index_url()
+    plan = sync_environment(env_path, lock, get_installer(index_url, use_uv=True))
+    assert plan["remove"] == ["stray"]
+    installed = installed_distributions(env_path)
+    assert installed["app"] == "1.0" and "pip" in installed
+    assert "stray" not in installed
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+import pytest
+from loguru import logger
+from pyspace_daemon.utils import configure_logging, parse_size
+
+BASE_CONFIG = {
+    "log_level": "WARNING",
+    "log_file_level": "DEBUG",
+    "log_json": False,
+    "log_module_levels": {},
+    "log_rotation": "10 MB",
+    "log_retention": 3,
+    "log_debug_sample": 1,
+}
+
+
+@pytest.fixture
+def log_config(tmp_path):
+    yield dict(BASE_CONFIG, log_file=str(tmp_path / "logs" / "daemon.log"))
+    logger.remove()
+    logger.add(sys.stderr)
+
+
+async def _complete():
+    await logger.complete()
+
+
+def _read_log(config):
+    # Removing the handlers stops the writer threads after a final flush
+    logger.remove()
+    with open(config["log_file"]) as f:
+        return f.read().splitlines()
+
+
+def test_file_sink_writes_json_lines(log_config):
+    """Test that the queued file sink can emit one JSON object per record."""
+    log_config["log_json"] = True
+    configure_logging(log_config)
+    logger.info("hello {}", "world")
+    records = [json.loads(line)["record"] for line in _read_log(log_config)]
+    assert [(r["level"]["name"], r["message"]) for r in records] == [
+        ("INFO", "hello world")
+    ]
+    assert records[0]["name"] == __name__
+
+
+def test_module_levels_override_sink_level(log_config):
+    """Test per-module minimum levels, matched by longest module prefix."""
+    log_config["log_module_levels"] = {
+        __name__: "ERROR",
+        "pyspace_daemon": "WARNING",
+    }
+    configure_logging(log_config)
+    logger.warning("suppressed")
+    logger.error("kept")
+    assert [line.split(" ", 3)[-1] for line in _read_log(log_config)] == ["kept"]
+
+
+def test_module_levels_can_lower_the_sink_level(log_config):
+    """Test that a module may log below the sink's default level."""
+    log_config["log_file_level"] = "ERROR"
+    log_config["log_module_levels"] = {__name__: "DEBUG"}
+    configure_logging(log_config)
+    logger.debug("detail")
+    assert [line.split(" ", 3)[-1] for line in _read_log(log_config)] == ["detail"]
+
+
+def test_debug_records_are_sampled_per_call_site(log_config):
+    """Test that only every Nth debug record from a call site is written."""
+    log_config["log_debug_sample"] = 5
+    configure_logging(log_config)
+    for i in range(10):
+        logger.debug("tick {}", i)
+    logger.info("not sampled")
+    lines = [line.split(" ", 3)[-1] for line in _read_log(log_config)]
+    assert lines == ["tick 0", "tick 5", "not sampled"]
+
+
+def test_parse_size():
+    assert parse_size(2048) == 2048
+    assert parse_size("100 B") == 100
+    assert parse_size("1.5kb") == 1536
+    assert parse_size("10 MB") == 10 * 1024 * 1024
+    with pytest.raises(ValueError):
+        parse_size("1 week")
+
+
+def test_log_file_rotates_by_size(log_config):
+    """Test that the log file rolls over into numbered backups."""
+    log_config["log_rotation"] = "100 B"
+    log_config["log_retention"] = 2
+    configure_logging(log_config)
+    for i in range(5):
+        logger.info(f"{i}" * 60)
+        # One record per batch, so every write may roll the file over
+        asyncio.run(_complete())
+    lines = _read_log(log_config)
+    assert lines[0].endswith("4" * 60)
+    log_file = Path(log_config["log_file"])
+    assert log_file.with_name("daemon.log.1").read_text().rstrip().endswith("3" * 60)
+    assert log_file.with_name("daemon.log.2").read_text().rstrip().endswith("2" * 60)
+    assert not log_file.with_name("daemon.log.3").exists()
@@ -0,0 +1,71 @@
+import sys
+import threading
+from env_manager.metrics import (
+    SQLITE_QUERY_SECONDS,
+    SUBPROCESSES_IN_FLIGHT,
+    Registry,
+)
+from pyspace_daemon.jobs import run_process
+from pyspace_daemon.workspace_manager import WorkspaceManager
+
+
+def test_render_prometheus_text():
+    """Test the exposition format of counters, gauges and histograms."""
+    registry = Registry()
+    hits = registry.counter("hits_total", "Cache hits.", ["result"])
+    hits.inc(result="hit")
+    hits.inc(2, result='mi"ss')
+    registry.gauge("depth", "Queue depth.", ["status"], lambda: {("queued",): 3})
+    latency = registry.histogram("op_seconds", "Latency.", ["op"], buckets=(0.1, 1))
+    latency.observe(0.05, op="a")
+    latency.observe(0.5, op="a")
+    latency.observe(5, op="a")
+
+    text = registry.render()
+    assert "# TYPE hits_total counter" in text
+    assert 'hits_total{result="hit"} 1' in text
+    assert 'hits_total{result="mi\\"ss"} 2' in text
+    assert 'depth{status="queued"} 3' in text
+    assert 'op_seconds_bucket{op="a",le="0.1"} 1' in text
+    assert 'op_seconds_bucket{op="a",le="1.0"} 2' in text
+    assert 'op_seconds_bucket{op="a",le="+Inf"} 3' in text
+    assert 'op_seconds_sum{op="a"} 5.55' in text
+    assert 'op_seconds_count{op="a"} 3' in text
+
+
+def test_registry_returns_existing_metric():
+    """Test that registering a name twice shares one metric."""
+    registry = Registry()
+    assert registry.counter("a_total", "A.") is registry.counter("a_total", "A.")
+    assert "a_total 0" in registry.render()
+
+
+def test_sqlite_queries_are_timed(tmp_path):
+    """Test that workspace queries land in the SQLite histogram."""
+    wm = WorkspaceManager(tmp_path / "metadata.db")
+    before = SQLITE_QUERY_SECONDS.count(database="workspaces", query="get_workspace")
+    wm.create_workspace("ws", "/tmp/ws")
+    wm.get_workspace("ws")
+    wm.get_workspace("missing")
+    after = SQLITE_QUERY_SECONDS.count(database="workspaces", query="get_workspace")
+    assert after - before == 2
+    wm.close()
+
+
+def test_subprocesses_in_flight():
+    """Test that running child processes are counted while they run."""
+    started = threading.Event()
+    seen = []
+
+    def watch():
+        started.wait()
+        seen.append(SUBPROCESSES_IN_FLIGHT.get())
+
+    watcher = threading.Thread(target=watch)
+    watcher.start()
+    baseline = SUBPROCESSES_IN_FLIGHT.get()
+    started.set()
+    run_process([sys.executable, "-c", "import time; time.sleep(0.5)"])
+    watcher.join()
+    assert seen == [baseline + 1]
+    assert SUBPROCESSES_IN_FLIGHT.get() == baseline
@@ -0,0 +1,104 @@
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from env_manager.environment import EnvironmentManager
+from env_manager.pool import TEMPLATE_NAME, VenvPool, relocate_env
+
+
+def _fake_template(pool: VenvPool, python_exe: str = sys.executable) -> Path:
+    """Lay out a minimal venv-shaped template without running ensurepip."""
+    key_dir = pool._key_dir(python_exe)
+    template = key_dir / TEMPLATE_NAME
+    (template / "bin").mkdir(parents=True)
+    (template / "pyvenv.cfg").write_text(
+        f"home = /usr/bin\ncommand = python -m venv {template}\n"
+    )
+    (template / "bin" / "activate").write_text(
+        f'VIRTUAL_ENV="{template}"\nPS1="({TEMPLATE_NAME}) ${{PS1:-}}"\n'
+    )
+    (template / "bin" / "pip").write_text(f"#!{template}/bin/python\n")
+    (template / "bin" / "python").symlink_to(sys.executable)
+    (key_dir / "python").write_text(python_exe)
+    return template
+
+
+def test_relocate_env_rewrites_paths_and_prompt(tmp_path):
+    """Test that moved envs point at their new location."""
+    pool = VenvPool(tmp_path / "pool")
+    template = _fake_template(pool)
+    target = tmp_path / "envs" / "myenv"
+    target.parent.mkdir()
+    template.rename(target)
+    relocate_env(target, template)
+
+    activate = (target / "bin" / "activate").read_text()
+    assert f'VIRTUAL_ENV="{target}"' in activate
+    assert "(myenv)" in activate
+    assert (target / "bin" / "pip").read_text() == f"#!{target}/bin/python\n"
+    assert str(target) in (target / "pyvenv.cfg").read_text()
+    assert (target / "bin" / "python").resolve() == Path(sys.executable).resolve()
+
+
+def test_claim_is_exclusive(tmp_path):
+    """Test that concurrent claims each get a different pooled env."""
+    pool = VenvPool(tmp_path / "pool", size=4)
+    _fake_template(pool)
+    assert pool.fill(sys.executable) == 4
+    assert pool.available(sys.executable) == 4
+
+    results = {}
+
+    def claim(i):
+        results[i] = pool.claim(sys.executable, tmp_path / "envs" / f"env{i}")
+
+    threads = [threading.Thread(target=claim, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(results.values())
+    assert pool.available(sys.executable) == 0
+    # A drained pool still clones the template
+    assert pool.claim(sys.executable, tmp_path / "envs" / "env4")
+    assert (tmp_path / "envs" / "env4" / "bin" / "activate").exists()
+    assert pool.refill() == 4
+
+
+def test_claim_without_template(tmp_path):
+    """Test that claiming from an unbuilt pool reports no env."""
+    pool = VenvPool(tmp_path / "pool")
+    assert not pool.claim(sys.executable, tmp_path / "env")
+    assert not (tmp_path / "env").exists()
+
+
+def test_claim_leaves_existing_target_alone(tmp_path):
+    """Test that claiming onto an existing directory keeps its contents."""
+    pool = VenvPool(tmp_path / "pool", size=1)
+    _fake_template(pool)
+    target = tmp_path / "envs" / "mine"
+    target.mkdir(parents=True)
+    (target / "keep.txt").write_text("user data")
+
+    assert not pool.claim(sys.executable, target)
+    assert pool.fill(sys.executable) == 1
+    assert not pool.claim(sys.executable, target)
+    assert (target / "keep.txt").read_text() == "user data"
+    assert pool.available(sys.executable) == 1
+
+
+def test_create_environment_claims_real_pooled_env(tmp_path):
+    """Test that EnvironmentManager uses a real pooled env that runs pip."""
+    pool = VenvPool(tmp_path / "pool", size=1)
+    assert pool.fill(sys.executable) == 1
+    env_manager = EnvironmentManager(base_dir=tmp_path / "envs", pool=pool)
+    env_manager._find_python = lambda version: sys.executable
+
+    assert env_manager.create_environment("fast")
+    assert pool.available(sys.executable) == 0
+    env_path = tmp_path / "envs" / "fast"
+    result = subprocess.run(
+        [str(env_path / "bin" / "pip"), "--version"], capture_output=True, text=True
+    )
+    assert result.returncode == 0
+    assert str(env_path) in result.stdout
@@ -102,12 +102,29 @@ class TestPyenvIntegration:
             mock_run.return_value = (0, "", "")
 
             # Test successful creation
-            result = self.env_manager.create_environment("integration_test", "3.9.0")
+            result = self.env_manager.create_environment(
+                "integration_test", "3.9.0", install_python=True
+            )
             assert result is True
 
             # Verify pyenv version was ensured
             mock_ensure.assert_called_with("3.9.0")
 
+    def test_environment_creation_does_not_install_python(self):
+        """Plain creation only looks interpreters up; it never runs pyenv install."""
+        with patch("env_manager.utils.run_command") as mock_run, patch(
+            "pathlib.Path.exists", return_value=False
+        ), patch("pathlib.Path.mkdir"), patch.object(
+            self.env_manager.interpreters, "find", return_value=None
+        ):
+            mock_run.return_value = (1, "", "not installed")
+
+            self.env_manager.create_environment("lookup_test", "3.9.0")
+
+            commands = [call.args[0] for call in mock_run.call_args_list]
+            pyenv_calls = [c for c in commands if c[0] == "pyenv"]
+            assert pyenv_calls == [["pyenv", "which", "python3.9.0"]]
+
     def test_pyenv_fallback_to_system_python(self):
         """Test fallback to system Python when pyenv version not available."""
         with patch("env_manager.utils.run_command") as mock_run, patch(
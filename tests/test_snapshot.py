@@ -0,0 +1,97 @@
+import json
+from unittest.mock import patch
+from pyspace_daemon.snapshot import SnapshotEngine, diff_snapshots, parse_snapshot
+
+
+def _install(env_path, name, version, direct_url=None):
+    """Create the dist-info directory an installer would leave behind."""
+    site_packages = env_path / "lib" / "python3.11" / "site-packages"
+    dist_info = site_packages / f"{name.replace('-', '_')}-{version}.dist-info"
+    dist_info.mkdir(parents=True)
+    (dist_info / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n\nLong description\n"
+    )
+    if direct_url:
+        (dist_info / "direct_url.json").write_text(json.dumps(direct_url))
+    return dist_info
+
+
+def test_distributions_match_pip_freeze_format(tmp_path):
+    """Test that snapshots list packages like pip freeze would."""
+    env_path = tmp_path / "env"
+    _install(env_path, "Requests", "2.31.0")
+    _install(env_path, "pip", "23.2.1")
+    _install(env_path, "local-pkg", "0.1", {"url": "file:///src/local-pkg"})
+    _install(
+        env_path,
+        "devtool",
+        "1.0",
+        {"url": "file:///src/devtool", "dir_info": {"editable": True}},
+    )
+
+    packages = SnapshotEngine().distributions(env_path)
+    assert sorted(packages.values()) == [
+        "-e file:///src/devtool",
+        "Requests==2.31.0",
+        "local-pkg @ file:///src/local-pkg",
+    ]
+
+
+def test_snapshot_writes_file_and_diffs_previous(tmp_path):
+    """Test that each snapshot reports changes since the last one."""
+    env_path = tmp_path / "env"
+    _install(env_path, "six", "1.16.0")
+    _install(env_path, "idna", "3.4")
+    engine = SnapshotEngine()
+
+    first = engine.snapshot(env_path)
+    assert first["packages"] == 2
+    assert first["diff"]["added"] == ["idna==3.4", "six==1.16.0"]
+    assert (env_path / "requirements.txt").read_text() == "idna==3.4\nsix==1.16.0\n"
+
+    for dist_info in env_path.glob("lib/*/site-packages/six-*.dist-info"):
+        (dist_info / "METADATA").unlink()
+        dist_info.rmdir()
+    _install(env_path, "six", "1.17.0")
+    _install(env_path, "attrs", "23.1.0")
+    second = engine.snapshot(env_path)
+    assert second["diff"] == {
+        "added": ["attrs==23.1.0"],
+        "removed": [],
+        "changed": [{"name": "six", "from": "six==1.16.0", "to": "six==1.17.0"}],
+    }
+
+
+def test_metadata_is_cached_by_mtime(tmp_path):
+    """Test that unchanged dist-info directories are not re-read."""
+    env_path = tmp_path / "env"
+    _install(env_path, "six", "1.16.0")
+    engine = SnapshotEngine()
+    engine.distributions(env_path)
+    with patch.object(engine, "_read_dist") as mock_read:
+        assert engine.distributions(env_path) == {"six": "six==1.16.0"}
+        mock_read.assert_not_called()
+
+
+def test_snapshot_many(tmp_path):
+    """Test batch snapshots, including an environment that cannot be written."""
+    envs = []
+    for i in range(5):
+        env_path = tmp_path / f"env{i}"
+        _install(env_path, "pkg", f"1.{i}")
+        envs.append(env_path)
+    missing = tmp_path / "missing"
+    results = SnapshotEngine().snapshot_many(envs + [missing])
+    assert results[str(envs[3])]["diff"]["added"] == ["pkg==1.3"]
+    assert "error" in results[str(missing)]
+
+
+def test_parse_and_diff_freeze_output():
+    """Test parsing freeze output with comments and editable lines."""
+    old = parse_snapshot("# comment\nDjango==4.2\n-e git+https://x/y#egg=y\n")
+    new = parse_snapshot("django==5.0\n")
+    diff = diff_snapshots(old, new)
+    assert diff["changed"] == [
+        {"name": "django", "from": "Django==4.2", "to": "django==5.0"}
+    ]
+    assert diff["removed"] == ["-e git+https://x/y#egg=y"]
@@ -0,0 +1,101 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from env_manager import store as store_module
+from env_manager.store import JsonStore, get_store
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+INCREMENT = """
+import sys
+from pathlib import Path
+from env_manager.store import get_store
+
+store = get_store(Path(sys.argv[1]))
+for _ in range(int(sys.argv[2])):
+    with store.transaction() as data:
+        data["count"] = data.get("count", 0) + 1
+"""
+
+
+def test_unchanged_file_is_not_reparsed(tmp_path):
+    """Test that reads are served from memory until the file changes."""
+    path = tmp_path / "config.json"
+    path.write_text('{"a": 1}')
+    store = JsonStore(path)
+    with patch.object(store_module.json, "load", wraps=json.load) as mock_load:
+        assert store.get("a") == 1
+        assert store.get("a") == 1
+        assert mock_load.call_count == 1
+
+        # Another process rewrites the file
+        path.write_text('{"a": 22}')
+        assert store.get("a") == 22
+        assert mock_load.call_count == 2
+
+
+def test_transaction_coalesces_and_rolls_back(tmp_path):
+    """Test that a transaction writes once, and not at all when it fails."""
+    store = JsonStore(tmp_path / "config.json")
+    with patch.object(store, "_write", wraps=store._write) as mock_write:
+        with store.transaction() as data:
+            data["a"] = 1
+            store.set("b", 2)
+            store.update({"c": 3})
+        assert mock_write.call_count == 1
+
+        with pytest.raises(RuntimeError):
+            with store.transaction() as data:
+                data["a"] = 100
+                raise RuntimeError("boom")
+        with store.transaction() as data:
+            data["a"] = 1
+        assert mock_write.call_count == 1
+    assert json.loads(store.path.read_text()) == {"a": 1, "b": 2, "c": 3}
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_get_store_is_shared_per_path(tmp_path):
+    """Test that one process uses one store per file."""
+    assert get_store(tmp_path / "a.json") is get_store(tmp_path / "x" / ".." / "a.json")
+    assert get_store(tmp_path / "a.json") is not get_store(tmp_path / "b.json")
+
+
+@pytest.mark.skipif(os.name == "nt", reason="advisory locking is POSIX-only")
+def test_concurrent_processes_do_not_lose_updates(tmp_path):
+    """Test read-modify-write from several processes at once."""
+    path = tmp_path / "config.json"
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", INCREMENT, str(path), "50"],
+            env=env,
+            stderr=subprocess.PIPE,
+        )
+        for _ in range(4)
+    ]
+    for proc in procs:
+        _, stderr = proc.communicate(timeout=60)
+        assert proc.returncode == 0, stderr
+    assert json.loads(path.read_text()) == {"count": 200}
+
+
+def test_daemon_config_does_not_rewrite_file(tmp_path, monkeypatch):
+    """Test that constructing the daemon config leaves the file alone."""
+    from pyspace_daemon.config_manager import DEFAULT_CONFIG, ConfigManager
+
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    config_file = tmp_path / ".pyspace" / "config.json"
+    config_file.parent.mkdir()
+    config_file.write_text('{"pool_size": 0}')
+    mtime = config_file.stat().st_mtime_ns
+
+    config = ConfigManager()
+    assert config.get("pool_size") == 0
+    assert config.get("job_workers") == DEFAULT_CONFIG["job_workers"]
+    assert config_file.stat().st_mtime_ns == mtime
+    assert config_file.read_text() == '{"pool_size": 0}'
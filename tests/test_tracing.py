@@ -0,0 +1,108 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from env_manager import tracing
+from pyspace_daemon.jobs import JobQueue
+from pyspace_daemon.tracing import TRACE_HEADER, TraceMiddleware
+
+
+def _spans(path):
+    events = json.loads(path.read_text())["traceEvents"]
+    return [event for event in events if event["ph"] == "X"]
+
+
+def test_span_is_noop_without_tracer():
+    """Test that spans record nothing unless a tracer is active."""
+    assert tracing.current() is None
+    with tracing.span("ignored"):
+        pass
+    assert tracing.traced("f")(lambda: 1)() == 1
+
+
+def test_profile_writes_nested_spans(tmp_path):
+    """Test the Chrome trace and cProfile output of a profiled block."""
+    trace, stats = tmp_path / "trace.json", tmp_path / "stats.prof"
+    with tracing.profile(trace, stats, "pyspace test"):
+        with tracing.span("outer", size=3):
+            with tracing.span("inner"):
+                pass
+    assert tracing.current() is None
+    assert stats.exists()
+
+    data = json.loads(trace.read_text())
+    names = [e["args"]["name"] for e in data["traceEvents"] if e["ph"] == "M"]
+    assert "pyspace test" in names
+    spans = {event["name"]: event for event in _spans(trace)}
+    assert set(spans) == {"pyspace test", "outer", "inner"}
+    assert spans["outer"]["args"] == {"size": 3}
+    outer, inner = spans["outer"], spans["inner"]
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"] + 1
+
+
+def test_propagate_to_worker_threads(tmp_path):
+    """Test that propagated callables record spans on pool threads."""
+    tracer = tracing.Tracer(path=tmp_path / "trace.json")
+    work = tracing.traced("work")(lambda n: n * 2)
+    with tracing.activate(tracer):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            assert list(pool.map(tracing.propagate(work), [1, 2, 3])) == [2, 4, 6]
+            # Without propagation the worker sees no tracer
+            assert pool.submit(tracing.current).result() is None
+    spans = _spans(tracer.save())
+    assert [event["name"] for event in spans] == ["work"] * 3
+    assert threading.get_ident() not in {event["tid"] for event in spans}
+
+
+def test_jobs_join_the_submitting_trace(tmp_path):
+    """Test that a job's spans land in its request's trace, saved on completion."""
+    queue = JobQueue(max_workers=1)
+    tracer = tracing.Tracer(path=tmp_path / "trace.json")
+    with tracing.activate(tracer):
+        job = queue.submit("work", tracing.traced("step")(lambda: None))
+    assert job.done.wait(5)
+    queue.shutdown()
+    names = {event["name"] for event in _spans(tmp_path / "trace.json")}
+    assert names == {"job:work", "step"}
+
+
+def test_trace_middleware(tmp_path):
+    """Test that only requests asking for a trace get one, with the path returned."""
+    app = FastAPI()
+    app.add_middleware(TraceMiddleware, trace_dir=tmp_path, keep=2)
+
+    @app.get("/work")
+    def work():
+        with tracing.span("handler"):
+            return {"ok": True}
+
+    client = TestClient(app)
+    assert TRACE_HEADER not in client.get("/work").headers
+    assert list(tmp_path.iterdir()) == []
+
+    for _ in range(3):
+        response = client.get("/work?x=1", headers={TRACE_HEADER: "1"})
+    assert response.json() == {"ok": True}
+    spans = {
+        event["name"]: event
+        for event in _spans(tmp_path / response.headers[TRACE_HEADER])
+    }
+    assert set(spans) == {"GET /work", "handler"}
+    assert spans["GET /work"]["args"] == {"query": "x=1"}
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+def test_include_merges_other_traces(tmp_path):
+    """Test that included trace files are merged when saving."""
+    daemon = tracing.Tracer("daemon", tmp_path / "daemon.json")
+    with tracing.activate(daemon), tracing.span("remote"):
+        pass
+    daemon.save()
+    cli = tracing.Tracer("cli", tmp_path / "cli.json")
+    cli.include(daemon.path)
+    cli.include(tmp_path / "missing.json")
+    with tracing.activate(cli), tracing.span("local"):
+        pass
+    assert {event["name"] for event in _spans(cli.save())} == {"remote", "local"}
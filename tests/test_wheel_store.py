@@ -0,0 +1,196 @@
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+from pyspace_daemon import cache_manager
+from pyspace_daemon.cache_manager import (
+    ABI_PROBE,
+    CacheManager,
+    parse_artifact_filename,
+    read_requirements,
+)
+
+
+def _write_artifact(directory: Path, filename: str, content: bytes) -> Path:
+    path = directory / filename
+    path.write_bytes(content)
+    return path
+
+
+def test_parse_artifact_filename():
+    """Test parsing wheel and sdist filenames into index keys."""
+    assert parse_artifact_filename("Foo_Bar-1.0-py3-none-any.whl") == (
+        "foo-bar",
+        "1.0",
+        "py3",
+        "none",
+        "any",
+    )
+    assert parse_artifact_filename("foo-2.0-1-cp311-cp311-linux_x86_64.whl")[1:] == (
+        "2.0",
+        "cp311",
+        "cp311",
+        "linux_x86_64",
+    )
+    assert parse_artifact_filename("foo-bar-1.2.tar.gz")[:2] == ("foo-bar", "1.2")
+    assert parse_artifact_filename("README.txt") is None
+
+
+def test_store_deduplicates_identical_wheels(tmp_path):
+    """Test that identical artifacts are stored once and indexed by tags."""
+    cm = CacheManager(tmp_path / "cache")
+    incoming = tmp_path / "incoming"
+    incoming.mkdir()
+
+    first = cm.store(_write_artifact(incoming, "foo-1.0-py3-none-any.whl", b"wheel"))
+    second = cm.store(_write_artifact(incoming, "foo-1.0-py3-none-any.whl", b"wheel"))
+
+    assert first == second
+    assert first.read_bytes() == b"wheel"
+    assert len(list(cm.objects_dir.rglob("*.whl"))) == 1
+    assert cm.lookup("Foo", "1.0") == [first]
+    assert cm.lookup("foo", "2.0") == []
+
+
+def test_store_writes_simple_index(tmp_path):
+    """Test that the PEP 503 page links to the stored artifact with its hash."""
+    cm = CacheManager(tmp_path / "cache")
+    stored = cm.store(_write_artifact(tmp_path, "foo-1.0-py3-none-any.whl", b"wheel"))
+
+    page = (cm.simple_dir / "foo" / "index.html").read_text()
+    assert stored.as_uri() in page
+    assert f"#sha256={stored.parent.name}" in page
+
+
+def test_clean_cache(tmp_path):
+    """Test that cleaning the cache removes objects and index entries."""
+    cm = CacheManager(tmp_path / "cache")
+    cm.store(_write_artifact(tmp_path, "foo-1.0-py3-none-any.whl", b"wheel"))
+
+    cm.clean_cache()
+
+    assert cm.lookup("foo") == []
+    assert not any(cm.objects_dir.iterdir())
+
+
+def test_read_requirements(tmp_path):
+    """Test that comments and pip options are skipped."""
+    req_file = tmp_path / "requirements.txt"
+    req_file.write_text("# comment\n-r other.txt\nfoo==1.0  # pinned\n\nbar\n")
+    assert read_requirements(req_file) == ["foo==1.0", "bar"]
+
+
+def test_prefetch_from_local_index(tmp_path, build_wheel):
+    """Test bulk prefetch dedupes requirements and skips cached ones."""
+    wheelhouse = tmp_path / "wheelhouse"
+    wheelhouse.mkdir()
+    build_wheel(wheelhouse, "alpha", "1.0")
+    build_wheel(wheelhouse, "beta", "2.0")
+    cm = CacheManager(tmp_path / "cache", find_links=str(wheelhouse))
+
+    results = cm.prefetch(["alpha==1.0", "Alpha == 1.0", "beta"], max_workers=2)
+
+    assert results == {"alpha==1.0": True, "beta": True}
+    assert cm.lookup("alpha", "1.0")
+    assert cm.lookup("beta", "2.0")
+
+    with patch.object(CacheManager, "download_wheel") as mock_download:
+        assert cm.prefetch(["alpha==1.0", "beta"]) == {"alpha==1.0": True, "beta": True}
+        mock_download.assert_not_called()
+
+
+def test_missing_lists_unavailable_requirements(tmp_path):
+    """Test the offline pre-check against names and pinned versions."""
+    cm = CacheManager(tmp_path / "cache")
+    cm.store(_write_artifact(tmp_path, "foo-1.0-py3-none-any.whl", b"wheel"))
+
+    assert cm.missing(["foo", "Foo==1.0", "foo>=0.5"]) == []
+    assert cm.missing(["foo==2.0", "bar", "foo"]) == ["foo==2.0", "bar"]
+
+
+def _fake_pip_wheel(builds):
+    """Stand in for `pip wheel`, writing a platform wheel into --wheel-dir."""
+
+    def run(cmd):
+        if cmd[-2:] == ["-c", ABI_PROBE]:
+            return subprocess.CompletedProcess(cmd, 0, "cpython-312 linux-x86_64\n", "")
+        builds.append(cmd)
+        wheel_dir = Path(cmd[cmd.index("--wheel-dir") + 1])
+        tag = "cp312" if cmd[0] == "python3.12" else "cp311"
+        _write_artifact(
+            wheel_dir, f"ext-1.0-{tag}-{tag}-linux_x86_64.whl", tag.encode()
+        )
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    return run
+
+
+def test_sdist_built_once_per_interpreter(tmp_path):
+    """Test that built wheels are stored and reused per sdist, ABI and platform."""
+    cm = CacheManager(tmp_path / "cache")
+    sdist = cm.store(_write_artifact(tmp_path, "ext-1.0.tar.gz", b"sdist"))
+    builds = []
+    with patch.object(
+        cache_manager, "run_process", side_effect=_fake_pip_wheel(builds)
+    ):
+        wheel = cm.build_wheel(sdist)
+        assert cm.build_wheel(sdist) == wheel
+        assert len(builds) == 1
+        other = cm.build_wheel(sdist, "python3.12")
+        assert len(builds) == 2
+
+    assert wheel.read_bytes() == b"cp311"
+    assert other.name == "ext-1.0-cp312-cp312-linux_x86_64.whl"
+    assert cm.lookup("ext", "1.0", python_tag="cp312") == [other]
+    assert wheel.name in (cm.simple_dir / "ext" / "index.html").read_text()
+
+
+def test_build_wheel_that_cannot_be_stored(tmp_path):
+    """Test that a built wheel the store rejects is reported as a failed build."""
+    cm = CacheManager(tmp_path / "cache")
+    sdist = cm.store(_write_artifact(tmp_path, "ext-1.0.tar.gz", b"sdist"))
+    with patch.object(
+        cache_manager, "run_process", side_effect=_fake_pip_wheel([])
+    ), patch.object(cm, "store", return_value=None):
+        assert cm.build_wheel(sdist) is None
+        assert cm.build_all() == {"ext-1.0.tar.gz": False}
+    assert cm.lookup("ext", "1.0", python_tag="cp311") == []
+
+
+def test_build_all_and_build_on_download(tmp_path):
+    """Test building every cached sdist, and building sdists as they download."""
+    cm = CacheManager(tmp_path / "cache", build_sdists=True)
+    cm.store(_write_artifact(tmp_path, "ext-1.0.tar.gz", b"sdist"))
+    cm.store(_write_artifact(tmp_path, "foo-1.0-py3-none-any.whl", b"wheel"))
+    builds = []
+    with patch.object(
+        cache_manager, "run_process", side_effect=_fake_pip_wheel(builds)
+    ):
+        assert cm.build_all() == {"ext-1.0.tar.gz": True}
+        assert cm.build_all() == {"ext-1.0.tar.gz": True}
+    assert len(builds) == 1
+
+    other = cm.store(_write_artifact(tmp_path, "other-2.0.tar.gz", b"other"))
+    with patch.object(
+        cache_manager, "run_process", side_effect=_fake_pip_wheel(builds)
+    ):
+        assert cm.build_all(requirements=["Ext==1.0", "foo", "missing"]) == {
+            "ext-1.0.tar.gz": True
+        }
+        assert cm.build_all(requirements=["ext==2.0"]) == {}
+    assert len(builds) == 1
+    assert other.name not in " ".join(" ".join(cmd) for cmd in builds)
+
+    def download(cmd):
+        if cmd[:2] == ["pip", "download"]:
+            dest = Path(cmd[cmd.index("--dest") + 1])
+            _write_artifact(dest, "ext-1.0.tar.gz", b"sdist2")
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+        return _fake_pip_wheel(builds)(cmd)
+
+    with patch.object(cache_manager, "run_process", side_effect=download):
+        artifacts = cm.download_wheel("ext")
+    assert [a.name for a in artifacts] == [
+        "ext-1.0.tar.gz",
+        "ext-1.0-cp311-cp311-linux_x86_64.whl",
+    ]
+    assert len(builds) == 2
@@ -0,0 +1,62 @@
+import threading
+from pyspace_daemon.workspace_manager import WorkspaceManager
+
+
+def _manager(tmp_path):
+    return WorkspaceManager(tmp_path / "workspaces.db")
+
+
+def test_create_get_delete(tmp_path):
+    """Test the single-workspace round trip."""
+    wm = _manager(tmp_path)
+    assert wm.create_workspace("ci-1", "/envs/ci-1")
+    assert not wm.create_workspace("ci-1", "/envs/other")
+    assert wm.get_workspace("ci-1") == "/envs/ci-1"
+    wm.delete_workspace("ci-1")
+    assert wm.get_workspace("ci-1") is None
+    wm.close()
+
+
+def test_batch_create_and_delete(tmp_path):
+    """Test that batch operations report what they actually changed."""
+    wm = _manager(tmp_path)
+    wm.create_workspace("b", "/envs/b")
+    created = wm.create_workspaces([(n, f"/envs/{n}") for n in ("a", "b", "c")])
+    assert created == ["a", "c"]
+    assert wm.count_workspaces() == 3
+    assert wm.delete_workspaces(["a", "c", "missing"]) == 2
+    assert [w["name"] for w in wm.list_workspaces()] == ["b"]
+    wm.close()
+
+
+def test_prefix_filter_and_pagination(tmp_path):
+    """Test keyset pagination over a name-prefix filter."""
+    wm = _manager(tmp_path)
+    names = [f"ci-{i:03d}" for i in range(25)] + ["dev", "cj", "ci"]
+    wm.create_workspaces([(n, f"/envs/{n}") for n in names])
+
+    pages, after = [], ""
+    while True:
+        page = wm.list_workspaces(prefix="ci-", after=after, limit=10)
+        if not page:
+            break
+        pages.append([w["name"] for w in page])
+        after = page[-1]["name"]
+    assert [len(p) for p in pages] == [10, 10, 5]
+    assert sum(pages, []) == sorted(n for n in names if n.startswith("ci-"))
+    assert len(wm.list_workspaces()) == len(names)
+    wm.close()
+
+
+def test_connection_per_thread(tmp_path):
+    """Test that each thread reuses its own connection."""
+    wm = _manager(tmp_path)
+    assert wm._conn() is wm._conn()
+    other = []
+    thread = threading.Thread(target=lambda: other.append(wm._conn()))
+    thread.start()
+    thread.join()
+    assert other[0] is not wm._conn()
+    mode = wm._conn().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+    wm.close()